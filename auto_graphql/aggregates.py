@@ -0,0 +1,315 @@
+import enum
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    cast,
+)
+
+import strawberry
+from django.db.models import (
+    Avg,
+    Count,
+    DateField,
+    DecimalField,
+    Expression,
+    F,
+)
+from django.db.models import Field as ModelField
+from django.db.models import (
+    FloatField,
+    IntegerField,
+    Max,
+    Min,
+    Model,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Sum,
+    TimeField,
+    Value,
+)
+from django.db.models.functions import (
+    Coalesce,
+    ExtractYear,
+)
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+from strawberry.types.nodes import (
+    SelectedField,
+    Selection,
+)
+from strawberry.utils.str_converters import to_camel_case
+from strawberry_django import filters as django_filters
+from strawberry_django.fields.types import field_type_map
+
+from .counters import get_counter_subquery
+from .dataloaders import (
+    Relation,
+    RelationSpec,
+)
+from .db_pool import (
+    fetch,
+    run_sync,
+)
+from .models import RelationCount
+
+COUNT_ANNOTATION_PREFIX = "_autographql_count_"
+
+
+def iter_selected_fields(selections: Iterable[Selection]) -> Iterator[SelectedField]:
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            yield selection
+        else:
+            # fragments carry the fields of the same object
+            yield from iter_selected_fields(selection.selections)
+
+
+def get_python_type(field: "ModelField[Any, Any]") -> Any:
+    for field_class in type(field).__mro__:
+        if field_class in field_type_map:
+            return field_type_map[field_class]
+    return None
+
+
+def is_numeric(field: "ModelField[Any, Any]") -> bool:
+    return isinstance(field, (IntegerField, FloatField, DecimalField)) and not field.primary_key
+
+
+def is_temporal(field: "ModelField[Any, Any]") -> bool:
+    return isinstance(field, (DateField, TimeField))
+
+
+def to_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def create_optional_type(name: str, annotations: dict[str, Any]) -> Any:
+    return strawberry.type(
+        type(
+            name,
+            (),
+            {
+                "__annotations__": {field_name: Optional[field_type] for field_name, field_type in annotations.items()},
+                **{field_name: None for field_name in annotations},
+            },
+        )
+    )
+
+
+class ModelAggregates:
+    """Aggregate query field of one model: count/sum/avg/min/max over its rows, optionally grouped by FKs."""
+
+    def __init__(self, model: type[Model], model_name: str, filter_obj: Any) -> None:
+        self.model = model
+        self.model_name = model_name
+        self.filter_obj = filter_obj
+
+        fields = [field for field in model._meta.concrete_fields if not field.hidden]  # type: ignore
+        # GraphQL name -> python attribute and aggregated expression, per metric
+        self.sum_fields: dict[str, tuple[str, Any]] = {}
+        self.min_max_fields: dict[str, tuple[str, Any]] = {}
+        sum_types: dict[str, Any] = {}
+        min_max_types: dict[str, Any] = {}
+        group_by: dict[str, str] = {}
+
+        for field in fields:
+            if field.many_to_one:
+                group_by[field.name.upper()] = field.attname
+            elif is_numeric(field):
+                self.sum_fields[to_camel_case(field.name)] = (field.name, F(field.name))
+                sum_types[field.name] = float
+            elif is_temporal(field) and isinstance(field, DateField):
+                # years make dates averageable, e.g. average publish year per author
+                year_name = f"{field.name}_year"
+                self.sum_fields[to_camel_case(year_name)] = (year_name, ExtractYear(field.name))
+                sum_types[year_name] = float
+            if is_numeric(field) or is_temporal(field):
+                self.min_max_fields[to_camel_case(field.name)] = (field.name, F(field.name))
+                min_max_types[field.name] = get_python_type(field)
+
+        self.group_by_fields = {attname: name.lower() for name, attname in group_by.items()}
+        self.numeric_type = create_optional_type(f"{model_name}AggregateNumeric", sum_types) if sum_types else None
+        self.min_max_type = (
+            create_optional_type(f"{model_name}AggregateMinMax", min_max_types) if min_max_types else None
+        )
+        self.key_type = (
+            create_optional_type(
+                f"{model_name}AggregateKey", {name: strawberry.ID for name in self.group_by_fields.values()}
+            )
+            if group_by
+            else None
+        )
+        self.group_by_enum = (
+            strawberry.enum(cast(Any, enum.Enum(f"{model_name}AggregateGroupBy", group_by))) if group_by else None
+        )
+
+        group_annotations: dict[str, Any] = {"count": int}
+        group_defaults: dict[str, Any] = {}
+        for metric in ("sum", "avg"):
+            if self.numeric_type is not None:
+                group_annotations[metric] = Optional[self.numeric_type]
+                group_defaults[metric] = None
+        for metric in ("min", "max"):
+            if self.min_max_type is not None:
+                group_annotations[metric] = Optional[self.min_max_type]
+                group_defaults[metric] = None
+        if self.key_type is not None:
+            group_annotations["key"] = Optional[self.key_type]
+            group_defaults["key"] = None
+        self.group_type = strawberry.type(
+            type(f"{model_name}Aggregate", (), {"__annotations__": group_annotations, **group_defaults})
+        )
+
+    def get_aggregations(self, info: Info[Any, Any]) -> dict[str, Any]:
+        """Aggregates the selection asks for, so the single statement computes nothing else."""
+
+        aggregations: dict[str, Any] = {"count": Count("pk")}
+        metrics: dict[str, tuple[Callable[..., Any], dict[str, tuple[str, Any]]]] = {
+            "sum": (Sum, self.sum_fields),
+            "avg": (Avg, self.sum_fields),
+            "min": (Min, self.min_max_fields),
+            "max": (Max, self.min_max_fields),
+        }
+        for selected_field in iter_selected_fields(info.selected_fields[0].selections):
+            if selected_field.name not in metrics:
+                continue
+            aggregate, metric_fields = metrics[selected_field.name]
+            for metric_field in iter_selected_fields(selected_field.selections):
+                if metric_field.name in metric_fields:
+                    python_name, expression = metric_fields[metric_field.name]
+                    aggregations[f"{selected_field.name}__{python_name}"] = aggregate(expression)
+        return aggregations
+
+    def build_group(self, row: dict[str, Any]) -> Any:
+        group: dict[str, Any] = {"count": row["count"]}
+        for metric in ("sum", "avg", "min", "max"):
+            values = {
+                key.split("__", 1)[1]: to_float(value) if metric in ("sum", "avg") else value
+                for key, value in row.items()
+                if key.startswith(f"{metric}__")
+            }
+            if values:
+                metric_type = self.numeric_type if metric in ("sum", "avg") else self.min_max_type
+                group[metric] = metric_type(**values)
+        if self.key_type is not None:
+            group["key"] = self.key_type(
+                **{
+                    name: None if row.get(attname) is None else str(row[attname])
+                    for attname, name in self.group_by_fields.items()
+                    if attname in row
+                }
+            )
+        return self.group_type(**group)
+
+    async def resolve(self, info: Info[Any, Any], filters: Any, group_by: Optional[List[Any]]) -> List[Any]:
+        queryset = django_filters.apply(filters, self.model._default_manager.all(), info=info)
+        aggregations = self.get_aggregations(info)
+        if not group_by:
+            return [self.build_group(await run_sync(queryset.aggregate, **aggregations))]
+
+        group_columns = list(dict.fromkeys(member.value for member in group_by))
+        grouped = queryset.order_by().values(*group_columns).annotate(**aggregations).order_by(*group_columns)
+        return [self.build_group(row) for row in await fetch(grouped)]
+
+    def create_field(self) -> Any:
+        return create_aggregate_field(self, self.filter_obj, self.group_type, self.group_by_enum)
+
+
+def create_aggregate_field(aggregates: ModelAggregates, filter_obj: Any, group_type: Any, group_by_enum: Any) -> Any:
+    if group_by_enum is None:
+
+        async def resolve_aggregate(
+            info: Info[Any, Any],
+            filters: Optional[filter_obj] = strawberry.UNSET,
+        ) -> List[group_type]:
+            return await aggregates.resolve(info, filters, None)
+
+    else:
+
+        async def resolve_aggregate(  # type: ignore
+            info: Info[Any, Any],
+            filters: Optional[filter_obj] = strawberry.UNSET,
+            group_by: Optional[List[group_by_enum]] = None,
+        ) -> List[group_type]:
+            return await aggregates.resolve(info, filters, group_by)
+
+    return strawberry.field(resolver=cast(Any, resolve_aggregate))
+
+
+def get_count_annotation(field_name: str) -> str:
+    return f"{COUNT_ANNOTATION_PREFIX}{field_name}"
+
+
+def get_count_subquery(spec: RelationSpec, counter: Optional[str] = None) -> Expression:
+    related = (
+        spec.related_model._default_manager.filter(**{spec.lookup: OuterRef(spec.parent_attname)})
+        .order_by()
+        .values(spec.lookup)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    if counter is not None:
+        # COALESCE stops at the counter row, the related rows are only counted when it is missing
+        return Coalesce(get_counter_subquery(counter, spec), Subquery(related), Value(0))
+    return Coalesce(Subquery(related), Value(0))
+
+
+def create_count_field(relation: Relation, graphql_name: str, python_name: str, counter: Optional[str] = None) -> Any:
+    """Number of related rows: annotated by the parent queryset, batched by a DataLoader otherwise.
+
+    With a counter (AUTOGRAPHQL_COUNTER_CACHE relation label) the maintained count is read; objects
+    without a counter row yet are counted over the related rows.
+    """
+
+    spec = RelationSpec.from_relation(relation)
+    annotation = get_count_annotation(python_name)
+
+    async def load_counts(keys: list[Any]) -> list[int]:
+        counts: dict[Any, int] = {}
+        if counter is not None:
+            object_pks = {str(key): key for key in keys}
+            counters = await fetch(
+                RelationCount._default_manager.filter(relation=counter, object_pk__in=object_pks).values_list(
+                    "object_pk", "count"
+                )
+            )
+            counts = {object_pks[object_pk]: count for object_pk, count in counters}
+        if missing := [key for key in keys if key not in counts]:
+            rows = await fetch(
+                spec.related_model._default_manager.filter(**{f"{spec.lookup}__in": missing})
+                .order_by()
+                .values(spec.lookup)
+                .annotate(count=Count("*"))
+            )
+            counts.update({row[spec.lookup]: row["count"] for row in rows})
+        return [counts.get(key, 0) for key in keys]
+
+    def resolve_count(root: Any, info: Info[Any, Any]) -> int:
+        if annotation in root.__dict__:
+            return cast(int, root.__dict__[annotation])
+        dataloaders: dict[Any, Any] = info.context.dataloaders
+        loader = dataloaders.get((spec, "count"))
+        if loader is None:
+            loader = dataloaders[(spec, "count")] = DataLoader(load_fn=load_counts)
+        return cast(int, loader.load(getattr(root, spec.parent_attname)))
+
+    return strawberry.field(name=graphql_name, resolver=resolve_count)
+
+
+def create_count_queryset_hook(count_fields: dict[str, tuple[str, RelationSpec, Optional[str]]]) -> Any:
+    """Type get_queryset annotating the selected <relation>Count fields as subqueries of the same statement."""
+
+    def get_queryset(cls: type[Any], queryset: QuerySet[Any], info: Info[Any, Any], /, **kwargs: Any) -> QuerySet[Any]:
+        annotations = {}
+        for selected_field in iter_selected_fields(info.selected_fields[0].selections):
+            if selected_field.name in count_fields:
+                python_name, spec, counter = count_fields[selected_field.name]
+                annotations[get_count_annotation(python_name)] = get_count_subquery(spec, counter)
+        return cast(QuerySet[Any], queryset.annotate(**annotations)) if annotations else queryset
+
+    return classmethod(get_queryset)
@@ -1,6 +1,9 @@
 from django.apps import AppConfig
 
-from .setup import setup_global_endpoint
+from .sqlite_profile import (
+    connect_sqlite_profile,
+    is_sqlite_profile_enabled,
+)
 
 
 class AutoGraphqlConfig(AppConfig):
@@ -8,4 +11,41 @@ class AutoGraphqlConfig(AppConfig):
     name = "auto_graphql"
 
     def ready(self) -> None:
+        if is_sqlite_profile_enabled():
+            connect_sqlite_profile()
+        # the schema modules import the change log model, which needs the app registry
+        from django.core.cache import caches
+
+        from .changes import (
+            ChangeTracker,
+            get_tracked_models,
+            get_tracking_mode,
+        )
+        from .counters import (
+            CounterCache,
+            get_counted_relations,
+        )
+        from .mapper import AsyncAutoGraphQLView
+        from .response_cache import (
+            ModelVersions,
+            get_model_label,
+            get_version_cache_aliases,
+        )
+        from .routing import PrimaryPins
+        from .setup import setup_global_endpoint
+
+        # writes of every kind of process are seen, not only of those that built a schema:
+        # commands, admin and shell included
+        counted = get_counted_relations()
+        if counted:
+            CounterCache(counted).connect_signals()
+        tracked_models = get_tracked_models()
+        if tracked_models and get_tracking_mode() == "signals":
+            ChangeTracker(tracked_models).connect_signals()
+        labels = {get_model_label(model) for model in AsyncAutoGraphQLView.get_app_models()}
+        for cache_alias in sorted(get_version_cache_aliases()):
+            ModelVersions(caches[cache_alias], labels).connect_signals()
+        # a no-op unless primary_pin_middleware or the replica extension knows the writing client
+        PrimaryPins.from_settings().connect_signals()
+
         setup_global_endpoint()
@@ -0,0 +1,259 @@
+import base64
+import binascii
+from typing import (
+    Any,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    cast,
+)
+
+import strawberry
+from django.apps import apps
+from django.db import connections
+from django.db.models import (
+    Max,
+    Model,
+)
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+)
+from strawberry.types import Info
+
+from .conf import get_setting
+from .db_pool import (
+    fetch,
+    run_sync,
+)
+from .models import Change
+from .pagination import InvalidCursorError
+from .response_cache import get_model_label
+from .signals import models_bulk_changed
+
+CURSOR_PREFIX = "change:"
+
+
+def get_tracked_models() -> list[Type[Model]]:
+    labels: list[str] = get_setting("AUTOGRAPHQL_CHANGE_TRACKING", [], list)
+    try:
+        return [apps.get_model(label) for label in labels]
+    except (LookupError, ValueError) as e:
+        raise ValueError(f"AUTOGRAPHQL_CHANGE_TRACKING setting has an unknown model: {e}") from e
+
+
+def get_tracking_mode() -> str:
+    mode = get_setting("AUTOGRAPHQL_CHANGE_TRACKING_MODE", "signals", str)
+    if mode not in ("signals", "triggers"):
+        raise ValueError("AUTOGRAPHQL_CHANGE_TRACKING_MODE setting must be one of: signals, triggers.")
+    return mode
+
+
+def encode_change_cursor(change_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{CURSOR_PREFIX}{change_id}".encode("ascii")).decode("ascii")
+
+
+def decode_change_cursor(cursor: str) -> int:
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii")
+        if payload.startswith(CURSOR_PREFIX):
+            return int(payload[len(CURSOR_PREFIX) :])
+    except (ValueError, binascii.Error, UnicodeError):
+        pass
+    raise InvalidCursorError("Invalid changes cursor.")
+
+
+def record_changes(model: Type[Model], pks: Iterable[Any], deleted: bool, using: str) -> None:
+    """Move the rows to the head of the log: their old entries go, new ones get the next ids."""
+
+    label = get_model_label(model)
+    object_pks = [str(pk) for pk in dict.fromkeys(pks)]
+    if not object_pks:
+        return
+    manager: Any = Change._default_manager.db_manager(using)
+    # raw, the delete collector would fetch the entries first to send post_delete for each
+    manager.filter(model=label, object_pk__in=object_pks)._raw_delete(using)
+    manager.bulk_create([Change(model=label, object_pk=object_pk, deleted=deleted) for object_pk in object_pks])
+
+
+class ChangeTracker:
+    """Signal mode: record writes made through the ORM, in the transaction of the write."""
+
+    def __init__(self, models: Iterable[Type[Model]]) -> None:
+        self.models = set(models)
+
+    def connect_signals(self) -> None:
+        # nothing else holds the tracker, and one per process is enough when the schema is built again
+        post_save.connect(self.on_save, weak=False, dispatch_uid="autographql-changes-save")
+        post_delete.connect(self.on_delete, weak=False, dispatch_uid="autographql-changes-delete")
+        m2m_changed.connect(self.on_m2m_changed, weak=False, dispatch_uid="autographql-changes-m2m")
+        models_bulk_changed.connect(self.on_bulk_changed, weak=False, dispatch_uid="autographql-changes-bulk")
+
+    def on_save(self, sender: Type[Model], instance: Model, using: str, **kwargs: Any) -> None:
+        if sender in self.models:
+            record_changes(sender, [instance.pk], False, using)
+
+    def on_delete(self, sender: Type[Model], instance: Model, using: str, **kwargs: Any) -> None:
+        if sender in self.models:
+            record_changes(sender, [instance.pk], True, using)
+
+    def on_m2m_changed(
+        self,
+        sender: Type[Model],
+        instance: Model,
+        action: str,
+        model: Type[Model],
+        pk_set: Optional[set[Any]],
+        using: str,
+        **kwargs: Any,
+    ) -> None:
+        # a row whose links changed is sent again with its new related ids
+        if not action.startswith("post_"):
+            return
+        if type(instance) in self.models:
+            record_changes(type(instance), [instance.pk], False, using)
+        if model in self.models and pk_set:
+            record_changes(model, pk_set, False, using)
+
+    def on_bulk_changed(
+        self,
+        sender: Type[Model],
+        pks: Optional[list[Any]] = None,
+        deleted: bool = False,
+        using: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        if sender in self.models and pks and using is not None:
+            record_changes(sender, pks, deleted, using)
+
+
+def get_head(model: Type[Model]) -> int:
+    head = Change._default_manager.filter(model=get_model_label(model)).aggregate(head=Max("id"))["head"]
+    return cast(int, head or 0)
+
+
+def create_changes_field(model: Type[Model], model_name: str, type_obj: Any) -> Any:
+    """<Model>Changes(since, first): rows written and pks deleted after the cursor, oldest change first.
+
+    Without since only the current cursor is returned: take it, load the list, then poll from it.
+    """
+
+    label = get_model_label(model)
+    changes_type: Any = strawberry.type(
+        type(
+            f"{model_name}Changes",
+            (),
+            {
+                "__annotations__": {
+                    "cursor": str,
+                    "has_more": bool,
+                    "upserted": List[type_obj],
+                    "deleted": List[strawberry.ID],
+                },
+            },
+        )
+    )
+
+    async def resolve_changes(
+        info: Info[Any, Any],
+        since: Optional[str] = None,
+        first: int = 1000,
+    ) -> changes_type:
+        max_first = get_setting("AUTOGRAPHQL_CONNECTION_MAX_FIRST", 1000, int)
+        if not 0 <= first <= max_first:
+            raise ValueError(f"first must be between 0 and {max_first}.")
+        if since is None:
+            head = await run_sync(get_head, model)
+            return changes_type(cursor=encode_change_cursor(head), has_more=False, upserted=[], deleted=[])
+
+        since_id = decode_change_cursor(since)
+        entries = await fetch(
+            Change._default_manager.filter(model=label, id__gt=since_id)
+            .order_by("id")
+            .values_list("id", "object_pk", "deleted")[: first + 1]
+        )
+        page = entries[:first]
+        upserted_pks = [object_pk for _, object_pk, deleted in page if not deleted]
+        rows = await fetch(model._default_manager.filter(pk__in=upserted_pks)) if upserted_pks else []
+        return changes_type(
+            cursor=encode_change_cursor(page[-1][0] if page else since_id),
+            has_more=len(entries) > first,
+            upserted=rows,
+            deleted=[object_pk for _, object_pk, deleted in page if deleted],
+        )
+
+    return strawberry.field(resolver=cast(Any, resolve_changes))
+
+
+def get_trigger_names(model: Type[Model]) -> list[tuple[str, Any, Optional[str]]]:
+    """(trigger name, table model, link column) for the model table and its M2M link tables."""
+
+    meta: Any = model._meta
+    triggers: list[tuple[str, Any, Optional[str]]] = [(f"autographql_changes_{meta.db_table}", model, None)]
+    for field in meta.many_to_many:
+        through = field.remote_field.through
+        triggers.append((f"autographql_changes_{through._meta.db_table}", through, field.m2m_column_name()))
+    return triggers
+
+
+def get_trigger_sql(model: Type[Model], using: str, drop: bool = False) -> list[str]:
+    """Trigger mode: the database records every write, raw SQL and QuerySet.update included."""
+
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    meta: Any = model._meta
+    label = get_model_label(model)
+    log_table = quote_name(Change._meta.db_table)
+    table, pk = quote_name(meta.db_table), quote_name(meta.pk.column)
+
+    statements = []
+    for name, table_model, link_column in get_trigger_names(model):
+        trigger_table = quote_name(table_model._meta.db_table)
+        if connection.vendor == "sqlite":
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                trigger = quote_name(f"{name}_{operation.lower()}")
+                if drop:
+                    statements.append(f"DROP TRIGGER IF EXISTS {trigger}")
+                    continue
+                row = "OLD" if operation == "DELETE" else "NEW"
+                column = f"{row}.{quote_name(link_column or meta.pk.column)}"
+                # link changes only refresh a row that still exists, they must not replace its tombstone
+                condition = f" AND EXISTS (SELECT 1 FROM {table} WHERE {pk} = {column})" if link_column else ""
+                deleted = int(operation == "DELETE" and link_column is None)
+                statements.append(
+                    f"CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {operation} ON {trigger_table} BEGIN "
+                    f"DELETE FROM {log_table} WHERE model = '{label}' AND object_pk = CAST({column} AS TEXT){condition}; "
+                    f"INSERT INTO {log_table} (model, object_pk, deleted, changed_at) "
+                    f"SELECT '{label}', CAST({column} AS TEXT), {deleted}, STRFTIME('%Y-%m-%d %H:%M:%f', 'now') "
+                    f"WHERE 1{condition}; END"
+                )
+        elif connection.vendor == "postgresql":
+            trigger = quote_name(name)
+            if drop:
+                statements += [
+                    f"DROP TRIGGER IF EXISTS {trigger} ON {trigger_table}",
+                    f"DROP FUNCTION IF EXISTS {trigger}()",
+                ]
+                continue
+            column = quote_name(link_column or meta.pk.column)
+            pk_type = meta.pk.rel_db_type(connection)
+            condition = f"AND EXISTS (SELECT 1 FROM {table} WHERE {pk} = changed_pk::{pk_type})" if link_column else ""
+            tombstone = "false" if link_column else "TG_OP = 'DELETE'"
+            statements += [
+                f"CREATE OR REPLACE FUNCTION {trigger}() RETURNS trigger LANGUAGE plpgsql AS $$ "
+                f"DECLARE changed_pk text; BEGIN "
+                f"IF TG_OP = 'DELETE' THEN changed_pk := OLD.{column}::text; ELSE changed_pk := NEW.{column}::text; END IF; "
+                f"IF TRUE {condition} THEN "
+                f"DELETE FROM {log_table} WHERE model = '{label}' AND object_pk = changed_pk; "
+                f"INSERT INTO {log_table} (model, object_pk, deleted, changed_at) "
+                f"VALUES ('{label}', changed_pk, {tombstone}, now()); "
+                f"END IF; RETURN NULL; END $$",
+                f"DROP TRIGGER IF EXISTS {trigger} ON {trigger_table}",
+                f"CREATE TRIGGER {trigger} AFTER INSERT OR UPDATE OR DELETE ON {trigger_table} "
+                f"FOR EACH ROW EXECUTE FUNCTION {trigger}()",
+            ]
+        else:
+            raise ValueError(f"Change triggers are not supported on {connection.vendor}.")
+    return statements
@@ -0,0 +1,238 @@
+import copy
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Iterator,
+    Optional,
+)
+
+from graphql import (
+    DocumentNode,
+    ExecutionResult,
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    NamedTypeNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    get_named_type,
+    get_nullable_type,
+)
+from graphql.utilities import (
+    get_operation_ast,
+    value_from_ast_untyped,
+)
+from strawberry.extensions import SchemaExtension
+
+from .conf import get_setting
+from .selections import SelectionWalker
+from .streaming import is_stream_chunk
+
+
+@dataclass
+class QueryCost:
+    cost: int
+    depth: int
+
+
+class QueryCostEstimator(SelectionWalker):
+    """Estimate rows an operation resolves: list fields multiply their subtree by pagination.limit."""
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        document: DocumentNode,
+        variables: Optional[dict[str, Any]],
+        default_list_size: int,
+    ) -> None:
+        super().__init__(schema, document, variables)
+        self.default_list_size = default_list_size
+
+    def list_size(self, field: FieldNode, default: Optional[int] = None) -> int:
+        list_size = self.default_list_size if default is None else default
+        for argument in field.arguments:
+            value = value_from_ast_untyped(argument.value, self.variables)
+            if argument.name.value == "first" and isinstance(value, int):
+                return value
+            # bulk mutations return one object per given item
+            if argument.name.value in ("data", "ids") and isinstance(value, list):
+                return len(value)
+            if argument.name.value == "pagination" and isinstance(value, dict) and isinstance(value.get("limit"), int):
+                limit: int = value["limit"]
+                # strawberry_django treats negative limits as "no limit"
+                return limit if limit >= 0 else list_size
+        return list_size
+
+    def estimate(
+        self,
+        parent_type: GraphQLObjectType,
+        selection_set: SelectionSetNode,
+        connection_size: Optional[int] = None,
+        max_list_size: Optional[int] = None,
+    ) -> QueryCost:
+        total = QueryCost(cost=0, depth=0)
+        for field in self.iter_fields(selection_set):
+            if field.name.value.startswith("__") or field.selection_set is None:
+                continue
+            field_def = parent_type.fields.get(field.name.value)
+            if field_def is None:
+                continue
+            field_type = get_nullable_type(field_def.type)
+            named_type = get_named_type(field_type)
+            if not isinstance(named_type, GraphQLObjectType):
+                continue
+
+            if "first" in field_def.args:
+                # connection: rows are counted once here, its edges list is not multiplied again
+                child = self.estimate(
+                    named_type, field.selection_set, self.list_size(field, field_def.args["first"].default_value)
+                )
+                total.cost += child.cost
+                total.depth = max(total.depth, child.depth)
+                continue
+
+            if isinstance(field_type, GraphQLList):
+                rows = connection_size if connection_size is not None else self.list_size(field)
+                if max_list_size is not None:
+                    rows = min(rows, max_list_size)
+            else:
+                rows = 1
+            child = self.estimate(named_type, field.selection_set)
+            total.cost += rows * (1 + child.cost)
+            total.depth = max(total.depth, child.depth + (0 if connection_size is not None else 1))
+        return total
+
+    def estimate_operation(self, operation: OperationDefinitionNode, root_list_size: Optional[int] = None) -> QueryCost:
+        root_type = self.root_type(operation)
+        if root_type is None:
+            return QueryCost(cost=0, depth=0)
+        return self.estimate(root_type, operation.selection_set, max_list_size=root_list_size)
+
+    def truncate(self, selection_set: SelectionSetNode, depth_left: int) -> Optional[SelectionSetNode]:
+        """Copy of selection set without object fields nested more than depth_left levels down."""
+
+        selections: list[Any] = []
+        for selection in selection_set.selections:
+            if isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+                if fragment is None:
+                    continue
+                selection = InlineFragmentNode(
+                    type_condition=NamedTypeNode(name=fragment.type_condition.name),
+                    directives=selection.directives,
+                    selection_set=fragment.selection_set,
+                )
+            if isinstance(selection, FieldNode):
+                if selection.selection_set is None or selection.name.value.startswith("__"):
+                    selections.append(selection)
+                    continue
+                if depth_left <= 0:
+                    continue
+                truncated = self.truncate(selection.selection_set, depth_left - 1)
+            elif isinstance(selection, InlineFragmentNode):
+                truncated = self.truncate(selection.selection_set, depth_left)
+            else:
+                continue
+            if truncated is not None:
+                selection = copy.copy(selection)
+                selection.selection_set = truncated
+                selections.append(selection)
+
+        if not selections:
+            return None
+        truncated_selection_set = copy.copy(selection_set)
+        truncated_selection_set.selections = tuple(selections)
+        return truncated_selection_set
+
+
+class QueryCostExtension(SchemaExtension):
+    """Reject operations above AUTOGRAPHQL_MAX_QUERY_COST / AUTOGRAPHQL_MAX_QUERY_DEPTH, when they are set.
+
+    With AUTOGRAPHQL_QUERY_DEPTH_TRUNCATE too deep selections are dropped instead of rejected. The estimate is
+    reported in the result extensions either way.
+    """
+
+    def on_execute(self) -> Iterator[None]:
+        self.check_operation()
+        yield
+
+    def check_operation(self) -> None:
+        execution_context = self.execution_context
+        # a stream's chunks run parts of the operation already estimated when it was planned
+        if execution_context.graphql_document is None or is_stream_chunk(execution_context.root_value):
+            return
+
+        self.max_cost = max_cost = get_setting("AUTOGRAPHQL_MAX_QUERY_COST", None, (int, type(None)))
+        self.max_depth = max_depth = get_setting("AUTOGRAPHQL_MAX_QUERY_DEPTH", None, (int, type(None)))
+        truncate_depth = get_setting("AUTOGRAPHQL_QUERY_DEPTH_TRUNCATE", False, bool)
+
+        document = execution_context.graphql_document
+        operation = get_operation_ast(document, execution_context.operation_name)
+        if operation is None:
+            return
+
+        estimator = QueryCostEstimator(
+            execution_context.schema._schema,
+            document,
+            execution_context.variables,
+            get_setting("AUTOGRAPHQL_QUERY_COST_DEFAULT_LIST_SIZE", 100, int),
+        )
+        # streamed top-level lists are resolved one chunk per execution
+        root_list_size = getattr(execution_context.root_value, "chunk_size", None)
+        query_cost = estimator.estimate_operation(operation, root_list_size)
+
+        if max_depth is not None and query_cost.depth > max_depth and truncate_depth:
+            operation = self.truncate_operation(estimator, document, operation, max_depth)
+            query_cost = estimator.estimate_operation(operation, root_list_size)
+
+        self.query_cost = query_cost
+        error_message = None
+        if max_depth is not None and query_cost.depth > max_depth:
+            error_message = f"Query depth {query_cost.depth} exceeds maximum depth {max_depth}."
+        elif max_cost is not None and query_cost.cost > max_cost:
+            error_message = f"Query cost {query_cost.cost} exceeds maximum cost {max_cost}."
+
+        if error_message is not None:
+            # a ready result makes strawberry skip execution but still report extensions
+            execution_context.errors = [
+                GraphQLError(error_message, nodes=[operation], extensions={"code": "QUERY_TOO_COMPLEX"})
+            ]
+            execution_context.result = ExecutionResult(data=None, errors=execution_context.errors)
+
+    def truncate_operation(
+        self,
+        estimator: QueryCostEstimator,
+        document: DocumentNode,
+        operation: OperationDefinitionNode,
+        max_depth: int,
+    ) -> OperationDefinitionNode:
+        selection_set = estimator.truncate(operation.selection_set, max_depth)
+        if selection_set is None:
+            return operation
+        truncated_operation = copy.copy(operation)
+        truncated_operation.selection_set = selection_set
+
+        # documents may be shared through the document cache, so replace instead of mutating
+        truncated_document = copy.copy(document)
+        truncated_document.definitions = tuple(
+            truncated_operation if definition is operation else definition for definition in document.definitions
+        )
+        self.execution_context.graphql_document = truncated_document
+        return truncated_operation
+
+    def get_results(self) -> dict[str, Any]:
+        query_cost: Optional[QueryCost] = getattr(self, "query_cost", None)
+        if query_cost is None:
+            return {}
+        return {
+            "queryCost": {
+                "cost": query_cost.cost,
+                "depth": query_cost.depth,
+                "maxCost": self.max_cost,
+                "maxDepth": self.max_depth,
+            }
+        }
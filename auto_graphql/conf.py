@@ -0,0 +1,18 @@
+from typing import (
+    Any,
+    TypeVar,
+    cast,
+)
+
+from django.conf import settings
+
+T = TypeVar("T")
+
+
+def get_setting(name: str, default: T, expected_type: type | tuple[type, ...]) -> T:
+    """Read AUTOGRAPHQL_* setting and check its type."""
+
+    value: Any = getattr(settings, name, default)
+    if value is not default and not isinstance(value, expected_type):
+        raise ValueError(f"{name} setting has invalid type {type(value).__name__}.")
+    return cast(T, value)
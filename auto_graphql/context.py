@@ -0,0 +1,14 @@
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import Any
+
+from strawberry.django.context import StrawberryDjangoContext
+
+
+@dataclass
+class AutoGraphQLContext(StrawberryDjangoContext):
+    """Per-request context; holds state shared by resolvers of one request."""
+
+    dataloaders: dict[Any, Any] = field(default_factory=dict)
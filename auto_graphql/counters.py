@@ -0,0 +1,273 @@
+from typing import (
+    Any,
+    Iterable,
+    Optional,
+    Type,
+    cast,
+)
+
+from django.apps import apps
+from django.db import (
+    connections,
+    router,
+    transaction,
+)
+from django.db.models import (
+    CharField,
+    Count,
+    ForeignObjectRel,
+    Model,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Cast
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+
+from .conf import get_setting
+from .dataloaders import (
+    Relation,
+    RelationSpec,
+)
+from .models import RelationCount
+from .signals import models_bulk_changed
+
+# instance attribute holding keys whose counts a pending delete, save or clear will change
+STASH_PREFIX = "_autographql_counter_keys_"
+RECOUNT_BATCH_SIZE = 1000
+
+
+def get_relation_label(relation: Relation) -> str:
+    return f"{relation.model._meta.label_lower}.{relation.name}"
+
+
+class CountedRelation:
+    """One AUTOGRAPHQL_COUNTER_CACHE relation: counts of model rows are recomputed for the keys a write touches."""
+
+    def __init__(self, relation: Relation) -> None:
+        self.relation = relation
+        self.model: Type[Model] = relation.model
+        self.label = get_relation_label(relation)
+        self.spec = RelationSpec.from_relation(relation)
+        self.stash = f"{STASH_PREFIX}{self.label}"
+        field: Any = relation.field if isinstance(relation, ForeignObjectRel) else relation
+        # M2M: link table and its columns to the counted rows and to the other side; reverse FK: no link table
+        self.through: Optional[Type[Model]] = field.remote_field.through if relation.many_to_many else None
+        self.forward = not isinstance(relation, ForeignObjectRel)
+        if self.through is not None:
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            counted, other = (source, target) if self.forward else (target, source)
+            self.counted_column = self.through._meta.get_field(counted).attname
+            self.other_column = self.through._meta.get_field(other).attname
+
+    def get_linked_keys(self, instance: Model, using: str) -> set[Any]:
+        """Keys of counted rows an instance of the other side is counted in."""
+
+        if self.through is None:
+            key = getattr(instance, self.spec.lookup)
+            return set() if key is None else {key}
+        return set(
+            self.through._default_manager.using(using)
+            .filter(**{self.other_column: instance.pk})
+            .values_list(self.counted_column, flat=True)
+        )
+
+    def recount(self, keys: Iterable[Any], using: str) -> None:
+        object_pks = {str(key): key for key in keys if key is not None}
+        if not object_pks:
+            return
+        manager: Any = RelationCount._default_manager.db_manager(using)
+        with transaction.atomic(using=using):
+            # lock the counters first: a concurrent writer of the same rows counts after this one commits
+            manager.bulk_create(
+                [RelationCount(relation=self.label, object_pk=object_pk) for object_pk in object_pks],
+                ignore_conflicts=True,
+            )
+            if connections[using].features.has_select_for_update:
+                list(
+                    manager.filter(relation=self.label, object_pk__in=object_pks)
+                    .select_for_update()
+                    .values_list("pk", flat=True)
+                )
+            lookup = self.spec.lookup
+            rows = (
+                self.spec.related_model._default_manager.using(using)
+                .filter(**{f"{lookup}__in": list(object_pks.values())})
+                .order_by()
+                .values(lookup)
+                .annotate(count=Count("*"))
+            )
+            counts = {str(row[lookup]): row["count"] for row in rows}
+            manager.bulk_create(
+                [
+                    RelationCount(relation=self.label, object_pk=object_pk, count=counts.get(object_pk, 0))
+                    for object_pk in object_pks
+                ],
+                update_conflicts=True,
+                unique_fields=["relation", "object_pk"],
+                update_fields=["count"],
+            )
+
+    def forget(self, keys: Iterable[Any], using: str) -> None:
+        manager: Any = RelationCount._default_manager.db_manager(using)
+        manager.filter(relation=self.label, object_pk__in=[str(key) for key in keys])._raw_delete(using)
+
+    def rebuild(self, using: str) -> int:
+        """Count every row of the model again; returns the number of rows."""
+
+        keys = list(
+            self.model._default_manager.using(using).order_by().values_list(self.spec.parent_attname, flat=True)
+        )
+        with transaction.atomic(using=using):
+            manager: Any = RelationCount._default_manager.using(using)
+            manager.filter(relation=self.label)._raw_delete(using)
+            for start in range(0, len(keys), RECOUNT_BATCH_SIZE):
+                self.recount(keys[start : start + RECOUNT_BATCH_SIZE], using)
+        return len(keys)
+
+
+def get_counted_relations() -> list[CountedRelation]:
+    """AUTOGRAPHQL_COUNTER_CACHE entries, "app_label.Model.relation" of list relations such as M2M fields."""
+
+    paths: list[str] = get_setting("AUTOGRAPHQL_COUNTER_CACHE", [], list)
+    counted = []
+    for path in paths:
+        label, _, name = str(path).rpartition(".")
+        try:
+            relation: Any = apps.get_model(label)._meta.get_field(name)
+        except (LookupError, ValueError) as e:
+            raise ValueError(f"AUTOGRAPHQL_COUNTER_CACHE setting has an unknown relation {path}: {e}") from e
+        if not (relation.one_to_many or relation.many_to_many):
+            raise ValueError(f"AUTOGRAPHQL_COUNTER_CACHE setting has {path}, which is not a list relation.")
+        counted.append(CountedRelation(relation))
+    return counted
+
+
+def get_counter_subquery(label: str, spec: RelationSpec) -> Subquery:
+    return Subquery(
+        RelationCount._default_manager.filter(
+            relation=label, object_pk=Cast(OuterRef(spec.parent_attname), CharField())
+        ).values("count")
+    )
+
+
+class CounterCache:
+    """Keep RelationCount rows of the counted relations in step with ORM writes, in the transaction of the write."""
+
+    def __init__(self, counted: Iterable[CountedRelation]) -> None:
+        self.counted = list(counted)
+
+    def connect_signals(self) -> None:
+        # nothing else holds the cache; connected when the app is ready, so writes before any request count too
+        pre_save.connect(self.on_pre_save, weak=False, dispatch_uid="autographql-counters-pre-save")
+        post_save.connect(self.on_save, weak=False, dispatch_uid="autographql-counters-save")
+        pre_delete.connect(self.on_pre_delete, weak=False, dispatch_uid="autographql-counters-pre-delete")
+        post_delete.connect(self.on_delete, weak=False, dispatch_uid="autographql-counters-delete")
+        m2m_changed.connect(self.on_m2m_changed, weak=False, dispatch_uid="autographql-counters-m2m")
+        models_bulk_changed.connect(self.on_bulk_changed, weak=False, dispatch_uid="autographql-counters-bulk")
+
+    def iter_related(self, sender: Type[Model]) -> Iterable[CountedRelation]:
+        """Relations whose counts rows of sender are counted in."""
+
+        return (counted for counted in self.counted if issubclass(sender, counted.spec.related_model))
+
+    def on_pre_save(
+        self, sender: Type[Model], instance: Model, using: str, update_fields: Any = None, **kwargs: Any
+    ) -> None:
+        if instance._state.adding or instance.pk is None:
+            return
+        for counted in self.iter_related(sender):
+            # only a moved foreign key changes counts of its former target
+            if counted.through is None and (
+                update_fields is None or cast(Any, counted.relation).field.name in update_fields
+            ):
+                old_keys = (
+                    sender._default_manager.using(using)
+                    .filter(pk=instance.pk)
+                    .values_list(counted.spec.lookup, flat=True)
+                )
+                instance.__dict__[counted.stash] = set(old_keys)
+
+    def on_save(self, sender: Type[Model], instance: Model, using: str, **kwargs: Any) -> None:
+        self.on_link_changed(sender, instance, using)
+        for counted in self.iter_related(sender):
+            if counted.through is None:
+                keys = instance.__dict__.pop(counted.stash, set()) | counted.get_linked_keys(instance, using)
+                counted.recount(keys, using)
+
+    def on_pre_delete(self, sender: Type[Model], instance: Model, using: str, **kwargs: Any) -> None:
+        for counted in self.iter_related(sender):
+            # the link rows go without m2m_changed
+            if counted.through is not None:
+                instance.__dict__[counted.stash] = counted.get_linked_keys(instance, using)
+
+    def on_link_changed(self, sender: Type[Model], instance: Model, using: str) -> None:
+        # rows of a custom through model saved or deleted one by one
+        for counted in self.counted:
+            if sender is counted.through:
+                counted.recount([getattr(instance, counted.counted_column)], using)
+
+    def on_delete(self, sender: Type[Model], instance: Model, using: str, **kwargs: Any) -> None:
+        self.on_link_changed(sender, instance, using)
+        for counted in self.counted:
+            if issubclass(sender, counted.model):
+                counted.forget([getattr(instance, counted.spec.parent_attname)], using)
+        for counted in self.iter_related(sender):
+            if counted.through is None:
+                counted.recount(counted.get_linked_keys(instance, using), using)
+            else:
+                counted.recount(instance.__dict__.pop(counted.stash, set()), using)
+
+    def on_m2m_changed(
+        self,
+        sender: Type[Model],
+        instance: Model,
+        action: str,
+        reverse: bool,
+        pk_set: Optional[set[Any]],
+        using: str,
+        **kwargs: Any,
+    ) -> None:
+        for counted in self.counted:
+            if sender is not counted.through:
+                continue
+            # reverse: the instance is on the side of the model without the field
+            instance_counted = reverse != counted.forward
+            if action == "pre_clear" and not instance_counted:
+                instance.__dict__[counted.stash] = counted.get_linked_keys(instance, using)
+            elif action in ("post_add", "post_remove", "post_clear"):
+                if instance_counted:
+                    keys = {getattr(instance, counted.spec.parent_attname)}
+                else:
+                    keys = instance.__dict__.pop(counted.stash, set()) | (pk_set or set())
+                counted.recount(keys, using)
+
+    def on_bulk_changed(
+        self,
+        sender: Type[Model],
+        pks: Optional[list[Any]] = None,
+        deleted: bool = False,
+        using: Optional[str] = None,
+        keys: Optional[dict[str, set[Any]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        for counted in self.counted:
+            if sender is counted.model and pks and using is not None and (deleted or keys is None):
+                if deleted:
+                    counted.forget(pks, using)
+                else:
+                    counted.recount(pks, using)
+            elif keys is not None:
+                # the keys the written rows are or were counted in
+                if sender is counted.through:
+                    counted.recount(keys.get(counted.counted_column, ()), using or router.db_for_write(sender))
+                elif counted.through is None and issubclass(sender, counted.spec.related_model):
+                    counted.recount(keys.get(counted.spec.lookup, ()), using or router.db_for_write(sender))
+            elif sender is counted.through or issubclass(sender, counted.spec.related_model):
+                # rows of the other side or links changed in bulk, without the keys they were counted in before
+                counted.rebuild(using or router.db_for_write(counted.model))
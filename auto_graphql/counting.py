@@ -0,0 +1,138 @@
+import enum
+import hashlib
+import time
+from typing import (
+    Any,
+    Iterable,
+    Optional,
+    Type,
+    cast,
+)
+
+import strawberry
+from django.core.cache import caches
+from django.db import connections
+from django.db.models import (
+    Model,
+    QuerySet,
+)
+from strawberry.types import Info
+from strawberry_django import filters as django_filters
+
+from .conf import get_setting
+from .db_pool import run_sync
+from .response_cache import (
+    ModelVersions,
+    get_model_label,
+)
+
+COUNT_KEY_PREFIX = "autographql:count:"
+# how long a SQLite database found without sqlite_stat1 is not asked again
+STATISTICS_RECHECK_SECONDS = 60
+
+# database alias -> time.monotonic() until which it is taken to have no sqlite_stat1
+_missing_statistics: dict[str, float] = {}
+
+
+@strawberry.enum(name="CountMode")
+class CountMode(enum.Enum):
+    EXACT = "exact"
+    FAST = "fast"
+
+
+def get_default_count_mode() -> CountMode:
+    mode = get_setting("AUTOGRAPHQL_TOTAL_COUNT_MODE", "exact", str)
+    try:
+        return CountMode(mode)
+    except ValueError:
+        raise ValueError("AUTOGRAPHQL_TOTAL_COUNT_MODE setting must be one of: exact, fast.")
+
+
+def estimate_table_rows(model: Type[Model], using: str) -> Optional[int]:
+    """Row count from planner statistics, None when the backend has none yet."""
+
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        elif connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table],
+            )
+        elif connection.vendor == "sqlite":
+            # sqlite_stat1 exists only after ANALYZE; its stat column starts with the row count
+            if _missing_statistics.get(using, 0.0) > time.monotonic():
+                return None
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                _missing_statistics[using] = time.monotonic() + STATISTICS_RECHECK_SECONDS
+                return None
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+            counts = [int(stat.split()[0]) for (stat,) in cursor.fetchall() if stat]
+            return max(counts) if counts else None
+        else:
+            return None
+        row = cursor.fetchone()
+    # PostgreSQL reports -1 for never analyzed tables
+    return int(row[0]) if row is not None and row[0] is not None and row[0] >= 0 else None
+
+
+class CountCache:
+    """Exact counts cached per (model, SQL of the filtered queryset), dropped on writes to the model."""
+
+    def __init__(self, cache_alias: str, models: Iterable[Type[Model]]) -> None:
+        self.cache = caches[cache_alias]
+        self.versions = ModelVersions(self.cache, {get_model_label(model) for model in models})
+
+    @classmethod
+    def from_settings(cls, models: Iterable[Type[Model]]) -> "CountCache":
+        # versions are bumped by the receivers connected in AppConfig.ready()
+        return cls(get_setting("AUTOGRAPHQL_COUNT_CACHE", "default", str), models)
+
+    async def get_cache_key(self, queryset: QuerySet[Any]) -> str:
+        label = get_model_label(queryset.model)
+        versions = await self.versions.get_many([label])
+        sql, params = queryset.query.sql_with_params()
+        key_source = repr((label, versions[label], queryset.db, sql, params))
+        return COUNT_KEY_PREFIX + hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    async def count(self, queryset: QuerySet[Any], mode: CountMode) -> int:
+        if mode == CountMode.EXACT:
+            return await run_sync(queryset.count)
+
+        if not queryset.query.where:
+            estimate = await run_sync(estimate_table_rows, queryset.model, queryset.db)
+            if estimate is not None:
+                return estimate
+
+        cache_key = await self.get_cache_key(queryset)
+        count: Optional[int] = await self.cache.aget(cache_key)
+        if count is None:
+            count = await run_sync(queryset.count)
+            await self.cache.aset(cache_key, count, timeout=get_setting("AUTOGRAPHQL_COUNT_CACHE_TTL", 300, int))
+        return count
+
+
+def create_total_count_field(model: Type[Model], filter_obj: Any, count_cache: CountCache) -> Any:
+    """Number of rows the generated list returns for the same filters, without pagination."""
+
+    async def resolve_total_count(
+        info: Info[Any, Any],
+        filters: Optional[filter_obj] = strawberry.UNSET,
+        mode: Optional[CountMode] = None,
+    ) -> int:
+        queryset = django_filters.apply(filters, model._default_manager.all(), info=info)
+        return await count_cache.count(queryset, mode or get_default_count_mode())
+
+    return strawberry.field(resolver=cast(Any, resolve_total_count))
+
+
+def create_connection_total_count(count_cache: CountCache) -> Any:
+    """totalCount of a connection, counted from the filtered queryset the connection keeps."""
+
+    async def resolve_total_count(root: Any, mode: Optional[CountMode] = None) -> int:
+        return await count_cache.count(root._queryset, mode or get_default_count_mode())
+
+    return strawberry.field(resolver=resolve_total_count)
@@ -0,0 +1,176 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import (
+    cached_property,
+    partial,
+)
+from typing import (
+    Any,
+    Optional,
+    Type,
+    Union,
+    cast,
+)
+
+from django.db.models import (
+    F,
+    Field,
+    ForeignObjectRel,
+    Model,
+    QuerySet,
+    Window,
+)
+from django.db.models.expressions import OrderBy
+from django.db.models.functions import RowNumber
+from graphql import print_ast
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+from strawberry_django.fields.field import StrawberryDjangoField
+from typing_extensions import Self
+
+from .db_pool import fetch
+
+Relation = Union["Field[Any, Any]", ForeignObjectRel]
+
+ROW_KEY = "_autographql_key"
+ROW_NUMBER = "_autographql_row"
+
+
+@dataclass(frozen=True)
+class RelationSpec:
+    """How to batch one relation: rows of related_model whose lookup equals parent's parent_attname."""
+
+    related_model: Type[Model]
+    lookup: str
+    parent_attname: str
+    many: bool
+
+    @classmethod
+    def from_relation(cls, relation: Relation) -> "RelationSpec":
+        related_model: Type[Model] = relation.related_model  # type: ignore
+        if isinstance(relation, ForeignObjectRel):
+            remote_field: Any = relation.field
+            if relation.many_to_many:
+                # reverse M2M: Genre -> Book via Book.genres
+                return cls(related_model, remote_field.name, relation.model._meta.pk.attname, many=True)  # type: ignore
+            # reverse FK / O2O: Author -> Book via Book.author_id
+            return cls(
+                related_model,
+                remote_field.attname,
+                remote_field.target_field.attname,
+                many=relation.one_to_many,
+            )
+
+        field: Any = relation
+        if field.many_to_many:
+            # forward M2M: Book -> Genre via Genre.books
+            return cls(related_model, field.related_query_name(), field.model._meta.pk.attname, many=True)
+        # forward FK / O2O: Book.author_id -> Author.id
+        return cls(related_model, field.target_field.attname, field.attname, many=False)
+
+
+class RelationField(StrawberryDjangoField):  # type: ignore
+    """Relation field resolved through per-request DataLoaders, one IN (...) query per batch."""
+
+    relation: Optional[Relation] = None
+    # the related type holds only the primary key
+    keys_only: bool = False
+
+    def __copy__(self) -> Self:
+        new_field = cast(Self, super().__copy__())
+        new_field.relation = self.relation
+        new_field.keys_only = self.keys_only
+        return new_field
+
+    @cached_property
+    def relation_spec(self) -> RelationSpec:
+        assert self.relation is not None
+        return RelationSpec.from_relation(self.relation)
+
+    @cached_property
+    def is_key_to_pk(self) -> bool:
+        relation: Any = self.relation
+        return (
+            not isinstance(relation, ForeignObjectRel)
+            and not relation.many_to_many
+            and relation.target_field.primary_key
+        )
+
+    def get_result(self, source: Any, info: Info[Any, Any], args: list[Any], kwargs: dict[str, Any]) -> Any:
+        dataloaders = getattr(info.context, "dataloaders", None)
+        if source is None or self.relation is None or dataloaders is None:
+            return super().get_result(source, info, args, kwargs)
+
+        spec = self.relation_spec
+        if not spec.many:
+            try:
+                # already fetched with select_related by the optimizer
+                return self.relation.get_cached_value(source)
+            except KeyError:
+                pass
+
+        key = getattr(source, spec.parent_attname)
+        if key is None:
+            return [] if spec.many else None
+        if self.keys_only and self.is_key_to_pk:
+            # the foreign key value already is the whole key-only object
+            return spec.related_model(pk=key)
+
+        loader_key = (spec, self.get_selection_key(info, dataloaders), repr(sorted(kwargs.items())))
+        loader = dataloaders.get(loader_key)
+        if loader is None:
+            loader = dataloaders[loader_key] = DataLoader(load_fn=partial(self.load_batch, spec, info, kwargs))
+        return loader.load(key)
+
+    @staticmethod
+    def get_selection_key(info: Info[Any, Any], dataloaders: dict[Any, Any]) -> str:
+        """Selection text, so equal selections share loaders even across batched operations."""
+
+        node_ids = tuple(id(field_node) for field_node in info.field_nodes)
+        selection_key: Optional[str] = dataloaders.get(node_ids)
+        if selection_key is None:
+            selection_key = dataloaders[node_ids] = "\n".join(print_ast(field_node) for field_node in info.field_nodes)
+        return selection_key
+
+    def get_batch_queryset(
+        self,
+        spec: RelationSpec,
+        info: Info[Any, Any],
+        kwargs: dict[str, Any],
+        keys: list[Any],
+    ) -> QuerySet[Any]:
+        queryset = spec.related_model._default_manager.filter(**{f"{spec.lookup}__in": keys})
+        queryset = queryset.annotate(**{ROW_KEY: F(spec.lookup)})
+        queryset = self.get_queryset(queryset, info, **{**kwargs, "pagination": None})
+
+        pagination = kwargs.get("pagination")
+        if pagination is None or (pagination.offset <= 0 and pagination.limit < 0):
+            return queryset
+
+        # slicing would page the whole batch, number rows per parent instead
+        order_by = [
+            OrderBy(F(name.lstrip("-")), descending=name.startswith("-"))
+            for name in queryset.query.order_by
+            if isinstance(name, str)
+        ] or [OrderBy(F("pk"))]
+        queryset = queryset.annotate(
+            **{ROW_NUMBER: Window(RowNumber(), partition_by=[F(spec.lookup)], order_by=order_by)}
+        ).filter(**{f"{ROW_NUMBER}__gt": pagination.offset})
+        if pagination.limit >= 0:
+            queryset = queryset.filter(**{f"{ROW_NUMBER}__lte": pagination.offset + pagination.limit})
+        return queryset
+
+    async def load_batch(
+        self,
+        spec: RelationSpec,
+        info: Info[Any, Any],
+        kwargs: dict[str, Any],
+        keys: list[Any],
+    ) -> list[Any]:
+        groups: defaultdict[Any, list[Any]] = defaultdict(list)
+        for row in await fetch(self.get_batch_queryset(spec, info, kwargs, keys)):
+            groups[getattr(row, ROW_KEY)].append(row)
+
+        if spec.many:
+            return [groups.get(key, []) for key in keys]
+        return [groups[key][0] if key in groups else None for key in keys]
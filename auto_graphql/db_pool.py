@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    TypeVar,
+)
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.db.models import QuerySet
+
+from .conf import get_setting
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> Optional[ThreadPoolExecutor]:
+    """Shared pool of AUTOGRAPHQL_DB_THREADS threads, None when reads use per-request threads."""
+
+    global _executor
+    threads = get_setting("AUTOGRAPHQL_DB_THREADS", None, (int, type(None)))
+    if threads is None:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="autographql-db")
+    return _executor
+
+
+def call_in_pool_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # pool threads never see request_started/finished, so expire connections past CONN_MAX_AGE here
+    close_old_connections()
+    return func(*args, **kwargs)
+
+
+async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking ORM work for a read.
+
+    By default this is what the async ORM does, a hop to the request's own thread. With
+    AUTOGRAPHQL_DB_THREADS the work goes to a bounded shared pool whose threads keep their
+    connections open between requests (CONN_MAX_AGE), so concurrent clients share them.
+    """
+
+    executor = get_db_executor()
+    if executor is None:
+        return await sync_to_async(func)(*args, **kwargs)
+    return await sync_to_async(partial(call_in_pool_thread, func), thread_sensitive=False, executor=executor)(
+        *args, **kwargs
+    )
+
+
+async def fetch(queryset: "QuerySet[Any]") -> list[Any]:
+    """Rows of a queryset, prefetches included; async iteration over it would cost the same hop."""
+
+    return await run_sync(list, queryset)
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    Any,
+    Generic,
+    Iterator,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+
+from graphql import DocumentNode
+from strawberry.extensions import SchemaExtension
+
+from .conf import get_setting
+from .streaming import is_stream_chunk
+
+KT = TypeVar("KT")
+VT = TypeVar("VT")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache(Generic[KT, VT]):
+    """Thread-safe bounded LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError("LRU cache maxsize must be positive.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[KT, VT] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: KT) -> Optional[VT]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: KT, value: VT) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: KT) -> Optional[VT]:
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+def hash_query(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class PersistedQueryError(Exception):
+    def __init__(self, message: str, code: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class PersistedQueryRegistry:
+    """Apollo-style persisted queries: sha256 hash -> query text."""
+
+    def __init__(self, maxsize: int, allowlist: Optional[dict[str, str]] = None) -> None:
+        self.allowlist_mode = allowlist is not None
+        self._queries: LRUCache[str, str] = LRUCache(max(maxsize, len(allowlist or ())))
+        for query_hash, query in (allowlist or {}).items():
+            if hash_query(query) != query_hash:
+                raise ValueError(f"Allowlisted query hash {query_hash} does not match its query.")
+            self._queries.set(query_hash, query)
+
+    @classmethod
+    def from_settings(cls) -> "PersistedQueryRegistry":
+        allowlist_path = get_setting("AUTOGRAPHQL_PERSISTED_QUERIES_ALLOWLIST", None, (str, Path))
+        allowlist = None
+        if allowlist_path is not None:
+            with open(allowlist_path, encoding="utf-8") as allowlist_file:
+                allowlist = json.load(allowlist_file)
+            if not isinstance(allowlist, dict):
+                raise ValueError("AUTOGRAPHQL_PERSISTED_QUERIES_ALLOWLIST must point to a JSON object.")
+        return cls(get_setting("AUTOGRAPHQL_PERSISTED_QUERIES_SIZE", 1024, int), allowlist)
+
+    def resolve(self, query_hash: Any, query: Optional[str]) -> str:
+        """Return query text for hash, registering it when the client sent both."""
+
+        if not isinstance(query_hash, str):
+            raise PersistedQueryError("Invalid persisted query hash", "PERSISTED_QUERY_INVALID")
+
+        if query is None:
+            known_query = self._queries.get(query_hash)
+            if known_query is None:
+                if self.allowlist_mode:
+                    raise PersistedQueryError("PersistedQueryNotAllowed", "PERSISTED_QUERY_NOT_ALLOWED")
+                raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+            return known_query
+
+        if hash_query(query) != query_hash:
+            raise PersistedQueryError("provided sha does not match query", "PERSISTED_QUERY_HASH_MISMATCH")
+        if self.allowlist_mode:
+            self.check_allowed(query)
+        else:
+            self._queries.set(query_hash, query)
+        return query
+
+    def check_allowed(self, query: str) -> None:
+        if self.allowlist_mode and self._queries.get(hash_query(query)) is None:
+            raise PersistedQueryError("PersistedQueryNotAllowed", "PERSISTED_QUERY_NOT_ALLOWED")
+
+
+class DocumentCacheExtension(SchemaExtension):
+    """Skip parsing and validation for documents that already passed them."""
+
+    document_cache: LRUCache[str, DocumentNode]
+    report_stats: bool = False
+
+    @classmethod
+    def bind(cls, document_cache: LRUCache[str, DocumentNode], report_stats: bool) -> type["DocumentCacheExtension"]:
+        return type(cls.__name__, (cls,), {"document_cache": document_cache, "report_stats": report_stats})
+
+    def on_parse(self) -> Iterator[None]:
+        execution_context = self.execution_context
+        self._query_hash = hash_query(execution_context.query) if execution_context.query else None
+        self._cache_hit = False
+        root_value = execution_context.root_value
+        if is_stream_chunk(root_value) and root_value.document is not None:
+            # part of the streamed operation, validated with the whole of it
+            execution_context.graphql_document = root_value.document
+            self._cache_hit = True
+        elif self._query_hash is not None:
+            document = self.document_cache.get(self._query_hash)
+            if document is not None:
+                execution_context.graphql_document = document
+                self._cache_hit = True
+        yield
+
+    def on_validate(self) -> Iterator[None]:
+        execution_context = self.execution_context
+        if self._cache_hit:
+            # document was validated before it got into the cache
+            execution_context.errors = []
+        yield
+        if not self._cache_hit and not execution_context.errors and self._query_hash is not None:
+            assert execution_context.graphql_document
+            self.document_cache.set(self._query_hash, execution_context.graphql_document)
+
+    def get_results(self) -> dict[str, Any]:
+        if not self.report_stats:
+            return {}
+        info = self.document_cache.cache_info()
+        return {"documentCache": {"hit": getattr(self, "_cache_hit", False), **info._asdict()}}
@@ -0,0 +1,154 @@
+import csv
+import io
+import zlib
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterator,
+    Optional,
+    Type,
+    cast,
+)
+
+import strawberry
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import (
+    Model,
+    QuerySet,
+)
+from graphql import get_named_type
+from strawberry.schema.schema_converter import GraphQLCoreConverter
+
+from .streaming import (
+    NDJSON,
+    RootListField,
+    StreamRoot,
+)
+
+EXPORT_CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": NDJSON}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def get_export_fields(schema: strawberry.Schema) -> dict[str, Type[Model]]:
+    """Top-level list field name -> model, the models a schema can export."""
+
+    fields: dict[str, Type[Model]] = {}
+    for name, field_def in schema._schema.query_type.fields.items():  # type: ignore[union-attr]
+        field = field_def.extensions.get(GraphQLCoreConverter.DEFINITION_BACKREF)
+        if isinstance(field, RootListField):
+            fields[name] = field.django_model
+    return fields
+
+
+def get_export_columns(model: Type[Model]) -> list[str]:
+    # foreign keys as their id columns, nothing is joined
+    return [field.attname for field in model._meta.concrete_fields]  # type: ignore
+
+
+async def plan_export(
+    schema: strawberry.Schema,
+    field_name: str,
+    filters: Optional[dict[str, Any]] = None,
+    order: Optional[dict[str, Any]] = None,
+    context: Any = None,
+    chunk_size: int = 2000,
+) -> "QuerySet[Any]":
+    """Queryset of a top-level list field with filters and order applied, read by running the field planned.
+
+    The arguments are validated against the generated Filters and Orders inputs and go through the schema
+    extensions (filter planner, read replica routing) like any query of the list.
+    """
+
+    if field_name not in get_export_fields(schema):
+        raise ExportError(f"No model list named {field_name}.")
+    field_def = schema._schema.query_type.fields[field_name]  # type: ignore[union-attr]
+    variable_definitions = []
+    arguments = []
+    variables = {}
+    for argument, value in (("filters", filters), ("order", order)):
+        if value is None:
+            continue
+        if argument not in field_def.args:
+            raise ExportError(f"{field_name} has no {argument} argument.")
+        variable_definitions.append(f"${argument}: {get_named_type(field_def.args[argument].type).name}")
+        arguments.append(f"{argument}: ${argument}")
+        variables[argument] = value
+    query = (
+        f"query Export{'(' + ', '.join(variable_definitions) + ')' if variable_definitions else ''} "
+        f"{{ {field_name}{'(' + ', '.join(arguments) + ')' if arguments else ''} {{ __typename }} }}"
+    )
+
+    stream_root = StreamRoot(chunk_size=chunk_size)
+    result = await schema.execute(query, root_value=stream_root, variable_values=variables, context_value=context)
+    if result.errors:
+        raise ExportError("; ".join(error.message for error in result.errors))
+    queryset = stream_root.querysets[field_name]
+    return cast("QuerySet[Any]", queryset.prefetch_related(None).values_list(*get_export_columns(queryset.model)))
+
+
+class ExportEncoder:
+    """values_list() rows as CSV or NDJSON bytes, gzip-compressed as one stream when asked."""
+
+    def __init__(self, columns: list[str], export_format: str, compress: bool = False) -> None:
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise ExportError(f"Unknown export format {export_format}, expected one of: csv, ndjson.")
+        self.columns = columns
+        self.export_format = export_format
+        self.compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+        self.dumps = DjangoJSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+        self.rows = 0
+
+    @property
+    def content_type(self) -> str:
+        return "application/gzip" if self.compressor is not None else EXPORT_CONTENT_TYPES[self.export_format]
+
+    def get_filename(self, model: Type[Model]) -> str:
+        return f"{model._meta.label_lower}.{self.export_format}{'.gz' if self.compressor is not None else ''}"
+
+    def header(self) -> bytes:
+        return self.encode_text(self.format_csv([self.columns]) if self.export_format == "csv" else "")
+
+    def encode(self, rows: list[tuple[Any, ...]]) -> bytes:
+        self.rows += len(rows)
+        if self.export_format == "csv":
+            return self.encode_text(self.format_csv(rows))
+        columns, dumps = self.columns, self.dumps
+        return self.encode_text("".join(f"{dumps(dict(zip(columns, row)))}\n" for row in rows))
+
+    def finish(self) -> bytes:
+        return self.compressor.flush() if self.compressor is not None else b""
+
+    @staticmethod
+    def format_csv(rows: Any) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue()
+
+    def encode_text(self, text: str) -> bytes:
+        data = text.encode("utf-8")
+        return self.compressor.compress(data) if self.compressor is not None else data
+
+
+def iter_export(queryset: "QuerySet[Any]", encoder: ExportEncoder, chunk_size: int) -> Iterator[bytes]:
+    """Encoded chunks of chunk_size rows; iterator() reads them through a server-side cursor where there is one."""
+
+    yield encoder.header()
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        yield encoder.encode(chunk)
+    yield encoder.finish()
+
+
+async def aiter_export(queryset: "QuerySet[Any]", encoder: ExportEncoder, chunk_size: int) -> AsyncIterator[bytes]:
+    yield encoder.header()
+    # not aiterator(): on values_list() querysets it opens the cursor in the event loop
+    rows = queryset.iterator(chunk_size=chunk_size)
+    read_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    while chunk := await read_chunk():
+        yield encoder.encode(chunk)
+    yield encoder.finish()
@@ -0,0 +1,139 @@
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Optional,
+)
+
+from django.db.models import QuerySet
+from graphql import (
+    FieldNode,
+    GraphQLObjectType,
+    GraphQLScalarType,
+    get_named_type,
+)
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.schema_converter import GraphQLCoreConverter
+from strawberry.types import Info
+from strawberry_django.fields.field import StrawberryDjangoField
+
+from .db_pool import fetch
+
+# scalars whose database values are already what the JSON response holds
+PLAIN_SCALARS = {"String", "Int", "Float", "Boolean"}
+
+# response key -> rows of the top-level lists read by the fast path in the current operation
+current_scalar_lists: ContextVar[Optional[dict[str, list[dict[str, Any]]]]] = ContextVar(
+    "autographql_scalar_lists", default=None
+)
+
+
+class ScalarSelection:
+    """A flat selection of model columns: read with values_list(), rows become response dicts as they are."""
+
+    def __init__(self, type_name: str) -> None:
+        self.type_name = type_name
+        self.keys: list[str] = []
+        self.columns: list[str] = []
+        # per response key: position in the values_list() row (None for __typename), serializer if not plain
+        self.indexes: list[Optional[int]] = []
+        self.serializers: list[Optional[Callable[[Any], Any]]] = []
+
+    @classmethod
+    def from_field_node(cls, field_node: FieldNode, object_type: GraphQLObjectType) -> Optional["ScalarSelection"]:
+        """None unless every selected field is a model column without arguments, directives or fragments."""
+
+        if field_node.selection_set is None:
+            return None
+        selection = cls(object_type.name)
+        for node in field_node.selection_set.selections:
+            if not isinstance(node, FieldNode) or node.directives or node.arguments:
+                return None
+            if node.name.value == "__typename":
+                selection.add((node.alias or node.name).value, None, None)
+                continue
+            field_def = object_type.fields.get(node.name.value)
+            if field_def is None:
+                return None
+            field = field_def.extensions.get(GraphQLCoreConverter.DEFINITION_BACKREF)
+            scalar_type = get_named_type(field_def.type)
+            # relations and resolver fields (counts) need the instances
+            if (
+                not isinstance(field, StrawberryDjangoField)
+                or field.is_relation
+                or field.base_resolver is not None
+                or not isinstance(scalar_type, GraphQLScalarType)
+            ):
+                return None
+            selection.add(
+                (node.alias or node.name).value,
+                field.django_name or field.python_name,
+                None if scalar_type.name in PLAIN_SCALARS else scalar_type.serialize,
+            )
+        return selection
+
+    def add(self, key: str, column: Optional[str], serialize: Optional[Callable[[Any], Any]]) -> None:
+        if column is not None and column not in self.columns:
+            self.columns.append(column)
+        self.keys.append(key)
+        self.indexes.append(None if column is None else self.columns.index(column))
+        self.serializers.append(serialize)
+
+    def to_dicts(self, rows: list[tuple[Any, ...]]) -> list[dict[str, Any]]:
+        keys = self.keys
+        if self.indexes == list(range(len(keys))) and not any(self.serializers):
+            return [dict(zip(keys, row)) for row in rows]
+        fields = list(zip(keys, self.indexes, self.serializers))
+        type_name = self.type_name
+        return [
+            {
+                key: (
+                    type_name
+                    if index is None
+                    else value
+                    if (value := row[index]) is None or serialize is None
+                    else serialize(value)
+                )
+                for key, index, serialize in fields
+            }
+            for row in rows
+        ]
+
+
+async def read_scalar_list(
+    queryset: "QuerySet[Any]", info: Info[Any, Any], scalar_lists: dict[str, list[dict[str, Any]]]
+) -> list[Any]:
+    object_type = get_named_type(info._raw_info.return_type)
+    selection = (
+        ScalarSelection.from_field_node(info.field_nodes[0], object_type)
+        if isinstance(object_type, GraphQLObjectType) and len(info.field_nodes) == 1
+        else None
+    )
+    if selection is None:
+        return await fetch(queryset)
+    rows = await fetch(queryset.prefetch_related(None).values_list(*selection.columns))
+    scalar_lists[str(info.path.key)] = selection.to_dicts(rows)
+    # the list is put into the result after execution, there is nothing to resolve per row
+    return []
+
+
+class ScalarFastPathExtension(SchemaExtension):
+    """Answer top-level lists of plain columns from values_list() rows, skipping per-field resolvers.
+
+    Must come before extensions that read the result on exit (response cache, query log):
+    strawberry exits extensions in the order they are listed.
+    """
+
+    def on_execute(self) -> Iterator[None]:
+        scalar_lists: dict[str, list[dict[str, Any]]] = {}
+        token = current_scalar_lists.set(scalar_lists)
+        try:
+            yield
+        finally:
+            current_scalar_lists.reset(token)
+        result = self.execution_context.result
+        if scalar_lists and result is not None and result.data is not None:
+            for response_key, rows in scalar_lists.items():
+                if response_key in result.data:
+                    result.data[response_key] = rows
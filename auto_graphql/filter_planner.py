@@ -0,0 +1,202 @@
+from typing import (
+    Any,
+    AsyncIterator,
+    List,
+    Optional,
+    Type,
+)
+
+import strawberry
+from django.db.models import (
+    CharField,
+    Model,
+    TextField,
+)
+from graphql import (
+    ExecutionResult,
+    GraphQLError,
+)
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import SchemaExtension
+from strawberry.utils.str_converters import (
+    to_camel_case,
+    to_snake_case,
+)
+from strawberry_django.filters import FilterLookup
+
+from .conf import get_setting
+from .counting import (
+    CountCache,
+    CountMode,
+)
+from .query_log import (
+    FilterUsageCollector,
+    get_filter_lookups,
+)
+from .search import is_indexed_search
+from .streaming import is_stream_chunk
+
+# Django lookups a B-tree index can serve; equality columns go first, one range column may follow
+EQUALITY_LOOKUPS = {"exact", "in", "isnull"}
+RANGE_LOOKUPS = {"gt", "gte", "lt", "lte", "range", "startswith"}
+# the same lookups under their FilterLookup names
+INDEXED_FILTER_LOOKUPS = ["exact", "in_list", "is_null", "gt", "gte", "lt", "lte", "range", "starts_with"]
+
+
+def get_allowed_lookups(model: Type[Model], field_name: str) -> Optional[list[str]]:
+    """FilterLookup attribute names allowed on a field by AUTOGRAPHQL_FILTER_LOOKUPS, None when unrestricted.
+
+    Keys are model labels and field names, "*" matches any model or field.
+    """
+
+    config = get_setting("AUTOGRAPHQL_FILTER_LOOKUPS", None, dict)
+    if config is None:
+        return None
+    models_config = {str(key).lower(): value for key, value in config.items()}
+    for model_key in (model._meta.label_lower, "*"):
+        fields_config = models_config.get(model_key)
+        if fields_config is None:
+            continue
+        for field_key in (field_name, "*"):
+            if field_key not in fields_config:
+                continue
+            lookups = [to_snake_case(lookup) for lookup in fields_config[field_key]]
+            unknown = [lookup for lookup in lookups if lookup not in FilterLookup.__annotations__]
+            if unknown:
+                raise ValueError(f"AUTOGRAPHQL_FILTER_LOOKUPS setting has unknown lookups: {', '.join(unknown)}.")
+            return lookups
+    return None
+
+
+def create_filter_lookup_type(name: str, python_type: Any, lookups: list[str]) -> Any:
+    """FilterLookup input restricted to the allowed lookups."""
+
+    annotations: dict[str, Any] = {}
+    for lookup in lookups:
+        base_lookup = lookup[2:] if lookup.startswith("n_") else lookup
+        if base_lookup in ("in_list", "range"):
+            annotations[lookup] = Optional[List[python_type]]
+        elif base_lookup == "is_null":
+            annotations[lookup] = Optional[bool]
+        elif base_lookup in ("regex", "i_regex"):
+            annotations[lookup] = Optional[str]
+        else:
+            annotations[lookup] = Optional[python_type]
+    return strawberry.input(
+        type(name, (), {"__annotations__": annotations, **{lookup: strawberry.UNSET for lookup in lookups}})
+    )
+
+
+def get_existing_indexes(model: Type[Model]) -> list[tuple[str, ...]]:
+    meta = model._meta
+    existing: list[tuple[str, ...]] = [
+        (model_field.name,)
+        for model_field in meta.fields
+        if model_field.primary_key or model_field.unique or getattr(model_field, "db_index", False)
+    ]
+    existing.extend(tuple(index.fields) for index in meta.indexes if index.fields)
+    existing.extend(tuple(fields) for fields in meta.unique_together)
+    return existing
+
+
+def get_indexed_fields(model: Type[Model]) -> list[str]:
+    # only the leading column of an index narrows a lookup on its own
+    return list(dict.fromkeys(index[0].lstrip("-") for index in get_existing_indexes(model)))
+
+
+def get_cheap_filters(model: Type[Model], filter_fields: set[str]) -> dict[str, list[str]]:
+    """GraphQL field name -> lookups that can use an index, among the fields model Filters expose."""
+
+    cheap_filters: dict[str, list[str]] = {}
+    for field_name in get_indexed_fields(model):
+        if field_name not in filter_fields:
+            continue
+        model_field: Any = model._meta.get_field(field_name)
+        allowed = get_allowed_lookups(model, field_name)
+        lookups = [
+            lookup
+            for lookup in INDEXED_FILTER_LOOKUPS
+            if (allowed is None or lookup in allowed)
+            and (lookup != "is_null" or model_field.null)
+            and (lookup != "starts_with" or isinstance(model_field, (CharField, TextField)))
+        ]
+        if lookups:
+            cheap_filters[to_camel_case(field_name)] = [to_camel_case(lookup) for lookup in lookups]
+    return cheap_filters
+
+
+def can_use_index(model: Type[Model], lookups: list[tuple[str, str]]) -> bool:
+    indexed_fields = set(get_indexed_fields(model))
+    return any(name in indexed_fields and lookup in EQUALITY_LOOKUPS | RANGE_LOOKUPS for name, lookup in lookups)
+
+
+class FilterPlannerExtension(SchemaExtension):
+    """Reject filters no index can serve on tables above AUTOGRAPHQL_FILTER_SCAN_MAX_ROWS.
+
+    A filter passes when one of its AND-ed lookups is an equality or range lookup on the leading
+    column of an index, or a search the full-text index serves; the rest of the predicate is then
+    checked on the rows the index yields.
+    """
+
+    count_cache: CountCache
+    type_models: dict[str, Type[Model]]
+    filter_fields: dict[Type[Model], set[str]]
+
+    @classmethod
+    def bind(
+        cls,
+        count_cache: CountCache,
+        type_models: dict[str, Type[Model]],
+        filter_fields: dict[Type[Model], set[str]],
+    ) -> type["FilterPlannerExtension"]:
+        return type(
+            cls.__name__,
+            (cls,),
+            {"count_cache": count_cache, "type_models": type_models, "filter_fields": filter_fields},
+        )
+
+    async def on_execute(self) -> AsyncIterator[None]:
+        max_rows = get_setting("AUTOGRAPHQL_FILTER_SCAN_MAX_ROWS", None, (int, type(None)))
+        execution_context = self.execution_context
+        if (
+            max_rows is not None
+            and execution_context.result is None
+            and not is_stream_chunk(execution_context.root_value)
+        ):
+            await self.check_filters(max_rows)
+        yield
+
+    async def check_filters(self, max_rows: int) -> None:
+        execution_context = self.execution_context
+        document = execution_context.graphql_document
+        if document is None:
+            return
+        operation = get_operation_ast(document, execution_context.operation_name)
+        if operation is None:
+            return
+        collector = FilterUsageCollector(execution_context.schema._schema, document, execution_context.variables)
+        root_type = collector.root_type(operation)
+        if root_type is None:
+            return
+
+        # nested relation lists are fetched by the indexed relation key, only root lists can scan
+        root_arguments = collector.iter_arguments(root_type, operation.selection_set, self.type_models, nested=False)
+        for model, arguments in root_arguments:
+            filters = arguments.get("filters")
+            if not filters or can_use_index(model, get_filter_lookups(filters)) or is_indexed_search(model, filters):
+                continue
+            rows = await self.count_cache.count(model._default_manager.all(), CountMode.FAST)
+            if rows <= max_rows:
+                continue
+
+            cheap_filters = get_cheap_filters(model, self.filter_fields.get(model, set()))
+            execution_context.errors = [
+                GraphQLError(
+                    f"Filter on {model._meta.label} cannot use an index and the table has about {rows} rows. "
+                    f"Add one of the indexed filters: {cheap_filters or 'none'}.",
+                    nodes=[operation],
+                    extensions={"code": "FILTER_NOT_INDEXED", "cheapFilters": cheap_filters},
+                )
+            ]
+            execution_context.result = ExecutionResult(data=None, errors=execution_context.errors)
+            return
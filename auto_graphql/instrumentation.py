@@ -0,0 +1,224 @@
+import heapq
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import (
+    dataclass,
+    field,
+)
+from inspect import isawaitable
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+)
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from graphql import GraphQLResolveInfo
+from strawberry.extensions import SchemaExtension
+
+from .conf import get_setting
+from .metrics import (
+    MetricsRegistry,
+    registry,
+)
+from .streaming import is_stream_chunk
+
+current_report: ContextVar[Optional["OperationReport"]] = ContextVar("autographql_operation_report", default=None)
+
+_statement_order = itertools.count()
+
+
+@dataclass
+class OperationReport:
+    """Database and resolver work of one operation; statements from every thread it awaited."""
+
+    slowest_size: int
+    detailed: bool
+    query_count: int = 0
+    db_time: float = 0.0
+    slowest: list[tuple[float, int, str]] = field(default_factory=list)
+    resolvers: dict[str, list[float]] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add_statement(self, sql: str, duration: float) -> None:
+        with self.lock:
+            self.query_count += 1
+            self.db_time += duration
+            if not self.detailed:
+                return
+            entry = (duration, next(_statement_order), sql)
+            if len(self.slowest) < self.slowest_size:
+                heapq.heappush(self.slowest, entry)
+            elif self.slowest and duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def add_resolver(self, path: str, duration: float) -> None:
+        with self.lock:
+            timing = self.resolvers.get(path)
+            if timing is None:
+                self.resolvers[path] = [1, duration]
+            else:
+                timing[0] += 1
+                timing[1] += duration
+
+
+def record_query(execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+    report = current_report.get()
+    if report is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        report.add_statement(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def connect_query_recorder() -> None:
+    """Record statements on every connection; the wrapper is a no-op outside instrumented operations."""
+
+    connection_created.connect(install_query_recorder, dispatch_uid="autographql-query-recorder")
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+
+
+class OperationLabels:
+    """Bounded label values for operation names, which clients choose freely.
+
+    Names in AUTOGRAPHQL_METRICS_OPERATIONS keep their own series, others go under "other". Without the
+    allowlist the first AUTOGRAPHQL_METRICS_MAX_OPERATIONS distinct names do.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._seen: set[str] = set()
+
+    def get(self, operation_name: Optional[str]) -> str:
+        if operation_name is None:
+            return "anonymous"
+        allowed = get_setting("AUTOGRAPHQL_METRICS_OPERATIONS", None, (list, type(None)))
+        if allowed is not None:
+            return operation_name if operation_name in allowed else "other"
+        with self._lock:
+            if operation_name in self._seen:
+                return operation_name
+            if len(self._seen) < get_setting("AUTOGRAPHQL_METRICS_MAX_OPERATIONS", 100, int):
+                self._seen.add(operation_name)
+                return operation_name
+        return "other"
+
+
+def get_resolver_path(info: GraphQLResolveInfo) -> str:
+    # list indexes are dropped, so all rows of one field add up under one path
+    return ".".join(str(key) for key in info.path.as_list() if isinstance(key, str))
+
+
+class InstrumentationExtension(SchemaExtension):
+    """Per-operation SQL and resolver timings.
+
+    Aggregates go to the metrics registry, the full report is added to extensions
+    when the request carries AUTOGRAPHQL_DEBUG_HEADER.
+    """
+
+    metrics: MetricsRegistry = registry
+    operation_labels = OperationLabels()
+
+    def is_debug_requested(self) -> bool:
+        request = getattr(self.execution_context.context, "request", None)
+        if request is None:
+            return False
+        header = request.headers.get(get_setting("AUTOGRAPHQL_DEBUG_HEADER", "X-AutoGraphQL-Debug", str))
+        if header is None:
+            return False
+        token = get_setting("AUTOGRAPHQL_DEBUG_TOKEN", None, str)
+        return bool(settings.DEBUG) if token is None else header == token
+
+    def on_operation(self) -> Iterator[None]:
+        if is_stream_chunk(self.execution_context.root_value):
+            # a stream counts as the one operation that planned it
+            yield
+            return
+        self.report = report = OperationReport(
+            slowest_size=get_setting("AUTOGRAPHQL_INSTRUMENTATION_SLOWEST", 5, int),
+            detailed=self.is_debug_requested(),
+        )
+        token = current_report.set(report)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.duration = time.perf_counter() - started
+            current_report.reset(token)
+            self.record_metrics()
+
+    def record_metrics(self) -> None:
+        execution_context = self.execution_context
+        operation = self.operation_labels.get(execution_context.operation_name)
+        report = self.report
+        self.metrics.increment("graphql_operations_total", operation=operation)
+        result = execution_context.result
+        if result is not None and result.errors:
+            self.metrics.increment("graphql_operation_errors_total", operation=operation)
+        self.metrics.observe("graphql_operation_seconds", self.duration, operation=operation)
+        self.metrics.observe("graphql_operation_sql_queries", report.query_count, operation=operation)
+        self.metrics.observe("graphql_operation_sql_seconds", report.db_time, operation=operation)
+
+    def resolve(
+        self,
+        _next: Callable[..., Any],
+        root: Any,
+        info: GraphQLResolveInfo,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        report = current_report.get()
+        if report is None or not report.detailed:
+            return _next(root, info, *args, **kwargs)
+
+        started = time.perf_counter()
+        result = _next(root, info, *args, **kwargs)
+        if isawaitable(result):
+            return self.await_resolver(result, report, info, started)
+        report.add_resolver(get_resolver_path(info), time.perf_counter() - started)
+        return result
+
+    @staticmethod
+    async def await_resolver(
+        result: Awaitable[Any], report: OperationReport, info: GraphQLResolveInfo, started: float
+    ) -> Any:
+        try:
+            return await result
+        finally:
+            report.add_resolver(get_resolver_path(info), time.perf_counter() - started)
+
+    def get_results(self) -> dict[str, Any]:
+        report: Optional[OperationReport] = getattr(self, "report", None)
+        if report is None or not report.detailed:
+            return {}
+        return {
+            "instrumentation": {
+                "sql": {
+                    "count": report.query_count,
+                    "timeMs": round(report.db_time * 1000, 3),
+                    "slowest": [
+                        {"sql": sql, "timeMs": round(duration * 1000, 3)}
+                        for duration, _, sql in sorted(report.slowest, reverse=True)
+                    ],
+                },
+                "resolvers": {
+                    path: {"count": count, "timeMs": round(duration * 1000, 3)}
+                    for path, (count, duration) in sorted(report.resolvers.items())
+                },
+            }
+        }
@@ -0,0 +1,280 @@
+import ast
+import inspect
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Type,
+    cast,
+)
+
+from django.apps import apps
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+    migrations,
+    models,
+)
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+
+from auto_graphql.conf import get_setting
+from auto_graphql.counting import estimate_table_rows
+from auto_graphql.filter_planner import (
+    EQUALITY_LOOKUPS,
+    RANGE_LOOKUPS,
+    get_existing_indexes,
+)
+from auto_graphql.query_log import (
+    FieldUsage,
+    read_query_log,
+)
+
+
+@dataclass
+class Candidate:
+    model: Type[models.Model]
+    columns: tuple[str, ...]
+    uses: int = 0
+    seconds: float = 0.0
+
+    @property
+    def label(self) -> str:
+        return f"{self.model._meta.label}({', '.join(self.columns)})"
+
+
+def get_index_columns(model: Type[models.Model], usage: FieldUsage) -> tuple[str, ...]:
+    """Columns of the index serving one usage: equality filters, a range filter, then the order."""
+
+    concrete = {model_field.name for model_field in model._meta.fields}
+    equality = sorted({name for name, lookup in usage.filters if lookup in EQUALITY_LOOKUPS and name in concrete})
+    ranges = sorted({name for name, lookup in usage.filters if lookup in RANGE_LOOKUPS and name in concrete})
+    range_column = next((name for name in ranges if name not in equality), None)
+
+    columns = list(equality)
+    order = [(name, direction) for name, direction in usage.order if name in concrete and name not in equality]
+    # after a range column only ordering on that same column is still served by the index
+    if order and (range_column is None or order[0][0] == range_column):
+        columns.extend(f"-{name}" if direction == "desc" else name for name, direction in order)
+    elif range_column is not None:
+        columns.append(range_column)
+    return tuple(dict.fromkeys(columns))
+
+
+def is_covered(columns: tuple[str, ...], existing: list[tuple[str, ...]]) -> bool:
+    names = tuple(column.lstrip("-") for column in columns)
+    mixed_directions = len({column.startswith("-") for column in columns}) > 1
+    for index in existing:
+        leading = index[: len(columns)]
+        if tuple(column.lstrip("-") for column in leading) != names:
+            continue
+        # single-direction scans read an index backwards just as well
+        if not mixed_directions or leading == columns:
+            return True
+    return False
+
+
+def format_index(index: models.Index) -> str:
+    # JSON strings are the double-quoted literals black would write
+    return f"models.Index(fields={json.dumps(list(index.fields))}, name={json.dumps(index.name)})"
+
+
+def insert_meta_indexes(source: bytes, class_name: str, indexes: list[models.Index]) -> bytes:
+    """Source of a models module with indexes appended to Meta.indexes of one of its classes."""
+
+    module = ast.parse(source)
+    if not any(
+        isinstance(node, ast.ImportFrom)
+        and node.module == "django.db"
+        and any(alias.name == "models" and alias.asname is None for alias in node.names)
+        for node in module.body
+    ):
+        raise ValueError("the module does not import models from django.db")
+    model_class = next(
+        (node for node in module.body if isinstance(node, ast.ClassDef) and node.name == class_name), None
+    )
+    if model_class is None:
+        raise ValueError(f"{class_name} is not defined at the top level of the module")
+
+    # ast offsets count bytes, so the edit is made on the encoded source
+    lines = source.splitlines(keepends=True)
+    entries = [format_index(index) for index in indexes]
+
+    def offset(line: int, column: int) -> int:
+        return sum(len(text) for text in lines[: line - 1]) + column
+
+    def block(indent: str) -> str:
+        return "".join(f"{indent}    {entry},\n" for entry in entries)
+
+    meta = next((node for node in model_class.body if isinstance(node, ast.ClassDef) and node.name == "Meta"), None)
+    if meta is None:
+        indent = " " * model_class.body[0].col_offset
+        start = end = offset(cast(int, model_class.end_lineno) + 1, 0)
+        insert = f"\n{indent}class Meta:\n{indent}    indexes = [\n{block(indent + '    ')}{indent}    ]\n"
+    else:
+        indent = " " * meta.body[0].col_offset
+        assignment = next(
+            (
+                node
+                for node in meta.body
+                if isinstance(node, ast.Assign)
+                and any(isinstance(target, ast.Name) and target.id == "indexes" for target in node.targets)
+            ),
+            None,
+        )
+        if assignment is None:
+            start = end = offset(cast(int, meta.end_lineno) + 1, 0)
+            insert = f"{indent}indexes = [\n{block(indent)}{indent}]\n"
+        elif not isinstance(assignment.value, ast.List):
+            raise ValueError(f"Meta.indexes of {class_name} is not a list literal")
+        elif assignment.value.elts:
+            last = assignment.value.elts[-1]
+            start = end = offset(cast(int, last.end_lineno), cast(int, last.end_col_offset))
+            insert = "".join(f",\n{indent}    {entry}" for entry in entries)
+        else:
+            value = assignment.value
+            start = offset(value.lineno, value.col_offset)
+            end = offset(cast(int, value.end_lineno), cast(int, value.end_col_offset))
+            insert = f"[\n{block(indent)}{indent}]"
+    return source[:start] + insert.encode() + source[end:]
+
+
+def add_meta_indexes(model: Type[models.Model], indexes: list[models.Index]) -> str:
+    """Append indexes to Meta.indexes in the source file of the model and return its path."""
+
+    path = inspect.getsourcefile(model)
+    if path is None:
+        raise ValueError(f"no source file of {model._meta.label}")
+    with open(path, "rb") as source_file:
+        source = insert_meta_indexes(source_file.read(), model.__name__, indexes)
+    with open(path, "wb") as model_file:
+        model_file.write(source)
+    return path
+
+
+class Command(BaseCommand):
+    help = "Propose indexes for the filters and orderings recorded in AUTOGRAPHQL_QUERY_LOG."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--log", help="Query log path, AUTOGRAPHQL_QUERY_LOG by default.")
+        parser.add_argument("--top", type=int, default=10, help="How many candidates to show.")
+        parser.add_argument("--min-rows", type=int, default=1000, help="Skip tables with fewer rows.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--write-migration", action="store_true", help="Write a migration per app.")
+        parser.add_argument(
+            "--edit-models",
+            action="store_true",
+            help="With --write-migration, also append the indexes to Meta.indexes in the models' source files.",
+        )
+        parser.add_argument("--name", default="autographql_indexes", help="Name suffix of written migrations.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        log_path = options["log"] or get_setting("AUTOGRAPHQL_QUERY_LOG", None, str)
+        if log_path is None or not os.path.exists(log_path):
+            raise CommandError("Query log not found, set AUTOGRAPHQL_QUERY_LOG or pass --log.")
+
+        candidates = self.get_candidates(log_path, options["database"], options["min_rows"])[: options["top"]]
+        if not candidates:
+            self.stdout.write("No index candidates.")
+            return
+        for rank, candidate in enumerate(candidates, 1):
+            self.stdout.write(
+                f"{rank:>3}. {candidate.label}: {candidate.uses} uses, "
+                f"up to {candidate.seconds:.3f}s of recorded SQL time"
+            )
+        if options["write_migration"]:
+            self.write_migrations(candidates, options["name"], options["edit_models"])
+
+    def get_candidates(self, log_path: str, database: str, min_rows: int) -> list[Candidate]:
+        usage_seconds: defaultdict[FieldUsage, list[float]] = defaultdict(list)
+        for usage, seconds in read_query_log(log_path):
+            usage_seconds[usage].append(seconds)
+
+        by_columns: dict[tuple[Type[models.Model], tuple[str, ...]], Candidate] = {}
+        table_rows: dict[Type[models.Model], int] = {}
+        for usage, durations in usage_seconds.items():
+            try:
+                model = apps.get_model(usage.model)
+            except LookupError:
+                continue
+            columns = get_index_columns(model, usage)
+            if not columns or is_covered(columns, get_existing_indexes(model)):
+                continue
+            if model not in table_rows:
+                rows = estimate_table_rows(model, database)
+                table_rows[model] = rows if rows is not None else model._default_manager.using(database).count()
+            if table_rows[model] < min_rows:
+                continue
+            candidate = by_columns.setdefault((model, columns), Candidate(model, columns))
+            candidate.uses += len(durations)
+            candidate.seconds += sum(durations)
+
+        # an index also serves every query using a leading part of it
+        candidates = sorted(by_columns.values(), key=lambda candidate: -len(candidate.columns))
+        merged: list[Candidate] = []
+        for candidate in candidates:
+            wider = next(
+                (
+                    other
+                    for other in merged
+                    if other.model is candidate.model and other.columns[: len(candidate.columns)] == candidate.columns
+                ),
+                None,
+            )
+            if wider is None:
+                merged.append(candidate)
+            else:
+                wider.uses += candidate.uses
+                wider.seconds += candidate.seconds
+        return sorted(merged, key=lambda candidate: candidate.seconds, reverse=True)
+
+    def write_migrations(self, candidates: list[Candidate], name: str, edit_models: bool = False) -> None:
+        loader = MigrationLoader(connections[DEFAULT_DB_ALIAS], ignore_no_migrations=True)
+        by_app: defaultdict[str, list[Candidate]] = defaultdict(list)
+        for candidate in candidates:
+            by_app[candidate.model._meta.app_label].append(candidate)
+
+        for app_label, app_candidates in by_app.items():
+            leaves = loader.graph.leaf_nodes(app_label)
+            if not leaves:
+                self.stderr.write(f"{app_label} has no migrations, skipped.")
+                continue
+            operations = []
+            model_indexes: defaultdict[Type[models.Model], list[models.Index]] = defaultdict(list)
+            for candidate in app_candidates:
+                index = models.Index(fields=list(candidate.columns), name="")
+                index.set_name_with_model(candidate.model)
+                model_indexes[candidate.model].append(index)
+                operations.append(
+                    migrations.AddIndex(model_name=cast(str, candidate.model._meta.model_name), index=index)
+                )
+
+            number = max(MigrationAutodetector.parse_number(leaf_name) or 0 for _, leaf_name in leaves) + 1
+            migration = type("Migration", (migrations.Migration,), {"dependencies": leaves, "operations": operations})(
+                f"{number:04d}_{name}", app_label
+            )
+            writer = MigrationWriter(migration)
+            with open(writer.path, "w", encoding="utf-8") as migration_file:
+                migration_file.write(writer.as_string())
+            self.stdout.write(f"Wrote {writer.path}")
+            self.add_model_indexes(model_indexes, edit_models)
+
+    def add_model_indexes(self, model_indexes: dict[Type[models.Model], list[models.Index]], edit_models: bool) -> None:
+        # without the same indexes in Meta.indexes the next makemigrations would remove them again
+        for model, indexes in model_indexes.items():
+            snippet = ", ".join(format_index(index) for index in indexes)
+            if not edit_models:
+                self.stdout.write(f"Add to Meta.indexes of {model._meta.label}: {snippet}")
+                continue
+            try:
+                self.stdout.write(f"Added to Meta.indexes in {add_meta_indexes(model, indexes)}")
+            except (OSError, SyntaxError, ValueError) as e:
+                self.stderr.write(f"Unable to edit {model._meta.label}: {e}; add to its Meta.indexes: {snippet}")
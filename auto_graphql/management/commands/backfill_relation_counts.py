@@ -0,0 +1,35 @@
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from auto_graphql.counters import get_counted_relations
+
+
+class Command(BaseCommand):
+    help = "Count the related rows of every AUTOGRAPHQL_COUNTER_CACHE relation again and store the counts."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--database", default="default")
+        parser.add_argument("relations", nargs="*", help='Only these, as "app_label.Model.relation".')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            counted = get_counted_relations()
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        if not counted:
+            raise CommandError("AUTOGRAPHQL_COUNTER_CACHE lists no relation.")
+        if options["relations"]:
+            labels = {relation.lower() for relation in options["relations"]}
+            unknown = labels - {relation.label for relation in counted}
+            if unknown:
+                raise CommandError(f"Not in AUTOGRAPHQL_COUNTER_CACHE: {', '.join(sorted(unknown))}.")
+            counted = [relation for relation in counted if relation.label in labels]
+
+        for relation in counted:
+            rows = relation.rebuild(options["database"])
+            self.stdout.write(f"{relation.label}: counted {rows} rows.")
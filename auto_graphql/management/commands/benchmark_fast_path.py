@@ -0,0 +1,95 @@
+import json
+import statistics
+import time
+from typing import (
+    Any,
+    Callable,
+)
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.http import HttpResponse
+from django.test import (
+    AsyncRequestFactory,
+    override_settings,
+)
+
+from auto_graphql.management.commands.run_workload import (
+    RowCounter,
+    percentile,
+)
+from auto_graphql.mapper import AsyncAutoGraphQLView
+
+DEFAULT_QUERY = "{ BookCatalogueBook(pagination: {limit: 10000}) { id title summary publishDate } }"
+
+
+class Command(BaseCommand):
+    help = "Compare a flat scalar list query with and without the values_list() fast path."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--query", default=DEFAULT_QUERY, help="A query selecting only columns of one list.")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--output", help="Write JSON results to this file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        body = json.dumps({"query": options["query"]})
+        # no cached responses, and no per-statement recording in either view
+        with override_settings(AUTOGRAPHQL_RESPONSE_CACHE=None, AUTOGRAPHQL_INSTRUMENTATION=False):
+            views = {}
+            for path, fast in (("resolvers", False), ("fast_path", True)):
+                with override_settings(AUTOGRAPHQL_SCALAR_FAST_PATH=fast):
+                    views[path] = AsyncAutoGraphQLView.build_view()
+
+        results = []
+        responses = {}
+        for path, view in views.items():
+            result, responses[path] = self.measure(path, view, body, options)
+            results.append(result)
+            self.stdout.write(
+                f"{path}: p50 {result['latency_ms']['p50']:.1f}ms p95 {result['latency_ms']['p95']:.1f}ms, "
+                f"{result['model_instances']} model instances per request, {result['response_bytes']} bytes"
+            )
+        if responses["resolvers"] != responses["fast_path"]:
+            raise CommandError("The fast path answered differently from the resolvers.")
+        resolvers, fast_path = results
+        self.stdout.write(f"speedup x{resolvers['latency_ms']['p50'] / fast_path['latency_ms']['p50']:.2f} (p50)")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                json.dump(results, output_file, indent=2)
+
+    @staticmethod
+    def measure(path: str, view: Callable[..., Any], body: str, options: dict[str, Any]) -> tuple[dict[str, Any], Any]:
+        factory = AsyncRequestFactory(SERVER_NAME="0.0.0.0")
+        latencies = []
+        content = b""
+        requests = options["warmup"] + options["iterations"]
+        with RowCounter() as rows:
+            for iteration in range(requests):
+                request = factory.post(f"/{path}", body, content_type="application/json")
+                started = time.perf_counter()
+                response: HttpResponse = async_to_sync(view)(request)
+                elapsed = (time.perf_counter() - started) * 1000
+                if response.status_code != 200 or b'"errors"' in response.content:
+                    raise CommandError(f"{path}: {response.content[:500]!r}")
+                if iteration >= options["warmup"]:
+                    latencies.append(elapsed)
+                content = response.content
+
+        latencies.sort()
+        return {
+            "path": path,
+            "iterations": options["iterations"],
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "mean": round(statistics.fmean(latencies), 3),
+            },
+            "model_instances": rows.rows // requests,
+            "response_bytes": len(content),
+        }, json.loads(content)["data"]
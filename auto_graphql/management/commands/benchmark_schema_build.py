@@ -0,0 +1,103 @@
+import argparse
+import gc
+import json
+import resource
+import subprocess
+import sys
+import time
+from typing import (
+    Any,
+    List,
+)
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+from django.db import models
+
+from auto_graphql.mapper import (
+    AsyncAutoGraphQLView,
+    DjangoModel,
+    Mapper,
+)
+
+
+def synthesize_models(count: int, prefix: str) -> List[DjangoModel]:
+    """Models with scalar fields, a FK chain and M2M links, registered under the auto_graphql app."""
+
+    synthesized: List[DjangoModel] = []
+    for index in range(count):
+        attrs: dict[str, Any] = {
+            "__module__": "auto_graphql.models",
+            "Meta": type("Meta", (), {"app_label": "auto_graphql"}),
+            "name": models.CharField(max_length=100),
+            "description": models.TextField(),
+            "amount": models.IntegerField(),
+            "created": models.DateField(),
+        }
+        if synthesized:
+            attrs["parent"] = models.ForeignKey(synthesized[-1], on_delete=models.CASCADE, related_name="+")
+        if len(synthesized) > 2:
+            attrs["links"] = models.ManyToManyField(synthesized[-3], related_name=f"{prefix.lower()}_links_{index}")
+        synthesized.append(type(f"{prefix}Model{index}", (models.Model,), attrs))
+    return synthesized
+
+
+def measure_build(count: int) -> dict[str, Any]:
+    app_models = synthesize_models(count, f"Bench{count}x")
+    gc.collect()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    mapper = Mapper()
+    mapper.register_models(app_models)
+    mapper_seconds = time.perf_counter() - started
+    del mapper
+
+    started = time.perf_counter()
+    AsyncAutoGraphQLView.build_view(app_models)
+    view_seconds = time.perf_counter() - started
+
+    # ru_maxrss is in KiB on Linux
+    peak_rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    return {
+        "models": count,
+        "mapper_seconds": round(mapper_seconds, 3),
+        "view_seconds": round(view_seconds, 3),
+        "peak_rss_growth_mib": round(peak_rss_growth / 1024, 1),
+    }
+
+
+class Command(BaseCommand):
+    help = "Measure schema build time and peak memory for synthesized model counts."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--models", type=int, nargs="+", default=[50, 500, 2000])
+        parser.add_argument("--output", help="Write JSON results to this file.")
+        parser.add_argument("--in-process", action="store_true", help=argparse.SUPPRESS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["in_process"]:
+            self.stdout.write(json.dumps(measure_build(options["models"][0])))
+            return
+
+        results = []
+        for count in options["models"]:
+            # a fresh interpreter per size keeps peak RSS and type registries independent
+            child = subprocess.run(
+                [sys.executable, sys.argv[0], "benchmark_schema_build", "--in-process", "--models", str(count)],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            results.append(result)
+            self.stdout.write(
+                f"{count:>6} models: mapper {result['mapper_seconds']:.3f}s, "
+                f"full view {result['view_seconds']:.3f}s, peak RSS +{result['peak_rss_growth_mib']} MiB"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                json.dump(results, output_file, indent=2)
@@ -0,0 +1,134 @@
+import json
+import os
+import random
+import sqlite3
+import statistics
+import string
+import tempfile
+import time
+from contextlib import closing
+from itertools import accumulate
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from auto_graphql.management.commands.run_workload import percentile
+from auto_graphql.search import (
+    get_match_query,
+    get_search_index_sql,
+)
+
+TABLE = "benchmark_document"
+
+
+def quote_name(name: str) -> str:
+    return f'"{name}"'
+
+
+class Command(BaseCommand):
+    help = "Compare LIKE '%...%' scans with the FTS5 search index on a generated table of text rows."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--words", type=int, default=30, help="Words per row.")
+        parser.add_argument("--vocabulary", type=int, default=20_000)
+        parser.add_argument("--limit", type=int, default=20, help="Rows per page, like a paginated list.")
+        parser.add_argument("--iterations", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write JSON results to this file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with tempfile.TemporaryDirectory() as directory, closing(
+            sqlite3.connect(os.path.join(directory, "search.sqlite3"))
+        ) as connection:
+            vocabulary = self.fill_table(connection, options)
+            started = time.perf_counter()
+            for sql in get_search_index_sql(TABLE, "id", ["body"], quote_name):
+                connection.execute(sql)
+            connection.commit()
+            index_seconds = time.perf_counter() - started
+            self.stdout.write(f"{options['rows']} rows, FTS5 index built in {index_seconds:.1f}s")
+
+            # a frequent, a common and a rare word of the Zipf-distributed vocabulary, and two words together
+            words = [vocabulary[rank] for rank in (5, 200, len(vocabulary) - 1)]
+            searches = words + [f"{words[0]} {words[1]}"]
+            results = [self.measure(connection, search, options) for search in searches]
+
+        for result in results:
+            self.stdout.write(
+                f"{result['search']!r} ({result['fts_matches']} matches): page like p50 "
+                f"{result['like_ms']['p50']:.1f}ms fts p50 {result['fts_ms']['p50']:.1f}ms, count like p50 "
+                f"{result['like_count_ms']['p50']:.1f}ms fts p50 {result['fts_count_ms']['p50']:.1f}ms, "
+                f"speedup x{result['like_ms']['p50'] / result['fts_ms']['p50']:.1f} / "
+                f"x{result['like_count_ms']['p50'] / result['fts_count_ms']['p50']:.1f}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                json.dump({"rows": options["rows"], "index_seconds": index_seconds, "searches": results}, output_file)
+
+    def fill_table(self, connection: sqlite3.Connection, options: dict[str, Any]) -> list[str]:
+        generator = random.Random(options["seed"])
+        vocabulary = list(
+            dict.fromkeys(
+                "".join(generator.choices(string.ascii_lowercase, k=generator.randint(4, 10)))
+                for _ in range(options["vocabulary"])
+            )
+        )
+        cum_weights = list(accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+        connection.execute(f"CREATE TABLE {TABLE} (id INTEGER PRIMARY KEY, body TEXT NOT NULL)")
+        batch = 10_000
+        for start in range(0, options["rows"], batch):
+            connection.executemany(
+                f"INSERT INTO {TABLE} (body) VALUES (?)",
+                (
+                    (" ".join(generator.choices(vocabulary, cum_weights=cum_weights, k=options["words"])),)
+                    for _ in range(min(batch, options["rows"] - start))
+                ),
+            )
+        connection.commit()
+        return vocabulary
+
+    @staticmethod
+    def measure(connection: sqlite3.Connection, search: str, options: dict[str, Any]) -> dict[str, Any]:
+        fts = quote_name(f"{TABLE}_search")
+        words = search.split()
+        limit = options["limit"]
+        # the statements search_queryset() gives: icontains per word, FTS5 joined by rowid and ranked by bm25
+        like_where = " AND ".join([f"{TABLE}.body LIKE ?"] * len(words))
+        fts_where = f"{fts}.rowid = {TABLE}.id AND {fts} MATCH ?"
+        like_params, fts_params = [f"%{word}%" for word in words], [get_match_query(search)]
+        # a page of a list, and a total count that reads every match
+        statements = {
+            "like": (f"SELECT id, body FROM {TABLE} WHERE {like_where} ORDER BY id LIMIT ?", like_params + [limit]),
+            "fts": (
+                f"SELECT {TABLE}.id, {TABLE}.body FROM {TABLE}, {fts} WHERE {fts_where} ORDER BY bm25({fts}) LIMIT ?",
+                fts_params + [limit],
+            ),
+            "like_count": (f"SELECT count(*) FROM {TABLE} WHERE {like_where}", like_params),
+            "fts_count": (f"SELECT count(*) FROM {TABLE}, {fts} WHERE {fts_where}", fts_params),
+        }
+        result: dict[str, Any] = {"search": search}
+        for name, (sql, params) in statements.items():
+            latencies = []
+            for _ in range(options["iterations"]):
+                started = time.perf_counter()
+                rows = connection.execute(sql, params).fetchall()
+                latencies.append((time.perf_counter() - started) * 1000)
+            if not rows:
+                raise CommandError(f"{name} found no row for {search!r}.")
+            latencies.sort()
+            result[f"{name}_ms"] = {
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "mean": round(statistics.fmean(latencies), 3),
+            }
+            if name.endswith("count"):
+                result[f"{name.split('_')[0]}_matches"] = rows[0][0]
+        if result["like_matches"] < result["fts_matches"]:
+            raise CommandError(f"The index found rows without {search!r}.")
+        return result
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from auto_graphql.management.commands.run_workload import percentile
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def get_app_path(setting_name: str, default: str) -> str:
+    # "project_root.wsgi.application" -> "project_root.wsgi:application"
+    module, _, attribute = (getattr(settings, setting_name, None) or default).rpartition(".")
+    return f"{module}:{attribute}"
+
+
+class LoadClient:
+    """Keep-alive HTTP/1.1 client posting workload bodies in a loop; one per simulated user."""
+
+    def __init__(self, port: int, host: str, path: str, bodies: list[bytes]) -> None:
+        self.port = port
+        self.host = host
+        self.path = path
+        self.bodies = bodies
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    async def request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, body: bytes) -> int:
+        writer.write(
+            (
+                f"POST {self.path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("ascii")
+            + body
+        )
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        headers = {
+            name.strip().lower(): value.strip() for name, _, value in (line.partition(":") for line in header_lines)
+        }
+        if "content-length" in headers:
+            await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            while size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16):
+                await reader.readexactly(size + 2)
+            await reader.readuntil(b"\r\n")
+        else:
+            raise ConnectionError("response without a length")
+        return int(status_line.split(" ", 2)[1])
+
+    async def run(self, deadline: float, offset: int) -> None:
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        index = offset
+        try:
+            while time.perf_counter() < deadline:
+                body = self.bodies[index % len(self.bodies)]
+                index += 1
+                started = time.perf_counter()
+                try:
+                    status = await self.request(reader, writer, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    self.errors += 1
+                    writer.close()
+                    reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                    continue
+                self.latencies.append((time.perf_counter() - started) * 1000)
+                if status != 200:
+                    self.errors += 1
+        finally:
+            writer.close()
+
+
+async def run_load(
+    port: int, host: str, path: str, bodies: list[bytes], clients: int, duration: float
+) -> list[LoadClient]:
+    load_clients = [LoadClient(port, host, path, bodies) for _ in range(clients)]
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client.run(deadline, index) for index, client in enumerate(load_clients)))
+    return load_clients
+
+
+class Command(BaseCommand):
+    help = "Compare WSGI (gunicorn gthread) and ASGI (gunicorn + uvicorn) throughput with concurrent clients."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("workload", help='JSON file: [{"name": ..., "query": ..., "variables": {...}}, ...]')
+        parser.add_argument("--modes", nargs="+", choices=["wsgi", "asgi"], default=["wsgi", "asgi"])
+        parser.add_argument("--clients", type=int, default=100)
+        parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds per mode.")
+        parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds of load first.")
+        parser.add_argument("--workers", type=int, default=2, help="Server worker processes.")
+        parser.add_argument("--threads", type=int, default=8, help="Threads per WSGI worker.")
+        parser.add_argument("--path", help="Endpoint path, AUTOGRAPHQL_GLOBAL_ROUTE by default.")
+        parser.add_argument("--host", help="Host header, the first ALLOWED_HOSTS entry by default.")
+        parser.add_argument("--output", help="Write JSON results to this file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with open(options["workload"], encoding="utf-8") as workload_file:
+            operations = json.load(workload_file)
+        if not isinstance(operations, list) or not all(isinstance(op, dict) and "query" in op for op in operations):
+            raise CommandError("Workload must be a JSON list of objects with a query.")
+        bodies = [
+            json.dumps(
+                {"query": op["query"], "variables": op.get("variables"), "operationName": op.get("operationName")}
+            ).encode("utf-8")
+            for op in operations
+        ]
+        path = options["path"] or "/" + getattr(settings, "AUTOGRAPHQL_GLOBAL_ROUTE", "auto-graphql-generated")
+
+        hosts = [host for host in settings.ALLOWED_HOSTS if "*" not in host and not host.startswith(".")]
+        host = options["host"] or (hosts[0] if hosts else "localhost")
+
+        results = []
+        for mode in options["modes"]:
+            result = self.benchmark(mode, host, path, bodies, options)
+            results.append(result)
+            latency = result["latency_ms"]
+            self.stdout.write(
+                f"{mode}: {result['requests_per_second']:.1f} req/s, p50 {latency['p50']:.2f}ms "
+                f"p95 {latency['p95']:.2f}ms p99 {latency['p99']:.2f}ms, {result['errors']} errors"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                json.dump(results, output_file, indent=2)
+
+    def get_server_command(self, mode: str, port: int, options: dict[str, Any]) -> list[str]:
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(options["workers"]),
+        ]
+        if mode == "wsgi":
+            app = get_app_path("WSGI_APPLICATION", "project_root.wsgi.application")
+            return command + ["--worker-class", "gthread", "--threads", str(options["threads"]), app]
+        app = get_app_path("ASGI_APPLICATION", "project_root.asgi.application")
+        return command + ["--worker-class", "uvicorn.workers.UvicornWorker", app]
+
+    def benchmark(
+        self, mode: str, host: str, path: str, bodies: list[bytes], options: dict[str, Any]
+    ) -> dict[str, Any]:
+        port = get_free_port()
+        server = subprocess.Popen(
+            self.get_server_command(mode, port, options),
+            env=os.environ.copy(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            self.wait_until_ready(server, port)
+            if options["warmup"] > 0:
+                asyncio.run(run_load(port, host, path, bodies, options["clients"], options["warmup"]))
+            started = time.perf_counter()
+            clients = asyncio.run(run_load(port, host, path, bodies, options["clients"], options["duration"]))
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        latencies = sorted(latency for client in clients for latency in client.latencies)
+        if not latencies:
+            raise CommandError(f"No {mode} request completed.")
+        return {
+            "mode": mode,
+            "clients": options["clients"],
+            "workers": options["workers"],
+            "requests": len(latencies),
+            "requests_per_second": round(len(latencies) / elapsed, 1),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "p99": round(percentile(latencies, 99), 3),
+                "mean": round(statistics.fmean(latencies), 3),
+            },
+            "errors": sum(client.errors for client in clients),
+        }
+
+    @staticmethod
+    def wait_until_ready(server: "subprocess.Popen[bytes]", port: int, timeout: float = 60.0) -> None:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"Server exited with code {server.returncode}.")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError("Server did not start listening in time.")
@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import connections
+from django.db.backends.sqlite3.base import FORMAT_QMARK_REGEX
+from django.db.models import QuerySet
+
+from auto_graphql.management.commands.run_workload import percentile
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.sqlite_profile import (
+    apply_pragmas,
+    get_sqlite_pragmas,
+)
+
+Statement = tuple[str, tuple[Any, ...]]
+
+
+def get_statement(queryset: "QuerySet[Any]") -> Statement:
+    sql, params = queryset.query.sql_with_params()
+    # the sqlite3 module takes qmark placeholders, Django's SQL uses %s
+    return FORMAT_QMARK_REGEX.sub("?", sql).replace("%%", "%"), tuple(params)
+
+
+class Worker(threading.Thread):
+    """Run statements until the deadline on one connection, or a new one per statement like CONN_MAX_AGE = 0."""
+
+    def __init__(self, path: str, statements: list[Statement], deadline: float, tuned: bool, write: bool) -> None:
+        super().__init__(daemon=True)
+        self.path = path
+        self.statements = statements
+        self.deadline = deadline
+        self.tuned = tuned
+        self.write = write
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    def connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5)
+        if self.tuned:
+            apply_pragmas(connection, get_sqlite_pragmas())
+            if not self.write:
+                connection.execute("PRAGMA query_only = 1")
+        return connection
+
+    def run(self) -> None:
+        connection = self.connect() if self.tuned else None
+        index = 0
+        while time.perf_counter() < self.deadline:
+            sql, params = self.statements[index % len(self.statements)]
+            index += 1
+            started = time.perf_counter()
+            current = connection or self.connect()
+            try:
+                current.execute(sql, params).fetchall()
+                if self.write:
+                    current.commit()
+            except sqlite3.OperationalError:
+                # "database is locked": busy_timeout ran out while another connection held the lock
+                self.errors += 1
+                current.rollback()
+                continue
+            finally:
+                if connection is None:
+                    current.close()
+            self.latencies.append((time.perf_counter() - started) * 1000)
+        if connection is not None:
+            connection.close()
+
+
+class Command(BaseCommand):
+    help = "Compare concurrent SQLite read throughput with Django's defaults and with the SQLite profile."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=1)
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds per profile.")
+        parser.add_argument("--rows", type=int, default=50, help="Rows per list read.")
+        parser.add_argument("--output", help="Write JSON results to this file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        alias = options["database"]
+        connection = connections[alias]
+        if connection.vendor != "sqlite" or connection.is_in_memory_db():  # type: ignore[attr-defined]
+            raise CommandError(f"Database {alias} is not a SQLite database file.")
+        reads, writes = self.get_statements(alias, options["rows"])
+        if not writes:
+            raise CommandError("No table with rows to write to.")
+
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in ("default", "tuned"):
+                # a copy, WAL mode sticks to the database file and the writers change rows
+                path = os.path.join(directory, f"{profile}.sqlite3")
+                with closing(sqlite3.connect(connection.settings_dict["NAME"])) as source, closing(
+                    sqlite3.connect(path)
+                ) as target:
+                    source.backup(target)
+                    target.execute("PRAGMA journal_mode = DELETE").fetchall()
+                results.append(self.run_profile(profile, path, reads, writes, options))
+
+        default, tuned = results
+        for result in results:
+            latency = result["read_latency_ms"]
+            self.stdout.write(
+                f"{result['profile']}: {result['reads_per_second']:.1f} reads/s, p50 {latency['p50']:.2f}ms "
+                f"p95 {latency['p95']:.2f}ms p99 {latency['p99']:.2f}ms, {result['writes_per_second']:.1f} writes/s, "
+                f"{result['errors']} locked"
+            )
+        if default["reads_per_second"]:
+            self.stdout.write(f"read throughput x{tuned['reads_per_second'] / default['reads_per_second']:.2f}")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                json.dump(results, output_file, indent=2)
+
+    @staticmethod
+    def get_statements(alias: str, rows: int) -> tuple[list[Statement], list[Statement]]:
+        quote_name = connections[alias].ops.quote_name
+        reads: list[Statement] = []
+        writes: list[Statement] = []
+        for model in AsyncAutoGraphQLView.get_app_models():
+            queryset = model._default_manager.using(alias)
+            if not queryset.exists():
+                continue
+            reads.append(get_statement(queryset.order_by("-pk")[:rows]))
+            reads.append(get_statement(queryset.values("pk")[:rows]))
+            # rewrites a row with its own values: the write lock and journal cost without changing data
+            table, pk = quote_name(model._meta.db_table), quote_name(model._meta.pk.column)  # type: ignore[union-attr]
+            writes.append((f"UPDATE {table} SET {pk} = {pk} WHERE {pk} = (SELECT MAX({pk}) FROM {table})", ()))
+        return reads, writes
+
+    def run_profile(
+        self, profile: str, path: str, reads: list[Statement], writes: list[Statement], options: dict[str, Any]
+    ) -> dict[str, Any]:
+        tuned = profile == "tuned"
+        deadline = time.perf_counter() + options["duration"]
+        readers = [Worker(path, reads, deadline, tuned, write=False) for _ in range(options["readers"])]
+        writers = [Worker(path, writes, deadline, tuned, write=True) for _ in range(options["writers"])]
+        started = time.perf_counter()
+        for worker in readers + writers:
+            worker.start()
+        for worker in readers + writers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for worker in readers for latency in worker.latencies)
+        if not latencies:
+            raise CommandError(f"No read completed with the {profile} profile.")
+        return {
+            "profile": profile,
+            "readers": options["readers"],
+            "writers": options["writers"],
+            "reads_per_second": round(len(latencies) / elapsed, 1),
+            "writes_per_second": round(sum(len(worker.latencies) for worker in writers) / elapsed, 1),
+            "read_latency_ms": {
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "p99": round(percentile(latencies, 99), 3),
+            },
+            "errors": sum(worker.errors for worker in readers + writers),
+        }
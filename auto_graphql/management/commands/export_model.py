@@ -0,0 +1,87 @@
+import json
+import resource
+import sys
+import time
+from typing import (
+    Any,
+    BinaryIO,
+)
+
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from auto_graphql.conf import get_setting
+from auto_graphql.export import (
+    EXPORT_CONTENT_TYPES,
+    ExportEncoder,
+    ExportError,
+    get_export_columns,
+    get_export_fields,
+    iter_export,
+    plan_export,
+)
+from auto_graphql.mapper import AsyncAutoGraphQLView
+
+
+class Command(BaseCommand):
+    help = "Write every row of a model, with the filters and order of its GraphQL list, as CSV or NDJSON."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("model", help='Top-level list field, such as "BookCatalogueBook", or "app_label.Model".')
+        parser.add_argument("--format", choices=sorted(EXPORT_CONTENT_TYPES), default="ndjson")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--output", help="Write to this file instead of stdout.")
+        parser.add_argument("--filters", help="Filters argument of the list, as JSON.")
+        parser.add_argument("--order", help="Order argument of the list, as JSON.")
+        parser.add_argument("--chunk-size", type=int, default=get_setting("AUTOGRAPHQL_EXPORT_CHUNK_SIZE", 2000, int))
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        schema = AsyncAutoGraphQLView.build_schema()
+        field_name = self.get_field_name(get_export_fields(schema), options["model"])
+        try:
+            arguments = {
+                argument: json.loads(options[argument]) for argument in ("filters", "order") if options[argument]
+            }
+            queryset = async_to_sync(plan_export)(schema, field_name, chunk_size=options["chunk_size"], **arguments)
+            encoder = ExportEncoder(get_export_columns(queryset.model), options["format"], compress=options["gzip"])
+        except json.decoder.JSONDecodeError as e:
+            raise CommandError(f"Unable to parse filters or order as JSON: {e}") from e
+        except ExportError as e:
+            raise CommandError(str(e)) from e
+
+        output: BinaryIO = open(options["output"], "wb") if options["output"] else sys.stdout.buffer
+        written = 0
+        started = time.perf_counter()
+        try:
+            for data in iter_export(queryset, encoder, options["chunk_size"]):
+                output.write(data)
+                written += len(data)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+        seconds = time.perf_counter() - started
+
+        # ru_maxrss is in KiB on Linux
+        self.stderr.write(
+            f"{queryset.model._meta.label}: {encoder.rows} rows in {seconds:.2f}s "
+            f"({encoder.rows / seconds if seconds else 0:.0f} rows/s), {written / 1024 / 1024:.1f} MiB written, "
+            f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB"
+        )
+
+    @staticmethod
+    def get_field_name(fields: dict[str, Any], name: str) -> str:
+        if name in fields:
+            return name
+        try:
+            model = apps.get_model(name)
+        except (LookupError, ValueError) as e:
+            raise CommandError(f"No model list named {name}: {e}") from e
+        for field_name, field_model in fields.items():
+            if field_model is model:
+                return field_name
+        raise CommandError(f"The schema has no list of {model._meta.label}.")
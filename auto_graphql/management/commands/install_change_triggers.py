@@ -0,0 +1,48 @@
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import (
+    connections,
+    transaction,
+)
+
+from auto_graphql.changes import (
+    get_tracked_models,
+    get_tracking_mode,
+    get_trigger_sql,
+)
+
+
+class Command(BaseCommand):
+    help = "Create (or drop) the triggers that fill the change log of AUTOGRAPHQL_CHANGE_TRACKING models."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--drop", action="store_true", help="Drop the triggers instead.")
+        parser.add_argument("--print", action="store_true", help="Print the SQL without running it.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not options["drop"] and get_tracking_mode() != "triggers":
+            raise CommandError('AUTOGRAPHQL_CHANGE_TRACKING_MODE is not "triggers", the signals would record too.')
+        models = get_tracked_models()
+        if not models:
+            raise CommandError("AUTOGRAPHQL_CHANGE_TRACKING lists no model.")
+
+        alias = options["database"]
+        try:
+            statements = [sql for model in models for sql in get_trigger_sql(model, alias, drop=options["drop"])]
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        if options["print"]:
+            for sql in statements:
+                self.stdout.write(f"{sql};")
+            return
+        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+        self.stdout.write(f"{'Dropped' if options['drop'] else 'Installed'} change triggers of {len(models)} models.")
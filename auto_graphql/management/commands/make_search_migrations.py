@@ -0,0 +1,65 @@
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import migrations
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+
+from auto_graphql.search import (
+    CreateSearchIndex,
+    get_search_fields,
+    get_search_models,
+)
+
+
+class Command(BaseCommand):
+    help = "Write migrations creating the full-text search index of AUTOGRAPHQL_SEARCH models that have none yet."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--dry-run", action="store_true", help="Show the migrations without writing them.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            models = get_search_models()
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        if not models:
+            raise CommandError("AUTOGRAPHQL_SEARCH lists no model.")
+
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        indexed = {
+            (app_label, operation.model_name.lower())
+            for (app_label, _), migration in loader.disk_migrations.items()
+            for operation in migration.operations
+            if isinstance(operation, CreateSearchIndex)
+        }
+        operations: dict[str, list[CreateSearchIndex]] = {}
+        for model in models:
+            meta = model._meta
+            if (meta.app_label, meta.model_name) not in indexed:
+                operations.setdefault(meta.app_label, []).append(
+                    CreateSearchIndex(model_name=meta.object_name, fields=get_search_fields(model))  # type: ignore
+                )
+        if not operations:
+            self.stdout.write("No changes detected.")
+            return
+
+        for app_label, app_operations in operations.items():
+            leaves = loader.graph.leaf_nodes(app_label)
+            number = max((MigrationAutodetector.parse_number(name) or 0 for _, name in leaves), default=0) + 1
+            fragment = "_".join(operation.migration_name_fragment for operation in app_operations)
+            migration = migrations.Migration(f"{number:04d}_{fragment}", app_label)
+            migration.dependencies = leaves
+            migration.operations = app_operations
+            writer = MigrationWriter(migration)
+            self.stdout.write(f"{app_label}: {writer.path}")
+            for operation in app_operations:
+                self.stdout.write(f"  - {operation.describe()}")
+            if not options["dry_run"]:
+                with open(writer.path, "w", encoding="utf-8") as migration_file:
+                    migration_file.write(writer.as_string())
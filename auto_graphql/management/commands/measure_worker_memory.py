@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from auto_graphql.management.commands.benchmark_servers import Command as ServerBenchmark
+from auto_graphql.management.commands.benchmark_servers import (
+    LoadClient,
+    get_app_path,
+    get_free_port,
+    run_load,
+)
+
+SCHEMA_QUERY = b'{"query": "{ __schema { types { name } } }"}'
+
+
+def get_children(pid: int) -> list[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii") as stat_file:
+                # "pid (comm) state ppid ...", comm may hold spaces
+                ppid = int(stat_file.read().rpartition(")")[2].split()[1])
+        except (OSError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def get_memory(pid: int) -> dict[str, float]:
+    """RSS, PSS and unique (private) memory of a process in MiB, from smaps_rollup."""
+
+    values: dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as smaps_file:
+        for line in smaps_file:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                values[name] = int(rest.split()[0])
+    return {
+        "rss_mib": round(values["Rss"] / 1024, 1),
+        "pss_mib": round(values["Pss"] / 1024, 1),
+        "unique_mib": round((values["Private_Clean"] + values["Private_Dirty"]) / 1024, 1),
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare per-worker unique memory of gunicorn workers with a lazy and a preloaded schema."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--modes", nargs="+", choices=["lazy", "preload"], default=["lazy", "preload"])
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--requests", type=int, default=200, help="Schema queries sent before measuring.")
+        parser.add_argument("--path", help="Endpoint path, AUTOGRAPHQL_GLOBAL_ROUTE by default.")
+        parser.add_argument("--host", help="Host header, the first ALLOWED_HOSTS entry by default.")
+        parser.add_argument("--output", help="Write JSON results to this file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            raise CommandError("Needs Linux /proc/<pid>/smaps_rollup.")
+        path = options["path"] or "/" + getattr(settings, "AUTOGRAPHQL_GLOBAL_ROUTE", "auto-graphql-generated")
+        hosts = [host for host in settings.ALLOWED_HOSTS if "*" not in host and not host.startswith(".")]
+        host = options["host"] or (hosts[0] if hosts else "localhost")
+
+        results = []
+        for mode in options["modes"]:
+            result = self.measure(mode, host, path, options)
+            results.append(result)
+            self.stdout.write(
+                f"{mode}: worker unique {result['worker_unique_mib']} MiB, PSS {result['worker_pss_mib']} MiB "
+                f"(mean of {len(result['workers'])}), master RSS {result['master']['rss_mib']} MiB"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                json.dump(results, output_file, indent=2)
+
+    def measure(self, mode: str, host: str, path: str, options: dict[str, Any]) -> dict[str, Any]:
+        port = get_free_port()
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(options["workers"]),
+            # keeps connections alive, the sync worker closes each one
+            "--worker-class",
+            "gthread",
+        ]
+        if mode == "preload":
+            command.append("--preload")
+        command.append(get_app_path("WSGI_APPLICATION", "project_root.wsgi.application"))
+        server = subprocess.Popen(
+            command,
+            env={**os.environ, "AUTOGRAPHQL_SCHEMA_BUILD": mode},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            ServerBenchmark.wait_until_ready(server, port)
+            # a connection per client spreads the queries, so every lazy worker builds its schema
+            clients: list[LoadClient] = []
+            deadline = time.perf_counter() + 60
+            while sum(len(client.latencies) for client in clients) < options["requests"]:
+                if time.perf_counter() > deadline:
+                    raise CommandError(f"The {mode} server did not answer the schema queries.")
+                clients += asyncio.run(run_load(port, host, path, [SCHEMA_QUERY], options["workers"] * 4, 0.5))
+            if any(client.errors for client in clients):
+                raise CommandError(f"The {mode} server answered schema queries with errors.")
+            workers = [get_memory(pid) for pid in get_children(server.pid)]
+            master = get_memory(server.pid)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        if not workers:
+            raise CommandError(f"No {mode} worker found.")
+        return {
+            "mode": mode,
+            "master": master,
+            "workers": workers,
+            "worker_unique_mib": round(sum(worker["unique_mib"] for worker in workers) / len(workers), 1),
+            "worker_pss_mib": round(sum(worker["pss_mib"] for worker in workers) / len(workers), 1),
+        }
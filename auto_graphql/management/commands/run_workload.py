@@ -0,0 +1,174 @@
+import json
+import logging
+import math
+import platform
+import statistics
+import time
+from typing import (
+    Any,
+    Optional,
+)
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import connection
+from django.db.models import Model
+from django.db.models.signals import post_init
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+class RowCounter:
+    """Count model instances loaded from the database, the ORM side of rows fetched."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+
+    def __enter__(self) -> "RowCounter":
+        post_init.connect(self.on_post_init, dispatch_uid=f"autographql-row-counter-{id(self)}")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        post_init.disconnect(dispatch_uid=f"autographql-row-counter-{id(self)}")
+
+    def on_post_init(self, sender: type[Model], **kwargs: Any) -> None:
+        self.rows += 1
+
+
+class Command(BaseCommand):
+    help = "Replay GraphQL operations in-process and report latency, SQL queries, rows and response size."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("workload", help='JSON file: [{"name": ..., "query": ..., "variables": {...}}, ...]')
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--path", help="Endpoint path, AUTOGRAPHQL_GLOBAL_ROUTE by default.")
+        parser.add_argument("--output", help="Write JSON results to this file.")
+        parser.add_argument("--compare", help="Previous JSON results to compare p50/p95 against.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["iterations"] < 1 or options["warmup"] < 0:
+            raise CommandError("--iterations must be positive and --warmup non-negative.")
+        with open(options["workload"], encoding="utf-8") as workload_file:
+            operations = json.load(workload_file)
+        if not isinstance(operations, list) or not all(isinstance(op, dict) and "query" in op for op in operations):
+            raise CommandError("Workload must be a JSON list of objects with a query.")
+
+        path = options["path"] or "/" + getattr(settings, "AUTOGRAPHQL_GLOBAL_ROUTE", "auto-graphql-generated")
+        hosts = [host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"]
+        client = Client(SERVER_NAME=hosts[0] if hosts else "localhost")
+
+        # captured queries are logged at DEBUG, console logging would dominate latencies
+        db_logger = logging.getLogger("django.db.backends")
+        db_log_level = db_logger.level
+        db_logger.setLevel(logging.INFO)
+        try:
+            results = [
+                self.run_operation(client, path, operation, index, options["iterations"], options["warmup"])
+                for index, operation in enumerate(operations)
+            ]
+        finally:
+            db_logger.setLevel(db_log_level)
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "database": connection.vendor,
+                "iterations": options["iterations"],
+                "warmup": options["warmup"],
+            },
+            "operations": results,
+        }
+
+        baseline = self.load_baseline(options["compare"])
+        for result in results:
+            self.write_result(result, baseline.get(result["name"]))
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                json.dump(report, output_file, indent=2)
+
+    def run_operation(
+        self,
+        client: Client,
+        path: str,
+        operation: dict[str, Any],
+        index: int,
+        iterations: int,
+        warmup: int,
+    ) -> dict[str, Any]:
+        body = json.dumps(
+            {
+                "query": operation["query"],
+                "variables": operation.get("variables"),
+                "operationName": operation.get("operationName"),
+            }
+        )
+
+        for _ in range(warmup):
+            client.post(path, body, content_type="application/json")
+
+        latencies: list[float] = []
+        queries: list[int] = []
+        rows: list[int] = []
+        sizes: list[int] = []
+        errors = 0
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured, RowCounter() as row_counter:
+                started = time.perf_counter()
+                response = client.post(path, body, content_type="application/json")
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured.captured_queries))
+            rows.append(row_counter.rows)
+            sizes.append(len(response.content))
+            if response.status_code != 200 or json.loads(response.content).get("errors"):
+                errors += 1
+
+        latencies.sort()
+        return {
+            "name": operation.get("name", f"operation-{index}"),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "p99": round(percentile(latencies, 99), 3),
+                "mean": round(statistics.fmean(latencies), 3),
+            },
+            # per request; identical across iterations unless caches kick in
+            "sql_queries": max(queries),
+            "rows_fetched": max(rows),
+            "bytes_serialized": max(sizes),
+            "errors": errors,
+        }
+
+    @staticmethod
+    def load_baseline(path: Optional[str]) -> dict[str, dict[str, Any]]:
+        if path is None:
+            return {}
+        with open(path, encoding="utf-8") as baseline_file:
+            return {result["name"]: result for result in json.load(baseline_file)["operations"]}
+
+    def write_result(self, result: dict[str, Any], baseline: Optional[dict[str, Any]]) -> None:
+        latency = result["latency_ms"]
+        line = (
+            f"{result['name']}: p50 {latency['p50']:.2f}ms p95 {latency['p95']:.2f}ms p99 {latency['p99']:.2f}ms, "
+            f"{result['sql_queries']} queries, {result['rows_fetched']} rows, {result['bytes_serialized']} bytes"
+        )
+        if baseline is not None:
+            line += ", p50 x{:.2f} p95 x{:.2f} vs baseline".format(
+                latency["p50"] / max(baseline["latency_ms"]["p50"], 1e-9),
+                latency["p95"] / max(baseline["latency_ms"]["p95"], 1e-9),
+            )
+        if result["errors"]:
+            self.stdout.write(self.style.ERROR(f"{line}, {result['errors']} errors"))
+        else:
+            self.stdout.write(line)
@@ -1,4 +1,4 @@
-import copy
+import gc
 from collections import deque
 from typing import (
     Annotated,
@@ -6,6 +6,7 @@ from typing import (
     Callable,
     Dict,
     List,
+    Optional,
     Type,
     cast,
 )
@@ -13,30 +14,111 @@ from typing import (
 import inflection
 import strawberry
 from django.apps import apps
+from django.conf import settings
+from django.db import connections
 from django.db.models import (
     Field,
     Model,
 )
 from django.db.models.options import Options
-from strawberry.django.views import AsyncGraphQLView
 from strawberry_django.optimizer import DjangoOptimizerExtension
 
+from .aggregates import (
+    ModelAggregates,
+    create_count_field,
+    create_count_queryset_hook,
+    get_python_type,
+)
+from .changes import (
+    create_changes_field,
+    get_tracked_models,
+)
+from .complexity import QueryCostExtension
+from .conf import get_setting
+from .counters import (
+    get_counted_relations,
+    get_relation_label,
+)
+from .counting import (
+    CountCache,
+    create_total_count_field,
+)
+from .dataloaders import (
+    RelationField,
+    RelationSpec,
+)
+from .documents import (
+    DocumentCacheExtension,
+    LRUCache,
+    PersistedQueryRegistry,
+)
+from .fast_path import ScalarFastPathExtension
+from .filter_planner import (
+    FilterPlannerExtension,
+    create_filter_lookup_type,
+    get_allowed_lookups,
+)
+from .instrumentation import (
+    InstrumentationExtension,
+    connect_query_recorder,
+)
+from .mutations import ModelMutations
+from .pagination import create_connection_field
+from .query_log import (
+    QueryLog,
+    QueryLogExtension,
+)
+from .response_cache import (
+    ResponseCache,
+    ResponseCacheExtension,
+)
+from .routing import (
+    PrimaryPins,
+    ReadBalancer,
+    ReadReplicaExtension,
+    configure_read_connections,
+    get_read_databases,
+)
+from .search import (
+    filter_search,
+    get_search_models,
+)
+from .sqlite_profile import (
+    QueryOnlyExtension,
+    is_sqlite_profile_enabled,
+)
+from .streaming import RootListField
+from .views import (
+    AutoGraphQLView,
+    LazyView,
+)
+
 # type aliases
 AppName = Annotated[str, "AppName"]
 AppModelName = Annotated[str, "AppModelName"]
 ModelPath = Annotated[str, "ModelPath"]
 FieldName = Annotated[str, "FieldName"]
 DjangoModel = Annotated[Type[Model], "DjangoModel"]
+
+QUERY_TYPE_NAME = "AutoGeneratedQueryRecursive"
+MUTATION_TYPE_NAME = "AutoGeneratedMutation"
+BUILD_MODES = ("eager", "lazy", "background", "preload")
 TypeObj = Annotated[Any, "TypeObj"]
 RelationFieldSetterArgs = tuple[AppModelName, Field, TypeObj]  # type: ignore
 
 
 class Mapper:
-    def __init__(self) -> None:
+    def __init__(self, recursive: bool = True) -> None:
+        # not recursive: relation fields return key-only types, so a query is at most two levels deep
+        self.recursive = recursive
+        self.search_models = get_search_models()
         self.types: Dict[AppModelName, TypeObj] = {}
+        self._refs: Dict[AppModelName, tuple[DjangoModel, TypeObj]] = {}
         self._models: Dict[AppModelName, DjangoModel] = {}
         self._orders: Dict[AppModelName, TypeObj] = {}
         self._filters: Dict[AppModelName, TypeObj] = {}
+        self._count_fields: Dict[AppModelName, Dict[str, tuple[FieldName, RelationSpec, Optional[str]]]] = {}
+        self._counters = {counted.label for counted in get_counted_relations()}
         self._apps_names: Dict[str, AppName] = {}
         self._model_names: Dict[ModelPath, AppModelName] = {}
         self._unique_app_names: set[str] = set()
@@ -91,23 +173,72 @@ class Mapper:
 
         related_model_name = self._register_model_name(related_model)
         remote_field = cast(Field, field.remote_field)  # type: ignore
-        self._relations_queue.append((related_model_name, remote_field, model))
+        if not remote_field.hidden:  # related_name="+" has no reverse accessor
+            self._relations_queue.append((related_model_name, remote_field, model))
 
     def _process_relations(self) -> None:
         while self._relations_queue:
             model_name, field, related_model = self._relations_queue.popleft()
+            if model_name not in self.types:
+                # reverse side of a relation from a model outside the registered ones
+                continue
             related_model_name = self._register_model_name(related_model)
 
-            field_type = self.types[related_model_name]
+            keys_only = not self.recursive or related_model_name not in self.types
+            field_type = self._get_ref_type(related_model) if keys_only else self.types[related_model_name]
 
-            if field.one_to_many or field.many_to_many:
+            is_list = field.one_to_many or field.many_to_many
+            if is_list:
                 field_type = cast(Any, List[field_type])  # type: ignore
+            elif field.null or not field.concrete:
+                field_type = cast(Any, Optional[field_type])
 
-            setattr(
-                self.types[model_name],
-                field.name,
-                strawberry.field(name=related_model_name, graphql_type=field_type),
+            # list relations are batched by DataLoaders instead of optimizer prefetches; key-only objects
+            # of a foreign key are built from its column, the optimizer only has to select it, not join
+            key_column = (
+                field.attname
+                if keys_only and field.concrete and not field.many_to_many and cast(Any, field).target_field.primary_key
+                else None
             )
+            relation_field = strawberry.django.field(
+                name=related_model_name,
+                graphql_type=field_type,
+                field_cls=RelationField,
+                disable_optimization=is_list or (keys_only and key_column is None),
+                field_name=key_column,
+                only=key_column,
+            )
+            relation_field.relation = field
+            relation_field.keys_only = keys_only
+            setattr(self.types[model_name], field.name, relation_field)
+
+            if is_list:
+                count_name = f"{field.name}_count"
+                count_graphql_name = f"{related_model_name}Count"
+                label = get_relation_label(field)
+                counter = label if label in self._counters else None
+                setattr(
+                    self.types[model_name],
+                    count_name,
+                    create_count_field(field, count_graphql_name, count_name, counter),
+                )
+                self._count_fields.setdefault(model_name, {})[count_graphql_name] = (
+                    count_name,
+                    RelationSpec.from_relation(field),
+                    counter,
+                )
+
+    def _get_ref_type(self, model: DjangoModel) -> TypeObj:
+        """Type with only the primary key of the model, for relations that must not go deeper."""
+
+        model_name = self._register_model_name(model)
+        if model_name not in self._refs:
+            pk_name = cast(Field, self._get_meta(model).pk).name  # type: ignore
+            self._refs[model_name] = (
+                model,
+                type(f"{model_name}Ref", (), {"__annotations__": {pk_name: strawberry.auto}}),
+            )
+        return self._refs[model_name][1]
 
     def _create_type(self, model: DjangoModel) -> None:
         model_name = self._register_model_name(model)
@@ -125,11 +256,41 @@ class Mapper:
         for mm_field in self._get_meta(model).many_to_many:  # type: ignore
             self._enqueue_relation(model, mm_field)
 
-        object_dict = {"__annotations__": fields_dict}
+        # values are strawberry.auto markers, so a shallow copy per class is enough
+        self.types[model_name] = type(f"{model_name}Types", (), {"__annotations__": dict(fields_dict)})
+        self._orders[model_name] = type(f"{model_name}Orders", (), {"__annotations__": dict(fields_dict)})
+        filter_namespace: Dict[str, Any] = {
+            "__annotations__": self._get_filter_annotations(model, model_name, fields_dict)
+        }
+        if model in self.search_models:
+            if "search" in fields_dict:
+                raise ValueError(f"AUTOGRAPHQL_SEARCH setting has {model._meta.label}, its search field is taken.")
+            filter_namespace["__annotations__"]["search"] = Optional[str]
+            filter_namespace["filter_search"] = filter_search
+        self._filters[model_name] = type(f"{model_name}Filters", (), filter_namespace)
+
+    def _get_filter_annotations(
+        self,
+        model: DjangoModel,
+        model_name: AppModelName,
+        fields_dict: Dict[FieldName, Any],
+    ) -> Dict[FieldName, Any]:
+        """Filters annotations: all lookups by default, only AUTOGRAPHQL_FILTER_LOOKUPS ones when configured."""
 
-        self.types[model_name] = type(f"{model_name}Types", (), copy.deepcopy(object_dict))
-        self._orders[model_name] = type(f"{model_name}Orders", (), copy.deepcopy(object_dict))
-        self._filters[model_name] = type(f"{model_name}Filters", (), copy.deepcopy(object_dict))
+        annotations: Dict[FieldName, Any] = {}
+        for field_name, annotation in fields_dict.items():
+            lookups = get_allowed_lookups(model, field_name)
+            python_type = get_python_type(self._get_meta(model).get_field(field_name))  # type: ignore
+            # booleans are filtered by value, strawberry_django gives them no lookups
+            if lookups is None or python_type is bool:
+                annotations[field_name] = annotation
+            elif lookups:
+                annotations[field_name] = Optional[
+                    create_filter_lookup_type(
+                        f"{model_name}{inflection.camelize(field_name)}FilterLookup", python_type, lookups
+                    )
+                ]
+        return annotations
 
     def register_models(self, models: List[DjangoModel]) -> None:
         for model in models:
@@ -137,6 +298,9 @@ class Mapper:
 
         self._process_relations()
 
+        for model_name, count_fields in self._count_fields.items():
+            setattr(self.types[model_name], "get_queryset", create_count_queryset_hook(count_fields))
+
         for model_name, type_obj in self.types.items():
             model = self._models[model_name]
             order_obj = self._orders[model_name]
@@ -151,31 +315,207 @@ class Mapper:
                 pagination=True,
             )(type_obj)
 
+        for model, ref in self._refs.values():
+            strawberry.django.type(model, name=ref.__name__, pagination=True)(ref)
+
+    def get_type_models(self) -> Dict[str, DjangoModel]:
+        """GraphQL type name or "Type.field" -> model its data comes from, for every generated type."""
+
+        type_models: Dict[str, DjangoModel] = {}
+        for model_name, type_obj in self.types.items():
+            model = self._models[model_name]
+            type_models[type_obj.__name__] = type_models[f"{model_name}Aggregate"] = model
+            type_models[f"{model_name}Connection"] = type_models[f"{QUERY_TYPE_NAME}.{model_name}TotalCount"] = model
+            type_models[f"{model_name}Changes"] = model
+            for count_graphql_name, (_, spec, _) in self._count_fields.get(model_name, {}).items():
+                type_models[f"{type_obj.__name__}.{count_graphql_name}"] = spec.related_model
+        for model, ref in self._refs.values():
+            type_models[ref.__name__] = model
+        return type_models
+
+    def get_filter_fields(self) -> Dict[DjangoModel, set[FieldName]]:
+        return {
+            self._models[model_name]: set(filter_obj.__annotations__)
+            for model_name, filter_obj in self._filters.items()
+        }
+
+    def create_aggregate_fields(self) -> Dict[str, Any]:
+        return {
+            f"{model_name}Aggregate": ModelAggregates(
+                self._models[model_name], model_name, self._filters[model_name]
+            ).create_field()
+            for model_name in self.types
+        }
+
+    def create_connection_fields(self, count_cache: CountCache) -> Dict[str, Any]:
+        return {
+            f"{model_name}Connection": create_connection_field(
+                self._models[model_name],
+                model_name,
+                type_obj,
+                self._filters[model_name],
+                self._orders[model_name],
+                count_cache,
+            )
+            for model_name, type_obj in self.types.items()
+        }
+
+    def create_changes_fields(self, tracked_models: List[DjangoModel]) -> Dict[str, Any]:
+        return {
+            f"{model_name}Changes": create_changes_field(self._models[model_name], model_name, type_obj)
+            for model_name, type_obj in self.types.items()
+            if self._models[model_name] in tracked_models
+        }
+
+    def create_mutation_fields(self) -> Dict[str, Any]:
+        mutation_fields: Dict[str, Any] = {}
+        for model_name, type_obj in self.types.items():
+            mutation_fields.update(ModelMutations(self._models[model_name], model_name, type_obj).create_fields())
+        return mutation_fields
+
+    def create_total_count_fields(self, count_cache: CountCache) -> Dict[str, Any]:
+        return {
+            f"{model_name}TotalCount": create_total_count_field(
+                self._models[model_name], self._filters[model_name], count_cache
+            )
+            for model_name in self.types
+        }
+
+
+def prepare_fork() -> None:
+    """Leave the built schema to forked workers as shared copy-on-write pages.
+
+    The build garbage is collected first, then everything left is moved out of the collector's reach:
+    a collection in a worker would otherwise write to the GC header of every object and copy its page.
+    """
+
+    # a connection opened while building must not be shared by the workers
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+
 
 class AsyncAutoGraphQLView:
-    @classmethod
-    def as_view(cls) -> Callable[..., Any]:
-        app_models = [
+    @staticmethod
+    def get_app_models(app_labels: Optional[List[str]] = None) -> List[DjangoModel]:
+        if app_labels is not None:
+            # LookupError for an unknown label
+            return [model for app_label in app_labels for model in apps.get_app_config(app_label).get_models()]
+        return [
             model
             for app_config in apps.get_app_configs()
-            if not app_config.name.startswith("django.contrib")
+            # the change log is internal, clients read it through the <Model>Changes fields
+            if not app_config.name.startswith("django.contrib") and app_config.name != "auto_graphql"
             for model in app_config.get_models()
         ]
 
-        mapper = Mapper()
-        mapper.register_models(app_models)
+    @classmethod
+    def build_schema(
+        cls, app_models: Optional[List[DjangoModel]] = None, recursive: bool = True, name: str = ""
+    ) -> strawberry.Schema:
+        """Schema over the models, every app model by default; name tells endpoints' caches apart."""
+
+        mapper = Mapper(recursive=recursive)
+        mapper.register_models(cls.get_app_models() if app_models is None else app_models)
 
         query_types_dict = {
-            type_name: strawberry.django.field(graphql_type=List[type_obj])  # type: ignore
+            type_name: strawberry.django.field(graphql_type=List[type_obj], field_cls=RootListField)  # type: ignore
             for type_name, type_obj in mapper.types.items()
         }
+        count_cache = CountCache.from_settings(mapper._models.values())
+        query_types_dict.update(mapper.create_connection_fields(count_cache))
+        query_types_dict.update(mapper.create_total_count_fields(count_cache))
+        query_types_dict.update(mapper.create_aggregate_fields())
+        query_types_dict.update(mapper.create_changes_fields(get_tracked_models()))
+
+        query_object = strawberry.type()(type(QUERY_TYPE_NAME, (), query_types_dict))
+        mutation_object = (
+            strawberry.type()(type(MUTATION_TYPE_NAME, (), mapper.create_mutation_fields()))
+            if get_setting("AUTOGRAPHQL_MUTATIONS", False, bool)
+            else None
+        )
 
-        query_object = strawberry.type()(type("AutoGeneratedQueryRecursive", (), query_types_dict))
+        extensions: List[Any] = [
+            DocumentCacheExtension.bind(
+                LRUCache(get_setting("AUTOGRAPHQL_DOCUMENT_CACHE_SIZE", 256, int)),
+                report_stats=get_setting("AUTOGRAPHQL_DOCUMENT_CACHE_STATS", settings.DEBUG, bool),
+            ),
+        ]
+        if is_sqlite_profile_enabled() and get_setting("AUTOGRAPHQL_SQLITE_QUERY_ONLY", True, bool):
+            extensions.append(QueryOnlyExtension)
+        read_databases = get_read_databases()
+        if read_databases:
+            configure_read_connections(read_databases)
+            # before every extension that reads, so their queries go to the replica as well
+            extensions.append(ReadReplicaExtension.bind(ReadBalancer.from_settings(), PrimaryPins.from_settings()))
+        extensions += [
+            QueryCostExtension,
+            FilterPlannerExtension.bind(count_cache, mapper.get_type_models(), mapper.get_filter_fields()),
+        ]
+        if get_setting("AUTOGRAPHQL_SCALAR_FAST_PATH", True, bool):
+            # before the response cache and the query log, they read the result on exit
+            extensions.append(ScalarFastPathExtension)
+
+        response_cache_alias = get_setting("AUTOGRAPHQL_RESPONSE_CACHE", None, str)
+        if response_cache_alias is not None:
+            response_cache = ResponseCache(response_cache_alias, mapper.get_type_models(), name)
+            extensions.append(ResponseCacheExtension.bind(response_cache))
+
+        query_log_path = get_setting("AUTOGRAPHQL_QUERY_LOG", None, str)
+        if query_log_path is not None:
+            extensions.append(QueryLogExtension.bind(QueryLog(query_log_path, mapper.get_type_models())))
+
+        if get_setting("AUTOGRAPHQL_INSTRUMENTATION", True, bool):
+            connect_query_recorder()
+            extensions.append(InstrumentationExtension)
+        extensions.append(DjangoOptimizerExtension)
         del mapper, query_types_dict
 
-        return AsyncGraphQLView.as_view(
-            schema=strawberry.Schema(
-                query=query_object,
-                extensions=[DjangoOptimizerExtension],
+        return strawberry.Schema(
+            query=query_object,
+            mutation=mutation_object,
+            extensions=extensions,
+        )
+
+    @classmethod
+    def build_view(
+        cls, app_models: Optional[List[DjangoModel]] = None, recursive: bool = True, name: str = ""
+    ) -> Callable[..., Any]:
+        """View of build_schema(); it serves the model exports of the schema as well."""
+
+        persisted_queries = (
+            PersistedQueryRegistry.from_settings() if get_setting("AUTOGRAPHQL_PERSISTED_QUERIES", True, bool) else None
+        )
+        return AutoGraphQLView.as_view(
+            schema=cls.build_schema(app_models, recursive=recursive, name=name),
+            persisted_queries=persisted_queries,
+        )
+
+    @classmethod
+    def as_view(
+        cls,
+        app_labels: Optional[List[str]] = None,
+        recursive: bool = True,
+        name: str = "",
+        build_mode: Optional[str] = None,
+    ) -> Callable[..., Any]:
+        """View over the models of app_labels, built as build_mode says, AUTOGRAPHQL_SCHEMA_BUILD by default."""
+
+        if build_mode is None:
+            build_mode = get_setting("AUTOGRAPHQL_SCHEMA_BUILD", "eager", str)
+        if build_mode not in BUILD_MODES:
+            raise ValueError("AUTOGRAPHQL_SCHEMA_BUILD setting must be one of: eager, lazy, background, preload.")
+
+        # built views are wrapped too: the wrapper is what exempts the endpoint from CSRF checks
+        lazy_view = LazyView(
+            lambda: cls.build_view(
+                None if app_labels is None else cls.get_app_models(app_labels), recursive=recursive, name=name
             )
         )
+        if build_mode in ("eager", "preload"):
+            lazy_view.get_view()
+        if build_mode == "preload":
+            prepare_fork()
+        elif build_mode == "background":
+            lazy_view.start_background_build()
+        return lazy_view.as_view()
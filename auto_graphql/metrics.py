@@ -0,0 +1,63 @@
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+MetricKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class Summary:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+
+class MetricsRegistry:
+    """In-process counters and summaries, labelled like Prometheus series."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[MetricKey, float] = {}
+        self._summaries: dict[MetricKey, Summary] = {}
+
+    @staticmethod
+    def key(name: str, labels: dict[str, str]) -> MetricKey:
+        return name, tuple(sorted(labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = self.key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = self.key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = Summary()
+            summary.observe(value)
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in self._counters.items()
+            ]
+            summaries = [
+                {"name": name, "labels": dict(labels), "count": s.count, "sum": s.total, "max": s.max}
+                for (name, labels), s in self._summaries.items()
+            ]
+        return {"counters": counters, "summaries": summaries}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+registry = MetricsRegistry()
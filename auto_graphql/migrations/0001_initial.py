@@ -0,0 +1,32 @@
+# Generated by Django 4.2.6 on 2026-10-18 07:03
+
+import django.utils.timezone
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Change",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("model", models.CharField(max_length=100)),
+                ("object_pk", models.CharField(max_length=255)),
+                ("deleted", models.BooleanField(default=False)),
+                ("changed_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["model", "id"], name="autographql_change_cursor"),
+                    models.Index(fields=["model", "object_pk"], name="autographql_change_row"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.6 on 2026-10-18 07:23
+
+from django.db import (
+    migrations,
+    models,
+)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auto_graphql", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelationCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("relation", models.CharField(max_length=255)),
+                ("object_pk", models.CharField(max_length=255)),
+                ("count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="relationcount",
+            constraint=models.UniqueConstraint(fields=("relation", "object_pk"), name="autographql_relation_count_row"),
+        ),
+    ]
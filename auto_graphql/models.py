@@ -0,0 +1,30 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Change(models.Model):
+    """Latest change of one tracked row; its id is the sync cursor, so each row appears once after any cursor."""
+
+    model = models.CharField(max_length=100)
+    object_pk = models.CharField(max_length=255)
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["model", "id"], name="autographql_change_cursor"),
+            models.Index(fields=["model", "object_pk"], name="autographql_change_row"),
+        ]
+
+
+class RelationCount(models.Model):
+    """Number of rows related to one object through an AUTOGRAPHQL_COUNTER_CACHE relation, kept on write."""
+
+    relation = models.CharField(max_length=255)
+    object_pk = models.CharField(max_length=255)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["relation", "object_pk"], name="autographql_relation_count_row"),
+        ]
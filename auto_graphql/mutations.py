@@ -0,0 +1,427 @@
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    cast,
+)
+
+import strawberry
+from django.contrib.auth import get_permission_codename
+from django.core.exceptions import ValidationError
+from django.db import (
+    IntegrityError,
+    router,
+    transaction,
+)
+from django.db.models import Field as ModelField
+from django.db.models import Model
+from django.db.models.fields import AutoFieldMixin
+from django.http import HttpRequest
+from django.utils.module_loading import import_string
+from graphql import GraphQLError
+from strawberry.types import Info
+
+from .aggregates import get_python_type
+from .conf import get_setting
+from .db_pool import run_sync
+from .signals import models_bulk_changed
+
+# per model: key column attname -> values the write changed, old and new
+ChangedKeys = dict[Type[Model], dict[str, set[Any]]]
+# per relation field: referenced key -> index of the first item giving it
+References = dict[Any, dict[Any, int]]
+
+
+def add_keys(keys: dict[str, set[Any]], columns: list[str], rows: Iterable[Iterable[Any]]) -> None:
+    for row in rows:
+        for column, value in zip(columns, row):
+            if value is not None:
+                keys.setdefault(column, set()).add(value)
+
+
+def get_link_columns(through: Type[Model]) -> list[str]:
+    return [field.attname for field in through._meta.fields if field.is_relation]
+
+
+@contextmanager
+def integrity_errors_as_user_input() -> Iterator[None]:
+    # around transaction.atomic(): deferred constraints fail on commit
+    try:
+        yield
+    except IntegrityError as e:
+        raise GraphQLError(f"Invalid items: {e}", extensions={"code": "BAD_USER_INPUT"}) from e
+
+
+def has_model_permission(request: HttpRequest, model: Type[Model], action: str) -> bool:
+    """Default AUTOGRAPHQL_MUTATION_PERMISSION: the user has the add, change or delete permission of the model."""
+
+    user = getattr(request, "user", None)
+    return user is not None and bool(
+        user.has_perm(f"{model._meta.app_label}.{get_permission_codename(action, model._meta)}")
+    )
+
+
+def is_required(field: "ModelField[Any, Any]") -> bool:
+    # a blank text field without default is saved as ""
+    return not (field.null or field.has_default() or (field.blank and field.empty_strings_allowed))
+
+
+class ModelMutations:
+    """Bulk create/update/delete mutation fields of one model, a few statements per call whatever the list size."""
+
+    def __init__(self, model: Type[Model], model_name: str, type_obj: Any) -> None:
+        meta: Any = model._meta
+        self.model = model
+        self.model_name = model_name
+        self.type_obj = type_obj
+        self.pk = cast("ModelField[Any, Any]", meta.pk)
+        # input attribute (attname, so foreign keys are given by id) -> model field
+        self.fields: dict[str, ModelField[Any, Any]] = {}
+        self.m2m_fields: dict[str, Any] = {}
+
+        # input attribute -> python type, optional ones default to UNSET
+        create_required: dict[str, Any] = {}
+        create_optional: dict[str, Any] = {}
+        update_optional: dict[str, Any] = {}
+        for field in meta.concrete_fields:
+            if field.hidden or not field.editable or isinstance(field, AutoFieldMixin):
+                continue
+            python_type = strawberry.ID if field.is_relation else get_python_type(field)
+            if python_type is None:
+                continue
+            self.fields[field.attname] = field
+            (create_required if is_required(field) else create_optional)[field.attname] = python_type
+            if not field.primary_key:
+                update_optional[field.attname] = python_type
+        for m2m_field in meta.many_to_many:
+            # links of a custom through model may need more columns than the two keys
+            if m2m_field.remote_field.through._meta.auto_created:
+                self.m2m_fields[m2m_field.name] = m2m_field
+                create_optional[m2m_field.name] = update_optional[m2m_field.name] = List[strawberry.ID]
+
+        self.create_input = create_input_type(f"{model_name}CreateInput", create_required, create_optional)
+        self.update_input = create_input_type(
+            f"{model_name}UpdateInput", {self.pk.attname: strawberry.ID}, update_optional
+        )
+
+    @staticmethod
+    def get_max_size() -> int:
+        return get_setting("AUTOGRAPHQL_BULK_MAX_SIZE", 10_000, int)
+
+    def check_size(self, items: list[Any]) -> None:
+        max_size = self.get_max_size()
+        if len(items) > max_size:
+            raise GraphQLError(
+                f"At most {max_size} items can be written at once, got {len(items)}.",
+                extensions={"code": "BULK_TOO_LARGE"},
+            )
+
+    def check_permission(self, request: HttpRequest, action: str) -> None:
+        """Run the AUTOGRAPHQL_MUTATION_PERMISSION callable before a write; it may query, so call it in run_sync."""
+
+        path = get_setting("AUTOGRAPHQL_MUTATION_PERMISSION", "auto_graphql.mutations.has_model_permission", str)
+        if not import_string(path)(request, self.model, action):
+            raise GraphQLError(
+                f"Permission denied to {action} {self.model._meta.object_name} rows.",
+                extensions={"code": "FORBIDDEN"},
+            )
+
+    def build_instance(self, index: int, values: dict[str, Any]) -> Model:
+        """Unsaved instance with converted and validated values; no query, unlike full_clean."""
+
+        try:
+            values = {
+                attname: (
+                    self.get_key_field(self.fields.get(attname, self.pk)).to_python(value)
+                    if value is not None
+                    else None
+                )
+                for attname, value in values.items()
+            }
+            instance = self.model(**values)
+            # foreign keys would be looked up row by row, check_references() does it per field in one go
+            validated = {self.fields[attname].name for attname in values if attname in self.fields}
+            instance.clean_fields(
+                exclude=[
+                    field.name for field in self.fields.values() if field.is_relation or field.name not in validated
+                ]
+            )
+        except ValidationError as e:
+            raise GraphQLError(
+                f"Invalid item {index}: {e}",
+                extensions={"code": "BAD_USER_INPUT", "index": index, "fields": getattr(e, "message_dict", {})},
+            ) from e
+        return instance
+
+    @staticmethod
+    def get_key_field(field: "ModelField[Any, Any]") -> "ModelField[Any, Any]":
+        return cast("ModelField[Any, Any]", getattr(field, "target_field")) if field.is_relation else field
+
+    def get_link_key_field(self, field: Any) -> "ModelField[Any, Any]":
+        """Field of the related model an M2M link stores."""
+
+        return self.get_key_field(field.remote_field.through._meta.get_field(field.m2m_reverse_field_name()))
+
+    def add_references(self, references: References, index: int, instance: Model, item: Any) -> None:
+        """Keys an item references through the given foreign keys and M2M lists."""
+
+        for attname in self.get_foreign_keys(self.get_values(item, self.fields)):
+            if (key := getattr(instance, attname)) is not None:
+                references.setdefault(self.fields[attname], {}).setdefault(key, index)
+        for name, field in self.m2m_fields.items():
+            key_field = self.get_link_key_field(field)
+            for value in getattr(item, name) or []:
+                try:
+                    key = key_field.to_python(value)
+                except ValidationError as e:
+                    raise GraphQLError(
+                        f"Invalid item {index}: {e}",
+                        extensions={"code": "BAD_USER_INPUT", "index": index, "fields": {name: e.messages}},
+                    ) from e
+                references.setdefault(field, {}).setdefault(key, index)
+
+    def check_references(self, references: References, using: str) -> None:
+        """Reject ids of rows that do not exist, one query per relation field."""
+
+        for field, keys in references.items():
+            key_field = self.get_link_key_field(field) if field.many_to_many else self.get_key_field(field)
+            found = set(
+                field.related_model._base_manager.using(using)
+                .filter(**{f"{key_field.attname}__in": list(keys)})
+                .values_list(key_field.attname, flat=True)
+            )
+            missing = [key for key in keys if key not in found]
+            if missing:
+                index = min(keys[key] for key in missing)
+                message = (
+                    f"{field.related_model._meta.object_name} with {key_field.name} {missing[0]!r} does not exist."
+                )
+                raise GraphQLError(
+                    f"Invalid item {index}: {message}",
+                    extensions={"code": "BAD_USER_INPUT", "index": index, "fields": {field.name: [message]}},
+                )
+
+    @staticmethod
+    def get_values(item: Any, names: Any) -> dict[str, Any]:
+        return {name: value for name in names if (value := getattr(item, name)) is not strawberry.UNSET}
+
+    def add_links(self, field: Any, links: list[tuple[Any, list[Any]]], using: str, keys: ChangedKeys) -> None:
+        """One INSERT of through rows for all (instance pk, related ids) pairs."""
+
+        through: Any = field.remote_field.through
+        source = through._meta.get_field(field.m2m_field_name())
+        target = through._meta.get_field(field.m2m_reverse_field_name())
+        target_field = self.get_key_field(target)
+        rows = [
+            through(**{source.attname: pk, target.attname: target_field.to_python(related_id)})
+            for pk, related_ids in links
+            for related_id in dict.fromkeys(related_ids)
+        ]
+        if rows:
+            through._default_manager.using(using).bulk_create(rows)
+        columns = get_link_columns(through)
+        add_keys(keys.setdefault(through, {}), columns, ([getattr(row, column) for column in columns] for row in rows))
+
+    @staticmethod
+    def read_keys(queryset: Any, columns: list[str], keys: ChangedKeys) -> None:
+        """Key values of rows about to be changed or deleted."""
+
+        if columns:
+            add_keys(keys.setdefault(queryset.model, {}), columns, queryset.values_list(*columns))
+
+    def get_foreign_keys(self, attnames: Iterable[str]) -> list[str]:
+        return [attname for attname in attnames if attname in self.fields and self.fields[attname].is_relation]
+
+    def get_linked_models(self, m2m_names: Iterable[str]) -> list[Type[Model]]:
+        linked: list[Type[Model]] = []
+        for name in m2m_names:
+            field = self.m2m_fields[name]
+            linked += [field.remote_field.through, field.related_model]
+        return linked
+
+    def send_changed(
+        self, pks: list[Any], deleted: bool, using: str, keys: ChangedKeys, linked: Iterable[Type[Model]]
+    ) -> None:
+        """Sent in the transaction of the write, with the changed key values of each model."""
+
+        for model in dict.fromkeys([*keys, *linked]):
+            if model is not self.model:
+                models_bulk_changed.send(sender=model, using=using, keys=keys.get(model, {}))
+        # the written model last: receivers drop state of deleted rows that link changes could bring back
+        models_bulk_changed.send(
+            sender=self.model, pks=pks, deleted=deleted, using=using, keys=keys.get(self.model, {})
+        )
+
+    def get_link_tables(self) -> Optional[list[tuple[Any, str]]]:
+        """(through model, key column to this model) of every M2M table; None if other rows reference the model."""
+
+        meta: Any = self.model._meta
+        link_tables = []
+        for relation in meta.related_objects:
+            if not relation.many_to_many or not relation.through._meta.auto_created:
+                return None
+            link_tables.append((relation.through, relation.field.m2m_reverse_field_name()))
+        for field in meta.many_to_many:
+            if not field.remote_field.through._meta.auto_created:
+                return None
+            link_tables.append((field.remote_field.through, field.m2m_field_name()))
+        return link_tables
+
+    def create(self, data: list[Any]) -> list[Model]:
+        instances = [self.build_instance(index, self.get_values(item, self.fields)) for index, item in enumerate(data)]
+        links = {
+            name: [(instance, ids) for instance, item in zip(instances, data) if (ids := getattr(item, name))]
+            for name in self.m2m_fields
+        }
+        using = router.db_for_write(self.model)
+        references: References = {}
+        for index, (instance, item) in enumerate(zip(instances, data)):
+            self.add_references(references, index, instance, item)
+        foreign_keys = self.get_foreign_keys(self.fields)
+        keys: ChangedKeys = {self.model: {}}
+        add_keys(keys[self.model], foreign_keys, ([getattr(i, attname) for attname in foreign_keys] for i in instances))
+        with integrity_errors_as_user_input(), transaction.atomic(using=using):
+            self.check_references(references, using)
+            self.model._default_manager.using(using).bulk_create(instances)
+            for name, instance_links in links.items():
+                if instance_links and instance_links[0][0].pk is None:
+                    raise GraphQLError(f"The {using} database does not return keys of bulk inserted rows.")
+                self.add_links(
+                    self.m2m_fields[name], [(instance.pk, ids) for instance, ids in instance_links], using, keys
+                )
+            self.send_changed(
+                [instance.pk for instance in instances],
+                False,
+                using,
+                keys,
+                self.get_linked_models(name for name, instance_links in links.items() if instance_links),
+            )
+        return instances
+
+    def update(self, data: list[Any]) -> list[Model]:
+        # one UPDATE ... CASE per distinct set of given fields
+        groups: dict[tuple[str, ...], list[Model]] = {}
+        instances = []
+        references: References = {}
+        for index, item in enumerate(data):
+            values = self.get_values(item, [attname for attname in self.fields if attname != self.pk.attname])
+            instance = self.build_instance(index, {self.pk.attname: getattr(item, self.pk.attname), **values})
+            groups.setdefault(tuple(sorted(values)), []).append(instance)
+            instances.append(instance)
+            self.add_references(references, index, instance, item)
+        links = {
+            name: [
+                (instance.pk, ids)
+                for instance, item in zip(instances, data)
+                if (ids := getattr(item, name)) is not strawberry.UNSET
+            ]
+            for name in self.m2m_fields
+        }
+
+        using = router.db_for_write(self.model)
+        manager = self.model._default_manager.using(using)
+        # only moved foreign keys and replaced links change key values
+        foreign_keys = self.get_foreign_keys(dict.fromkeys(attname for attnames in groups for attname in attnames))
+        keys: ChangedKeys = {self.model: {}}
+        with integrity_errors_as_user_input(), transaction.atomic(using=using):
+            self.check_references(references, using)
+            self.read_keys(manager.filter(pk__in=[instance.pk for instance in instances]), foreign_keys, keys)
+            for attnames, group in groups.items():
+                given = self.get_foreign_keys(attnames)
+                add_keys(keys[self.model], given, ([getattr(i, attname) for attname in given] for i in group))
+                if attnames:
+                    manager.bulk_update(group, [self.fields[attname].name for attname in attnames])
+            for name, instance_links in links.items():
+                if not instance_links:
+                    continue
+                # the given list replaces the links: one DELETE, then one INSERT
+                field = self.m2m_fields[name]
+                through: Any = field.remote_field.through
+                old_links = through._default_manager.using(using).filter(
+                    **{f"{field.m2m_field_name()}__in": [pk for pk, _ in instance_links]}
+                )
+                self.read_keys(old_links, get_link_columns(through), keys)
+                old_links._raw_delete(using)
+                self.add_links(field, [(pk, ids or []) for pk, ids in instance_links], using, keys)
+            updated = {instance.pk: instance for instance in manager.filter(pk__in=[i.pk for i in instances])}
+            self.send_changed(
+                list(updated),
+                False,
+                using,
+                keys,
+                self.get_linked_models(name for name, instance_links in links.items() if instance_links),
+            )
+        return [updated[instance.pk] for instance in instances if instance.pk in updated]
+
+    def delete(self, ids: list[Any]) -> int:
+        try:
+            pks = [self.pk.to_python(pk) for pk in ids]
+        except ValidationError as e:
+            raise GraphQLError(f"Invalid id: {e}", extensions={"code": "BAD_USER_INPUT"}) from e
+        using = router.db_for_write(self.model)
+        queryset: Any = self.model._default_manager.using(using).filter(pk__in=pks)
+        link_tables = self.get_link_tables()
+        # ProtectedError and RestrictedError are IntegrityErrors
+        with integrity_errors_as_user_input(), transaction.atomic(using=using):
+            if link_tables is None:
+                # cascades and SET_NULL need the collector, it deletes in batches per table
+                deleted: dict[str, int] = queryset.delete()[1]
+                return deleted.get(self.model._meta.label, 0)
+            # only link rows reference the model: one DELETE ... WHERE pk IN per table, without per-row signals
+            keys: ChangedKeys = {}
+            self.read_keys(queryset, self.get_foreign_keys(self.fields), keys)
+            linked: list[Type[Model]] = []
+            for through, column in link_tables:
+                links = through._default_manager.using(using).filter(**{f"{column}__in": pks})
+                self.read_keys(links, get_link_columns(through), keys)
+                links._raw_delete(using)
+                linked += [through, *(field.related_model for field in through._meta.fields if field.is_relation)]
+            count: int = queryset._raw_delete(using)
+            self.send_changed(pks, True, using, keys, linked)
+        return count
+
+    def create_fields(self) -> dict[str, Any]:
+        create_field, update_field, delete_field = create_mutation_fields(
+            self, self.type_obj, self.create_input, self.update_input
+        )
+        return {
+            f"{self.model_name}Create": create_field,
+            f"{self.model_name}Update": update_field,
+            f"{self.model_name}Delete": delete_field,
+        }
+
+
+def create_input_type(name: str, required: dict[str, Any], optional: dict[str, Any]) -> Any:
+    annotations = {**required, **{field_name: Optional[python_type] for field_name, python_type in optional.items()}}
+    return strawberry.input(
+        type(name, (), {"__annotations__": annotations, **{field_name: strawberry.UNSET for field_name in optional}})
+    )
+
+
+def create_mutation_fields(
+    mutations: ModelMutations, type_obj: Any, create_input: Any, update_input: Any
+) -> tuple[Any, Any, Any]:
+    async def resolve_create(info: Info[Any, Any], data: List[create_input]) -> List[type_obj]:
+        mutations.check_size(data)
+        await run_sync(mutations.check_permission, info.context.request, "add")
+        return await run_sync(mutations.create, data)
+
+    async def resolve_update(info: Info[Any, Any], data: List[update_input]) -> List[type_obj]:
+        mutations.check_size(data)
+        await run_sync(mutations.check_permission, info.context.request, "change")
+        return await run_sync(mutations.update, data)
+
+    async def resolve_delete(info: Info[Any, Any], ids: List[strawberry.ID]) -> int:
+        mutations.check_size(ids)
+        await run_sync(mutations.check_permission, info.context.request, "delete")
+        return await run_sync(mutations.delete, ids)
+
+    return (
+        strawberry.mutation(resolver=cast(Any, resolve_create)),
+        strawberry.mutation(resolver=cast(Any, resolve_update)),
+        strawberry.mutation(resolver=cast(Any, resolve_delete)),
+    )
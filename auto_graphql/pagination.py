@@ -0,0 +1,225 @@
+import base64
+import binascii
+import json
+from typing import (
+    Any,
+    List,
+    Optional,
+    Sequence,
+    cast,
+)
+
+import strawberry
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import (
+    BooleanField,
+    Field,
+    Model,
+    Q,
+    QuerySet,
+)
+from django.db.models.expressions import (
+    Expression,
+    F,
+    OrderBy,
+    Value,
+)
+from django.db.models.sql.compiler import SQLCompiler
+from strawberry.types import Info
+from strawberry_django import filters as django_filters
+from strawberry_django.ordering import generate_order_args
+
+from .conf import get_setting
+from .counting import (
+    CountCache,
+    create_connection_total_count,
+)
+from .db_pool import fetch
+
+
+@strawberry.type(name="PageInfo")
+class PageInfo:
+    has_next_page: bool
+    end_cursor: Optional[str]
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(order_args: Sequence[str], values: Sequence[Any]) -> str:
+    # str() keeps full datetime precision and round-trips through model field lookups
+    payload = json.dumps([list(order_args), list(values)], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, order_args: Sequence[str]) -> list[Any]:
+    try:
+        cursor_order_args, values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, binascii.Error, TypeError, UnicodeError) as e:
+        raise InvalidCursorError("Invalid cursor.") from e
+    if cursor_order_args != list(order_args) or not isinstance(values, list) or len(values) != len(order_args):
+        raise InvalidCursorError("Cursor does not match the requested order.")
+    return values
+
+
+def get_keyset_order(model: type[Model], order: Any) -> list[str]:
+    """Order args for the requested order with pk as the unique tiebreaker."""
+
+    order_args: list[str] = generate_order_args(order) if order not in (None, strawberry.UNSET) else []
+    pk_name = model._meta.pk.name  # type: ignore
+    if not any(arg.lstrip("-") in (pk_name, "pk") for arg in order_args):
+        order_args.append(pk_name)
+    return order_args
+
+
+def get_order_by(order_args: Sequence[str]) -> list[OrderBy]:
+    # explicit null placement keeps seek predicates identical on every backend
+    return [
+        F(arg[1:]).desc(nulls_last=True) if arg.startswith("-") else F(arg).asc(nulls_first=True) for arg in order_args
+    ]
+
+
+class RowValueSeek(Expression):
+    """(col1, col2, ..., pk) > (v1, v2, ..., vpk) as one row-value comparison, < when descending.
+
+    Unlike the equivalent OR of column comparisons, the database can answer it with a single
+    range scan of an index on the columns.
+    """
+
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, names: Sequence[str], values: Sequence[Any], descending: bool) -> None:
+        super().__init__()
+        self.columns: list[Any] = [F(name) for name in names]
+        self.values = list(values)
+        self.descending = descending
+
+    def get_source_expressions(self) -> list[Any]:
+        return self.columns
+
+    def set_source_expressions(self, exprs: Sequence[Any]) -> None:
+        self.columns = list(exprs)
+
+    def as_sql(self, compiler: SQLCompiler, connection: BaseDatabaseWrapper) -> tuple[str, list[Any]]:
+        columns, values, params = [], [], []
+        for column in self.columns:
+            sql, column_params = compiler.compile(column)
+            columns.append(sql)
+            params.extend(column_params)
+        for column, value in zip(self.columns, self.values):
+            # cursor values are JSON, the column's field converts them like a lookup would
+            sql, value_params = compiler.compile(Value(value, output_field=column.output_field))
+            values.append(sql)
+            params.extend(value_params)
+        operator = "<" if self.descending else ">"
+        return f"({', '.join(columns)}) {operator} ({', '.join(values)})", params
+
+
+def get_seek_filter(model: type[Model], order_args: Sequence[str], values: Sequence[Any]) -> Q:
+    """Lexicographic (col1, col2, ..., pk) > (v1, v2, ..., vpk) predicate in order direction."""
+
+    directions = {arg.startswith("-") for arg in order_args}
+    names = [arg.lstrip("-") for arg in order_args]
+    # NULL compares as unknown in a row value: fine where nulls come first, but descending order puts them last
+    if (
+        len(order_args) > 1
+        and len(directions) == 1
+        and None not in values
+        and (
+            directions == {False}
+            or not any(cast("Field[Any, Any]", model._meta.get_field(name)).null for name in names)
+        )
+    ):
+        return Q(RowValueSeek(names, values, descending=directions == {True}))
+
+    seek_filter: Optional[Q] = None
+    for arg, value in reversed(list(zip(order_args, values))):
+        name = arg.lstrip("-")
+        if value is None:
+            equal = Q(**{f"{name}__isnull": True})
+            if arg.startswith("-"):
+                # nulls are last in descending order, only ties on later columns follow
+                seek_filter = equal & seek_filter if seek_filter is not None else Q(pk__in=[])
+                continue
+            after = Q(**{f"{name}__isnull": False})
+        else:
+            equal = Q(**{name: value})
+            if arg.startswith("-"):
+                after = Q(**{f"{name}__lt": value}) | Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__gt": value})
+        seek_filter = after if seek_filter is None else after | (equal & seek_filter)
+    return seek_filter if seek_filter is not None else Q()
+
+
+def get_row_values(instance: Model, order_args: Sequence[str]) -> list[Any]:
+    meta = instance._meta
+    return [getattr(instance, cast("Field[Any, Any]", meta.get_field(arg.lstrip("-"))).attname) for arg in order_args]
+
+
+def keyset_page(
+    queryset: QuerySet[Any],
+    order_args: Sequence[str],
+    first: int,
+    after: Optional[str],
+) -> QuerySet[Any]:
+    if after is not None:
+        queryset = queryset.filter(get_seek_filter(queryset.model, order_args, decode_cursor(after, order_args)))
+    # one extra row tells whether there is a next page
+    return queryset.order_by(*get_order_by(order_args))[: first + 1]
+
+
+def create_connection_field(
+    model: type[Model],
+    model_name: str,
+    type_obj: Any,
+    filter_obj: Any,
+    order_obj: Any,
+    count_cache: CountCache,
+) -> Any:
+    """Relay-style connection with opaque keyset cursors and totalCount for generated type."""
+
+    edge_type: Any = strawberry.type(
+        type(f"{model_name}Edge", (), {"__annotations__": {"cursor": str, "node": type_obj}}),
+    )
+    connection_type: Any = strawberry.type(
+        type(
+            f"{model_name}Connection",
+            (),
+            {
+                "__annotations__": {"edges": List[edge_type], "page_info": PageInfo},
+                "total_count": create_connection_total_count(count_cache),
+            },
+        ),
+    )
+
+    async def resolve_connection(
+        info: Info[Any, Any],
+        first: int = 100,
+        after: Optional[str] = None,
+        filters: Optional[filter_obj] = strawberry.UNSET,
+        order: Optional[order_obj] = strawberry.UNSET,
+    ) -> connection_type:
+        max_first = get_setting("AUTOGRAPHQL_CONNECTION_MAX_FIRST", 1000, int)
+        if not 0 <= first <= max_first:
+            raise ValueError(f"first must be between 0 and {max_first}.")
+
+        order_args = get_keyset_order(model, order)
+        queryset = django_filters.apply(filters, model._default_manager.all(), info=info)
+        rows = await fetch(keyset_page(queryset, order_args, first, after))
+
+        edges = [
+            edge_type(cursor=encode_cursor(order_args, get_row_values(row, order_args)), node=row)
+            for row in rows[:first]
+        ]
+        connection = connection_type(
+            edges=edges,
+            page_info=PageInfo(has_next_page=len(rows) > first, end_cursor=edges[-1].cursor if edges else None),
+        )
+        # counted lazily, only when totalCount is selected
+        connection._queryset = queryset
+        return connection
+
+    return strawberry.field(resolver=cast(Any, resolve_connection))
@@ -0,0 +1,220 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import (
+    asdict,
+    dataclass,
+)
+from typing import (
+    Any,
+    Iterator,
+    Optional,
+    Type,
+)
+
+from django.db.models import Model
+from graphql import (
+    GraphQLObjectType,
+    SelectionSetNode,
+    get_named_type,
+)
+from graphql.utilities import (
+    get_operation_ast,
+    value_from_ast_untyped,
+)
+from strawberry.extensions import SchemaExtension
+from strawberry.utils.str_converters import to_snake_case
+
+from .instrumentation import current_report
+from .response_cache import get_model_label
+from .selections import SelectionWalker
+from .streaming import is_stream_chunk
+
+logger = logging.getLogger(__name__)
+
+# strawberry_django lookup names whose Django lookup differs from the name without underscores
+LOOKUP_NAMES = {"in_list": "in", "is_null": "isnull"}
+
+
+@dataclass(frozen=True)
+class FieldUsage:
+    """Filter lookups and ordering one list field applied to a model."""
+
+    model: str
+    filters: tuple[tuple[str, str], ...]
+    order: tuple[tuple[str, str], ...]
+
+
+def get_filter_lookups(filters: Any) -> list[tuple[str, str]]:
+    """(field, lookup) pairs combined with AND; OR and NOT branches cannot use one composite index."""
+
+    lookups: list[tuple[str, str]] = []
+    if not isinstance(filters, dict):
+        return lookups
+    for name, value in filters.items():
+        if name == "AND":
+            lookups.extend(get_filter_lookups(value))
+        elif name in ("OR", "NOT") or not isinstance(value, dict):
+            continue
+        else:
+            for lookup in value:
+                lookup_name = to_snake_case(lookup)
+                lookups.append((to_snake_case(name), LOOKUP_NAMES.get(lookup_name, lookup_name.replace("_", ""))))
+    return sorted(set(lookups))
+
+
+def get_order_fields(order: Any) -> list[tuple[str, str]]:
+    if not isinstance(order, dict):
+        return []
+    return [(to_snake_case(name), str(direction).lower()) for name, direction in order.items()]
+
+
+class FilterUsageCollector(SelectionWalker):
+    def iter_arguments(
+        self,
+        parent_type: GraphQLObjectType,
+        selection_set: SelectionSetNode,
+        type_models: dict[str, Type[Model]],
+        nested: bool = True,
+    ) -> Iterator[tuple[Type[Model], dict[str, Any]]]:
+        """Model and filters/order argument values of every selected field that has them."""
+
+        for field in self.iter_fields(selection_set):
+            field_def = parent_type.fields.get(field.name.value)
+            if field_def is None:
+                continue
+            named_type = get_named_type(field_def.type)
+            model = type_models.get(f"{parent_type.name}.{field.name.value}") or type_models.get(named_type.name)
+            arguments = {
+                argument.name.value: value_from_ast_untyped(argument.value, self.variables)
+                for argument in field.arguments
+                if argument.name.value in ("filters", "order")
+            }
+            if model is not None and arguments:
+                yield model, arguments
+            if nested and field.selection_set is not None and isinstance(named_type, GraphQLObjectType):
+                yield from self.iter_arguments(named_type, field.selection_set, type_models)
+
+    def collect(
+        self,
+        parent_type: GraphQLObjectType,
+        selection_set: SelectionSetNode,
+        type_models: dict[str, Type[Model]],
+    ) -> Iterator[FieldUsage]:
+        for model, arguments in self.iter_arguments(parent_type, selection_set, type_models):
+            filters = get_filter_lookups(arguments.get("filters"))
+            order = get_order_fields(arguments.get("order"))
+            if filters or order:
+                yield FieldUsage(get_model_label(model), tuple(filters), tuple(order))
+
+
+class QueryLog:
+    """Append-only JSON lines log of filter and order usage, input of the advise_indexes command.
+
+    Operations only queue their lines; a daemon thread appends them, so file I/O never holds up a request.
+    """
+
+    def __init__(self, path: str, type_models: dict[str, Type[Model]]) -> None:
+        self.path = path
+        self.type_models = type_models
+        self.lines: queue.Queue[str] = queue.Queue()
+        self.lock = threading.Lock()
+        self.writer: Optional[threading.Thread] = None
+
+    def write(self, usages: list[FieldUsage], seconds: float) -> None:
+        # an operation's SQL time is shared evenly by the list fields it filtered
+        self.lines.put(
+            "".join(
+                json.dumps({**asdict(usage), "seconds": seconds / len(usages)}, separators=(",", ":")) + "\n"
+                for usage in usages
+            )
+        )
+        if self.writer is None:
+            self.start_writer()
+
+    def start_writer(self) -> None:
+        with self.lock:
+            if self.writer is not None:
+                return
+            self.writer = threading.Thread(target=self.write_lines, name="autographql-query-log", daemon=True)
+            self.writer.start()
+        # lines queued just before the interpreter exits are written too
+        atexit.register(self.flush)
+
+    def write_lines(self) -> None:
+        while True:
+            pending = [self.lines.get()]
+            while True:
+                try:
+                    pending.append(self.lines.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, "a", encoding="utf-8") as log_file:
+                    log_file.write("".join(pending))
+            except OSError:
+                logger.exception("Unable to write the query log %s", self.path)
+            finally:
+                for _ in pending:
+                    self.lines.task_done()
+
+    def flush(self) -> None:
+        """Wait until every queued line is in the file."""
+
+        self.lines.join()
+
+
+def read_query_log(path: str) -> Iterator[tuple[FieldUsage, float]]:
+    with open(path, encoding="utf-8") as log_file:
+        for line in log_file:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            usage = FieldUsage(
+                entry["model"],
+                tuple((name, lookup) for name, lookup in entry["filters"]),
+                tuple((name, direction) for name, direction in entry["order"]),
+            )
+            yield usage, float(entry["seconds"])
+
+
+class QueryLogExtension(SchemaExtension):
+    """Log which model fields operations filter and order on, with the SQL time (or execution time) spent."""
+
+    query_log: QueryLog
+
+    @classmethod
+    def bind(cls, query_log: QueryLog) -> type["QueryLogExtension"]:
+        return type(cls.__name__, (cls,), {"query_log": query_log})
+
+    def get_usages(self) -> list[FieldUsage]:
+        execution_context = self.execution_context
+        document = execution_context.graphql_document
+        if document is None:
+            return []
+        operation = get_operation_ast(document, execution_context.operation_name)
+        if operation is None:
+            return []
+        collector = FilterUsageCollector(execution_context.schema._schema, document, execution_context.variables)
+        root_type = collector.root_type(operation)
+        if root_type is None:
+            return []
+        return list(dict.fromkeys(collector.collect(root_type, operation.selection_set, self.query_log.type_models)))
+
+    def on_execute(self) -> Iterator[None]:
+        execution_context = self.execution_context
+        # a stream is logged once, by the execution that planned it
+        planned = execution_context.result is None and not is_stream_chunk(execution_context.root_value)
+        usages = self.get_usages() if planned else []
+        report = current_report.get()
+        db_time = report.db_time if report is not None else 0.0
+        started = time.perf_counter()
+        yield
+        if not usages:
+            return
+        # with instrumentation on only database time counts, that is what an index can save
+        seconds = report.db_time - db_time if report is not None else time.perf_counter() - started
+        self.query_log.write(usages, seconds)
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterable,
+    Optional,
+    Type,
+)
+
+from django.core.cache import (
+    BaseCache,
+    caches,
+)
+from django.db.models import Model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+)
+from graphql import (
+    ExecutionResult,
+    OperationType,
+    print_ast,
+)
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import SchemaExtension
+
+from .conf import get_setting
+from .selections import SelectionWalker
+from .signals import models_bulk_changed
+
+VERSION_KEY_PREFIX = "autographql:model-version:"
+RESPONSE_KEY_PREFIX = "autographql:response:"
+
+
+def get_model_label(model: Type[Model]) -> str:
+    return model._meta.label_lower
+
+
+class ModelVersions:
+    """Per-model version counters kept in the cache itself, so every process sees invalidations."""
+
+    def __init__(self, cache: BaseCache, labels: Iterable[str] = ()) -> None:
+        self.cache = cache
+        self.labels = set(labels)
+
+    @staticmethod
+    def key(label: str) -> str:
+        return f"{VERSION_KEY_PREFIX}{label}"
+
+    def bump(self, label: str) -> None:
+        try:
+            self.cache.incr(self.key(label))
+        except ValueError:
+            # unknown or evicted counter; a fresh random start never repeats an old version
+            self.cache.add(self.key(label), time.time_ns(), timeout=None)
+
+    async def get_many(self, labels: Iterable[str]) -> dict[str, int]:
+        keys = {self.key(label): label for label in labels}
+        versions = await self.cache.aget_many(keys)
+        missing = {key: time.time_ns() for key in keys if key not in versions}
+        for key, version in missing.items():
+            if await self.cache.aadd(key, version, timeout=None):
+                versions[key] = version
+            else:
+                versions[key] = await self.cache.aget(key)
+        return {keys[key]: version for key, version in versions.items()}
+
+    def connect_signals(self) -> None:
+        # held by the signals alone, connected once per cache when the app is ready
+        uid = f"autographql-model-versions-{id(self)}"
+        post_save.connect(self.on_model_changed, weak=False, dispatch_uid=f"{uid}-save")
+        post_delete.connect(self.on_model_changed, weak=False, dispatch_uid=f"{uid}-delete")
+        m2m_changed.connect(self.on_m2m_changed, weak=False, dispatch_uid=f"{uid}-m2m")
+        models_bulk_changed.connect(self.on_model_changed, weak=False, dispatch_uid=f"{uid}-bulk")
+
+    def invalidate(self, *models: Type[Model]) -> None:
+        for model in models:
+            label = get_model_label(model)
+            if label in self.labels:
+                self.bump(label)
+
+    def on_model_changed(self, sender: Type[Model], **kwargs: Any) -> None:
+        self.invalidate(sender)
+
+    def on_m2m_changed(
+        self, sender: Type[Model], instance: Model, model: Type[Model], action: str, **kwargs: Any
+    ) -> None:
+        if action.startswith("post_"):
+            self.invalidate(type(instance), model, sender)
+
+
+class ResponseSizes:
+    """Bytes of the responses this process stored in one cache, oldest first.
+
+    Other processes' entries are not seen, so AUTOGRAPHQL_RESPONSE_CACHE_MAX_SIZE bounds each worker;
+    entries the cache expired or evicted on its own are counted until they would be evicted here.
+    """
+
+    def __init__(self) -> None:
+        self.sizes: OrderedDict[str, int] = OrderedDict()
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def add(self, key: str, size: int, max_size: int) -> list[str]:
+        """Record a stored response, return the keys to delete to get back under max_size."""
+
+        with self._lock:
+            self.total += size - self.sizes.pop(key, 0)
+            self.sizes[key] = size
+            evicted = []
+            while self.total > max_size and self.sizes:
+                evicted_key, evicted_size = self.sizes.popitem(last=False)
+                self.total -= evicted_size
+                evicted.append(evicted_key)
+            return evicted
+
+
+# cache alias -> sizes shared by the response caches of every endpoint using it
+_response_sizes: dict[str, ResponseSizes] = {}
+_response_sizes_lock = threading.Lock()
+
+
+class ResponseCache:
+    def __init__(self, cache_alias: str, type_models: dict[str, Type[Model]], namespace: str = "") -> None:
+        self.cache = caches[cache_alias]
+        self.type_models = type_models
+        # endpoints with other schemas may answer the same document differently (__typename)
+        self.namespace = namespace
+        self.versions = ModelVersions(self.cache, {get_model_label(model) for model in type_models.values()})
+        with _response_sizes_lock:
+            self.sizes = _response_sizes.setdefault(cache_alias, ResponseSizes())
+
+    async def store(self, key: str, response: str) -> None:
+        if len(response) > get_setting("AUTOGRAPHQL_RESPONSE_CACHE_MAX_ENTRY_SIZE", 1024 * 1024, int):
+            return
+        await self.cache.aset(
+            key, response, timeout=get_setting("AUTOGRAPHQL_RESPONSE_CACHE_TTL", 60, (int, type(None)))
+        )
+        max_size = get_setting("AUTOGRAPHQL_RESPONSE_CACHE_MAX_SIZE", None, (int, type(None)))
+        if max_size is not None:
+            for evicted_key in self.sizes.add(key, len(response), max_size):
+                await self.cache.adelete(evicted_key)
+
+
+def get_version_cache_aliases() -> set[str]:
+    """Caches whose entries are keyed by model versions: the count cache, and the response cache if any."""
+
+    aliases = {get_setting("AUTOGRAPHQL_COUNT_CACHE", "default", str)}
+    response_cache_alias = get_setting("AUTOGRAPHQL_RESPONSE_CACHE", None, str)
+    if response_cache_alias is not None:
+        aliases.add(response_cache_alias)
+    return aliases
+
+
+class ResponseCacheExtension(SchemaExtension):
+    """Serve repeated queries from cache; key covers document, variables and touched models' versions."""
+
+    response_cache: ResponseCache
+
+    @classmethod
+    def bind(cls, response_cache: ResponseCache) -> type["ResponseCacheExtension"]:
+        return type(cls.__name__, (cls,), {"response_cache": response_cache})
+
+    async def get_cache_key(self) -> Optional[str]:
+        execution_context = self.execution_context
+        document = execution_context.graphql_document
+        # a root value (e.g. a streamed chunk) changes the result without changing the document
+        if document is None or execution_context.root_value is not None:
+            return None
+        operation = get_operation_ast(document, execution_context.operation_name)
+        if operation is None or operation.operation != OperationType.QUERY:
+            return None
+
+        walker = SelectionWalker(execution_context.schema._schema, document)
+        root_type = walker.root_type(operation)
+        if root_type is None:
+            return None
+        type_models = self.response_cache.type_models
+        labels = sorted(
+            {
+                get_model_label(type_models[type_name])
+                for type_name in walker.collect_object_types(root_type, operation.selection_set)
+                if type_name in type_models
+            }
+        )
+        versions = await self.response_cache.versions.get_many(labels)
+
+        key_source = json.dumps(
+            [
+                self.response_cache.namespace,
+                print_ast(document),
+                execution_context.operation_name,
+                execution_context.variables,
+                [[label, versions[label]] for label in labels],
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return RESPONSE_KEY_PREFIX + hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    async def on_execute(self) -> AsyncIterator[None]:
+        execution_context = self.execution_context
+        self.cache_hit = False
+        cache_key = None if execution_context.result is not None else await self.get_cache_key()
+
+        if cache_key is not None:
+            cached_response = await self.response_cache.cache.aget(cache_key)
+            if cached_response is not None:
+                self.cache_hit = True
+                execution_context.result = ExecutionResult(data=json.loads(cached_response))
+
+        yield
+
+        result = execution_context.result
+        if cache_key is None or self.cache_hit or result is None or result.errors:
+            return
+        await self.response_cache.store(cache_key, json.dumps(result.data))
+
+    def get_results(self) -> dict[str, Any]:
+        return {"responseCache": {"hit": self.cache_hit}} if hasattr(self, "cache_hit") else {}
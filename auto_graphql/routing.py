@@ -0,0 +1,256 @@
+import itertools
+import threading
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Optional,
+    Type,
+    cast,
+)
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+)
+from django.conf import settings
+from django.core.cache import (
+    BaseCache,
+    caches,
+)
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+)
+from django.db.models import Model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+)
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+)
+from django.utils.decorators import sync_and_async_middleware
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from .conf import get_setting
+from .signals import models_bulk_changed
+from .streaming import (
+    StreamRoot,
+    is_stream_chunk,
+)
+
+PIN_KEY_PREFIX = "autographql:primary-pin:"
+
+current_read_database: ContextVar[Optional[str]] = ContextVar("autographql_read_database", default=None)
+current_client: ContextVar[Optional[str]] = ContextVar("autographql_client", default=None)
+
+
+def get_primary_database() -> str:
+    return get_setting("AUTOGRAPHQL_PRIMARY_DATABASE", DEFAULT_DB_ALIAS, str)
+
+
+def get_read_databases() -> list[str]:
+    aliases: list[str] = get_setting("AUTOGRAPHQL_READ_DATABASES", [], list)
+    unknown = [alias for alias in aliases if alias not in settings.DATABASES]
+    if unknown:
+        raise ValueError(f"AUTOGRAPHQL_READ_DATABASES setting has unknown aliases: {', '.join(unknown)}.")
+    return aliases
+
+
+def configure_read_connections(aliases: list[str]) -> None:
+    """Keep connections to read aliases open between operations unless DATABASES sets their age.
+
+    Every thread that runs reads, the AUTOGRAPHQL_DB_THREADS pool threads included, then holds one
+    connection per alias for AUTOGRAPHQL_READ_CONN_MAX_AGE seconds, checked before reuse.
+    """
+
+    max_age = get_setting("AUTOGRAPHQL_READ_CONN_MAX_AGE", 60, (int, type(None)))
+    for alias in aliases:
+        # Django fills in CONN_MAX_AGE 0 for aliases without one, so 0 is taken as unset;
+        # the wrappers share this dict, so connections opened before the schema was built follow it too
+        connection_settings = connections.settings[alias]
+        if connection_settings["CONN_MAX_AGE"] == 0 and max_age != 0:
+            connection_settings["CONN_MAX_AGE"] = max_age
+            connection_settings["CONN_HEALTH_CHECKS"] = True
+
+
+def get_client_key(request: Optional[HttpRequest]) -> Optional[str]:
+    """AUTOGRAPHQL_READ_PIN_HEADER value, session or authenticated user; None leaves the client unpinned.
+
+    The address is not used: every client behind one NAT or proxy would share the pin.
+    """
+
+    if request is None:
+        return None
+    header = get_setting("AUTOGRAPHQL_READ_PIN_HEADER", None, str)
+    if header is not None and request.headers.get(header):
+        return f"header:{request.headers[header]}"
+    session = getattr(request, "session", None)
+    session_key = getattr(session, "session_key", None)
+    if session_key:
+        return f"session:{session_key}"
+    # without a session key the lazy user of AuthenticationMiddleware resolves without a query
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    return None
+
+
+class ReadReplicaRouter:
+    """DATABASE_ROUTERS entry: reads go to the replica chosen for the running GraphQL operation."""
+
+    def db_for_read(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        return current_read_database.get()
+
+    def db_for_write(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        # instances read from a replica would otherwise be saved back to it
+        return get_primary_database() if get_read_databases() else None
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        databases = {get_primary_database(), *get_read_databases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReadBalancer:
+    """Pick a read alias per operation, round-robin or the one with fewest operations in flight."""
+
+    def __init__(self, aliases: list[str], strategy: str) -> None:
+        if strategy not in ("round_robin", "least_busy"):
+            raise ValueError("AUTOGRAPHQL_READ_BALANCING setting must be one of: round_robin, least_busy.")
+        self.aliases = aliases
+        self.strategy = strategy
+        self.in_flight = dict.fromkeys(aliases, 0)
+        self._cycle = itertools.cycle(aliases)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "ReadBalancer":
+        return cls(get_read_databases(), get_setting("AUTOGRAPHQL_READ_BALANCING", "least_busy", str))
+
+    def acquire(self) -> str:
+        with self._lock:
+            if self.strategy == "round_robin":
+                alias = next(self._cycle)
+            else:
+                # ties go to the next alias in turn, so idle replicas share the load
+                start = next(self._cycle)
+                offset = self.aliases.index(start)
+                ordered = self.aliases[offset:] + self.aliases[:offset]
+                alias = min(ordered, key=self.in_flight.__getitem__)
+            self.in_flight[alias] += 1
+            return alias
+
+    def release(self, alias: str) -> None:
+        with self._lock:
+            self.in_flight[alias] -= 1
+
+
+class PrimaryPins:
+    """Clients that wrote recently read from the primary until replicas have caught up."""
+
+    def __init__(self, cache: BaseCache, seconds: int) -> None:
+        self.cache = cache
+        self.seconds = seconds
+
+    @classmethod
+    def from_settings(cls) -> "PrimaryPins":
+        return cls(
+            caches[get_setting("AUTOGRAPHQL_READ_PIN_CACHE", "default", str)],
+            get_setting("AUTOGRAPHQL_READ_PIN_SECONDS", 5, int),
+        )
+
+    def pin(self, client: str) -> None:
+        self.cache.set(PIN_KEY_PREFIX + client, True, timeout=self.seconds)
+
+    async def is_pinned(self, client: str) -> bool:
+        return bool(await self.cache.aget(PIN_KEY_PREFIX + client))
+
+    def connect_signals(self) -> None:
+        for signal, name in (
+            (post_save, "save"),
+            (post_delete, "delete"),
+            (m2m_changed, "m2m"),
+            (models_bulk_changed, "bulk"),
+        ):
+            signal.connect(self.on_write, weak=False, dispatch_uid=f"autographql-primary-pins-{name}-{id(self)}")
+
+    def on_write(self, sender: Type[Model], **kwargs: Any) -> None:
+        client = current_client.get()
+        if client is not None and self.seconds > 0:
+            self.pin(client)
+
+
+@sync_and_async_middleware
+def primary_pin_middleware(get_response: Callable[[HttpRequest], Any]) -> Callable[[HttpRequest], Any]:
+    """Attribute writes of any view to its client, so the client's next GraphQL reads see them."""
+
+    if iscoroutinefunction(get_response):
+
+        async def async_middleware(request: HttpRequest) -> HttpResponse:
+            token = current_client.set(get_client_key(request))
+            try:
+                return cast(HttpResponse, await get_response(request))
+            finally:
+                current_client.reset(token)
+
+        return markcoroutinefunction(async_middleware)
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        token = current_client.set(get_client_key(request))
+        try:
+            return cast(HttpResponse, get_response(request))
+        finally:
+            current_client.reset(token)
+
+    return middleware
+
+
+class ReadReplicaExtension(SchemaExtension):
+    """Run queries on a read replica unless the client wrote within AUTOGRAPHQL_READ_PIN_SECONDS."""
+
+    balancer: ReadBalancer
+    pins: PrimaryPins
+
+    @classmethod
+    def bind(cls, balancer: ReadBalancer, pins: PrimaryPins) -> type["ReadReplicaExtension"]:
+        return type(cls.__name__, (cls,), {"balancer": balancer, "pins": pins})
+
+    async def on_execute(self) -> AsyncIterator[None]:
+        execution_context = self.execution_context
+        root_value = execution_context.root_value
+        if is_stream_chunk(root_value):
+            # every chunk reads where the stream was planned, its rows came from there
+            read_token = current_read_database.set(root_value.database)
+            try:
+                yield
+            finally:
+                current_read_database.reset(read_token)
+            return
+
+        client = get_client_key(getattr(execution_context.context, "request", None))
+        client_token = current_client.set(client)
+        try:
+            if execution_context.operation_type != OperationType.QUERY or (
+                client is not None and await self.pins.is_pinned(client)
+            ):
+                yield
+                return
+
+            alias = self.balancer.acquire()
+            if isinstance(root_value, StreamRoot):
+                root_value.database = alias
+            read_token = current_read_database.set(alias)
+            try:
+                yield
+            finally:
+                current_read_database.reset(read_token)
+                self.balancer.release(alias)
+        finally:
+            current_client.reset(client_token)
@@ -0,0 +1,166 @@
+import operator
+from functools import reduce
+from typing import (
+    Any,
+    Callable,
+    Type,
+)
+
+from django.apps import apps
+from django.db import (
+    connections,
+    router,
+)
+from django.db.migrations.operations.base import Operation
+from django.db.models import (
+    IntegerField,
+    Model,
+    Q,
+    QuerySet,
+    TextField,
+)
+from django.db.models.expressions import RawSQL
+
+from .conf import get_setting
+
+
+def get_search_models() -> list[Type[Model]]:
+    labels: list[str] = get_setting("AUTOGRAPHQL_SEARCH", [], list)
+    try:
+        models = [apps.get_model(label) for label in labels]
+    except (LookupError, ValueError) as e:
+        raise ValueError(f"AUTOGRAPHQL_SEARCH setting has an unknown model: {e}") from e
+    for model in models:
+        if not get_search_fields(model):
+            raise ValueError(f"AUTOGRAPHQL_SEARCH setting has {model._meta.label} without text fields.")
+        if not isinstance(model._meta.pk, IntegerField):
+            raise ValueError(f"AUTOGRAPHQL_SEARCH setting has {model._meta.label}, its primary key is not an integer.")
+    return models
+
+
+def get_search_fields(model: Type[Model]) -> list[str]:
+    return [field.name for field in model._meta.concrete_fields if isinstance(field, TextField)]  # type: ignore
+
+
+def get_search_table(model: Type[Model]) -> str:
+    return f"{model._meta.db_table}_search"
+
+
+def get_search_index_sql(
+    table: str, pk_column: str, columns: list[str], quote_name: Callable[[str], str], drop: bool = False
+) -> list[str]:
+    """SQLite FTS5 table over the text columns of a table, kept in sync by triggers.
+
+    External content: the index stores no copy of the text, it reads the rows of the table itself.
+    """
+
+    search_table = f"{table}_search"
+    triggers = {name: quote_name(f"{search_table}_{name}") for name in ("insert", "delete", "update")}
+    if drop:
+        return [f"DROP TRIGGER IF EXISTS {trigger}" for trigger in triggers.values()] + [
+            f"DROP TABLE IF EXISTS {quote_name(search_table)}"
+        ]
+
+    fts, pk = quote_name(search_table), quote_name(pk_column)
+    names = ", ".join(quote_name(column) for column in columns)
+    old_values = ", ".join(f"old.{quote_name(column)}" for column in columns)
+    new_values = ", ".join(f"new.{quote_name(column)}" for column in columns)
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.{pk}, {new_values});"
+    delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.{pk}, {old_values});"
+    options = f"content='{table}', content_rowid='{pk_column}', tokenize='porter unicode61'"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, {options})",
+        f"CREATE TRIGGER {triggers['insert']} AFTER INSERT ON {quote_name(table)} BEGIN {insert} END",
+        f"CREATE TRIGGER {triggers['delete']} AFTER DELETE ON {quote_name(table)} BEGIN {delete} END",
+        f"CREATE TRIGGER {triggers['update']} AFTER UPDATE OF {pk}, {names} ON {quote_name(table)} "
+        f"BEGIN {delete} {insert} END",
+        # indexes the rows already in the table
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+class CreateSearchIndex(Operation):
+    """Create the FTS5 index of AUTOGRAPHQL_SEARCH model text fields; nothing on other databases."""
+
+    reversible = True
+
+    def __init__(self, model_name: str, fields: list[str]) -> None:
+        self.model_name = model_name
+        self.fields = fields
+
+    def state_forwards(self, app_label: str, state: Any) -> None:
+        pass
+
+    def database_forwards(self, app_label: str, schema_editor: Any, from_state: Any, to_state: Any) -> None:
+        self.run_sql(to_state.apps.get_model(app_label, self.model_name), schema_editor, drop=False)
+
+    def database_backwards(self, app_label: str, schema_editor: Any, from_state: Any, to_state: Any) -> None:
+        self.run_sql(from_state.apps.get_model(app_label, self.model_name), schema_editor, drop=True)
+
+    def run_sql(self, model: Type[Model], schema_editor: Any, drop: bool) -> None:
+        connection = schema_editor.connection
+        if connection.vendor != "sqlite" or not self.allow_migrate_model(connection.alias, model):
+            return
+        meta: Any = model._meta
+        columns = [meta.get_field(name).column for name in self.fields]
+        for sql in get_search_index_sql(meta.db_table, meta.pk.column, columns, connection.ops.quote_name, drop):
+            schema_editor.execute(sql, params=None)
+
+    def describe(self) -> str:
+        return f"Create full-text search index on {self.model_name}"
+
+    @property
+    def migration_name_fragment(self) -> str:
+        return f"{self.model_name.lower()}_search"
+
+
+def get_match_query(value: str) -> str:
+    """Every word as an FTS5 string, so the words must all match and operators in the input mean nothing."""
+
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in value.split())
+
+
+def search_queryset(queryset: "QuerySet[Any]", value: str) -> "QuerySet[Any]":
+    """Rows with every word of value in their text fields: FTS5 ranked by bm25 on SQLite, icontains elsewhere."""
+
+    words = value.split()
+    if not words:
+        return queryset
+    model = queryset.model
+    connection = connections[queryset.db]
+    if connection.vendor == "sqlite":
+        quote_name = connection.ops.quote_name
+        fts = quote_name(get_search_table(model))
+        table, pk = quote_name(model._meta.db_table), quote_name(model._meta.pk.column)
+        match_query = get_match_query(value)
+        # the rank of each row is looked up by rowid in the same match the filter used
+        rank = RawSQL(
+            f"(SELECT bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND {fts}.rowid = {table}.{pk})", [match_query]
+        )
+        matches = RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [match_query])
+        return queryset.filter(pk__in=matches).order_by(rank)
+
+    fields = get_search_fields(model)
+    return queryset.filter(
+        reduce(
+            operator.and_,
+            (reduce(operator.or_, (Q(**{f"{field}__icontains": word}) for field in fields)) for word in words),
+        )
+    )
+
+
+def filter_search(self: Any, queryset: "QuerySet[Any]") -> "QuerySet[Any]":
+    """The search field of generated Filters; an order argument replaces the rank ordering."""
+
+    return queryset if self.search is None else search_queryset(queryset, self.search)
+
+
+def is_indexed_search(model: Type[Model], filters: Any) -> bool:
+    """Whether the AND-ed part of a filters argument has a search the FTS5 index serves."""
+
+    if not isinstance(filters, dict):
+        return False
+    search = filters.get("search")
+    if isinstance(search, str) and search.split():
+        return connections[router.db_for_read(model)].vendor == "sqlite" and model in get_search_models()
+    return is_indexed_search(model, filters.get("AND"))
@@ -0,0 +1,68 @@
+from typing import (
+    Any,
+    Iterator,
+    Optional,
+)
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    get_named_type,
+)
+
+
+class SelectionWalker:
+    """Walk operation selections with fragments inlined."""
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        document: DocumentNode,
+        variables: Optional[dict[str, Any]] = None,
+    ) -> None:
+        self.schema = schema
+        self.variables = variables or {}
+        self.fragments: dict[str, FragmentDefinitionNode] = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+
+    def iter_fields(
+        self,
+        selection_set: SelectionSetNode,
+        visited_fragments: frozenset[str] = frozenset(),
+    ) -> Iterator[FieldNode]:
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                yield selection
+            elif isinstance(selection, InlineFragmentNode):
+                yield from self.iter_fields(selection.selection_set, visited_fragments)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                if name in self.fragments and name not in visited_fragments:
+                    yield from self.iter_fields(self.fragments[name].selection_set, visited_fragments | {name})
+
+    def root_type(self, operation: OperationDefinitionNode) -> Optional[GraphQLObjectType]:
+        return self.schema.get_root_type(operation.operation)
+
+    def collect_object_types(self, parent_type: GraphQLObjectType, selection_set: SelectionSetNode) -> set[str]:
+        """Names of all object types the selection resolves, and "Type.field" of every selected field."""
+
+        type_names = {parent_type.name}
+        for field in self.iter_fields(selection_set):
+            type_names.add(f"{parent_type.name}.{field.name.value}")
+            field_def = parent_type.fields.get(field.name.value)
+            if field.selection_set is None or field_def is None:
+                continue
+            named_type = get_named_type(field_def.type)
+            if isinstance(named_type, GraphQLObjectType):
+                type_names |= self.collect_object_types(named_type, field.selection_set)
+        return type_names
@@ -1,13 +1,21 @@
 import importlib
-from typing import cast
+from typing import (
+    Any,
+    cast,
+)
 
+from django.apps import apps
 from django.conf import settings
 from django.urls import (
     URLPattern,
     path,
 )
 
-from .mapper import AsyncAutoGraphQLView
+from .conf import get_setting
+from .mapper import (
+    BUILD_MODES,
+    AsyncAutoGraphQLView,
+)
 
 
 def setup_global_endpoint() -> None:
@@ -26,4 +34,52 @@ def setup_global_endpoint() -> None:
     if not isinstance(route_path, str):
         raise ValueError("AUTOGRAPHQL_GLOBAL_ROUTE setting must be a string.")
 
-    urlpatterns.append(path(route_path, AsyncAutoGraphQLView.as_view()))
+    export = get_setting("AUTOGRAPHQL_EXPORT", False, bool)
+    endpoints: list[tuple[str, dict[str, Any]]] = [(route_path, {})]
+    endpoints += [
+        (endpoint_path, {**options, "name": endpoint_path}) for endpoint_path, options in get_endpoints().items()
+    ]
+    for endpoint_path, options in endpoints:
+        view = AsyncAutoGraphQLView.as_view(**options)
+        urlpatterns.append(path(endpoint_path, view))
+        if export:
+            # the same schema serves the rows of its top-level lists
+            urlpatterns.append(path(f"{endpoint_path.rstrip('/')}/export/<str:export_field>", view))
+
+
+def get_endpoints() -> dict[str, dict[str, Any]]:
+    """AUTOGRAPHQL_ENDPOINTS: route -> {"apps": [app labels], "recursive": bool, "build": mode}, a smaller schema
+    per route.
+
+    Unlike the global endpoint these are built on their first request by default, so each alternative
+    schema costs startup time only where it is asked for.
+    """
+
+    endpoints: dict[Any, Any] = get_setting("AUTOGRAPHQL_ENDPOINTS", {}, dict)
+    checked: dict[str, dict[str, Any]] = {}
+    for route_path, options in endpoints.items():
+        if (
+            not isinstance(route_path, str)
+            or not isinstance(options, dict)
+            or set(options) - {"apps", "recursive", "build"}
+        ):
+            raise ValueError(f"AUTOGRAPHQL_ENDPOINTS setting has an invalid endpoint: {route_path!r}.")
+        app_labels = options.get("apps")
+        if app_labels is not None:
+            if not isinstance(app_labels, list) or not app_labels:
+                raise ValueError(f"AUTOGRAPHQL_ENDPOINTS setting: apps of {route_path!r} must be a non-empty list.")
+            unknown = [
+                label for label in app_labels if label not in {config.label for config in apps.get_app_configs()}
+            ]
+            if unknown:
+                raise ValueError(f"AUTOGRAPHQL_ENDPOINTS setting: {route_path!r} has unknown apps {unknown}.")
+        recursive = options.get("recursive", True)
+        if not isinstance(recursive, bool):
+            raise ValueError(f"AUTOGRAPHQL_ENDPOINTS setting: recursive of {route_path!r} must be a boolean.")
+        build_mode = options.get("build", "lazy")
+        if build_mode not in BUILD_MODES:
+            raise ValueError(
+                f"AUTOGRAPHQL_ENDPOINTS setting: build of {route_path!r} must be one of: {', '.join(BUILD_MODES)}."
+            )
+        checked[route_path] = {"app_labels": app_labels, "recursive": recursive, "build_mode": build_mode}
+    return checked
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# sent with the model as sender after bulk writes, which send no post_save or post_delete
+models_bulk_changed = Signal()
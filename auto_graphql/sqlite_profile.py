@@ -0,0 +1,99 @@
+import re
+import time
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+)
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from .conf import get_setting
+
+# WAL lets readers run next to the writer; NORMAL only syncs at checkpoints, which is safe in WAL mode
+SQLITE_PRAGMAS: dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -64 * 1024,  # KiB when negative
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+PRAGMA_VALUE = re.compile(r"^(-?\d+|[A-Za-z_]+)$")
+
+current_query_only: ContextVar[bool] = ContextVar("autographql_query_only", default=False)
+
+
+def is_sqlite_profile_enabled() -> bool:
+    return get_setting("AUTOGRAPHQL_SQLITE_PROFILE", False, bool)
+
+
+def get_sqlite_pragmas() -> dict[str, Any]:
+    """Profile pragmas with AUTOGRAPHQL_SQLITE_PRAGMAS applied on top; a None value drops a pragma."""
+
+    overrides: dict[str, Any] = get_setting("AUTOGRAPHQL_SQLITE_PRAGMAS", {}, dict)
+    pragmas = {name: value for name, value in {**SQLITE_PRAGMAS, **overrides}.items() if value is not None}
+    for name, value in pragmas.items():
+        # pragmas take no bound parameters, so the text is checked before it is formatted in
+        if not PRAGMA_NAME.match(name) or not PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f"AUTOGRAPHQL_SQLITE_PRAGMAS setting has an invalid pragma: {name} = {value}.")
+    return pragmas
+
+
+def apply_pragmas(raw_connection: Any, pragmas: dict[str, Any]) -> None:
+    for name, value in pragmas.items():
+        raw_connection.execute(f"PRAGMA {name} = {value}").fetchall()
+
+
+def set_query_only(execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+    connection = context["connection"]
+    query_only = current_query_only.get()
+    if getattr(connection, "autographql_query_only", False) != query_only:
+        # straight on the sqlite3 connection, the pragma itself must not come back through this wrapper
+        connection.connection.execute(f"PRAGMA query_only = {int(query_only)}")
+        connection.autographql_query_only = query_only
+    return execute(sql, params, many, context)
+
+
+def configure_sqlite_connection(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    if connection.vendor != "sqlite" or connection.is_in_memory_db():  # type: ignore[attr-defined]
+        return
+    apply_pragmas(connection.connection, get_sqlite_pragmas())
+    connection.autographql_query_only = False  # type: ignore[attr-defined]
+    if set_query_only not in connection.execute_wrappers:
+        connection.execute_wrappers.append(set_query_only)
+
+    # Django closes connections with CONN_MAX_AGE = 0 after every request
+    if connection.settings_dict["CONN_MAX_AGE"] == 0:
+        max_age = get_setting("AUTOGRAPHQL_SQLITE_CONN_MAX_AGE", 600, (int, type(None)))
+        connection.close_at = None if max_age is None else time.monotonic() + max_age
+        connection.health_check_enabled = True  # type: ignore[attr-defined]
+
+
+def connect_sqlite_profile() -> None:
+    """Tune every new SQLite connection and keep it open across requests."""
+
+    connection_created.connect(configure_sqlite_connection, dispatch_uid="autographql-sqlite-profile")
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            configure_sqlite_connection(connection)
+
+
+class QueryOnlyExtension(SchemaExtension):
+    """Run query operations with PRAGMA query_only, so a read can never take SQLite's write lock."""
+
+    def on_execute(self) -> Iterator[None]:
+        if self.execution_context.operation_type != OperationType.QUERY:
+            yield
+            return
+        token = current_query_only.set(True)
+        try:
+            yield
+        finally:
+            current_query_only.reset(token)
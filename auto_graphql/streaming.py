@@ -0,0 +1,262 @@
+import json
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+    TypeGuard,
+)
+
+from asgiref.sync import async_to_sync
+from django.db.models import QuerySet
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    Node,
+    OperationDefinitionNode,
+    VariableNode,
+    print_ast,
+    visit,
+)
+from graphql.language import Visitor
+from strawberry.http import GraphQLRequestData
+from strawberry.types import (
+    ExecutionResult,
+    Info,
+)
+from strawberry.utils.inspect import in_async_context
+from strawberry_django.fields.field import StrawberryDjangoField
+
+from .db_pool import fetch
+from .fast_path import (
+    current_scalar_lists,
+    read_scalar_list,
+)
+
+NDJSON = "application/x-ndjson"
+MULTIPART = 'multipart/mixed; boundary="-"; deferSpec=20220824'
+
+
+@dataclass
+class StreamRoot:
+    """Root value of a streamed operation.
+
+    Without rows top-level list fields only record their querysets (planning), with rows
+    they return the given chunk instead of querying. Chunks carry the part of the planned document
+    they execute and the read database planning ran on, so extensions need not check either again.
+    """
+
+    chunk_size: int
+    rows: Optional[dict[str, list[Any]]] = None
+    querysets: dict[str, QuerySet[Any]] = field(default_factory=dict)
+    document: Optional[DocumentNode] = None
+    database: Optional[str] = None
+
+
+def is_stream_chunk(root_value: Any) -> TypeGuard[StreamRoot]:
+    """Whether an execution delivers a chunk of a stream whose planning already ran every extension."""
+
+    return isinstance(root_value, StreamRoot) and root_value.rows is not None
+
+
+class RootListField(StrawberryDjangoField):  # type: ignore
+    """Top-level list field that can hand its queryset over to a streamed response."""
+
+    def get_result(self, source: Any, info: Info[Any, Any], args: list[Any], kwargs: dict[str, Any]) -> Any:
+        stream_root = info.root_value
+        if not isinstance(stream_root, StreamRoot):
+            if not in_async_context():
+                return super().get_result(source, info, args, kwargs)
+            # the queryset is built on the event loop, only reading its rows leaves it
+            queryset = self.get_queryset(self.django_model._default_manager.all(), info, **kwargs)
+            scalar_lists = current_scalar_lists.get()
+            if scalar_lists is not None:
+                return read_scalar_list(queryset, info, scalar_lists)
+            return fetch(queryset)
+
+        response_key = str(info.path.key)
+        if stream_root.rows is not None:
+            return stream_root.rows.get(response_key, [])
+        # building the queryset does not touch the database, rows are read in chunks later
+        queryset = self.get_queryset(self.django_model._default_manager.all(), info, **kwargs)
+        # rows are read after the operation, keep the database routing chose for it
+        stream_root.querysets[response_key] = queryset.using(queryset.db)
+        return []
+
+
+class _UsageCollector(Visitor):
+    def __init__(self) -> None:
+        super().__init__()
+        self.variables: set[str] = set()
+        self.fragments: set[str] = set()
+
+    def enter_variable(self, node: VariableNode, *args: Any) -> None:
+        self.variables.add(node.name.value)
+
+    def enter_fragment_spread(self, node: FragmentSpreadNode, *args: Any) -> None:
+        self.fragments.add(node.name.value)
+
+
+def prune_operation(document: DocumentNode, operation: OperationDefinitionNode, response_key: str) -> DocumentNode:
+    """Document with only one top-level field of the operation, and the variables and fragments it uses."""
+
+    selections = tuple(
+        selection
+        for selection in operation.selection_set.selections
+        if isinstance(selection, FieldNode) and (selection.alias or selection.name).value == response_key
+    )
+    selection_set = operation.selection_set.__class__(selections=selections)
+
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    collector = _UsageCollector()
+    pending: list[Node] = [selection_set]
+    used_fragments: list[FragmentDefinitionNode] = []
+    while pending:
+        visit(pending.pop(), collector)
+        for name in collector.fragments - {fragment.name.value for fragment in used_fragments}:
+            if name in fragments:
+                used_fragments.append(fragments[name])
+                pending.append(fragments[name])
+
+    pruned_operation = OperationDefinitionNode(
+        operation=operation.operation,
+        name=operation.name,
+        variable_definitions=tuple(
+            definition
+            for definition in operation.variable_definitions
+            if definition.variable.name.value in collector.variables
+        ),
+        directives=operation.directives,
+        selection_set=selection_set,
+    )
+    return DocumentNode(definitions=(pruned_operation, *used_fragments))
+
+
+def encode_payload(payload: dict[str, Any], stream_format: str) -> bytes:
+    body = json.dumps(payload, separators=(",", ":"))
+    if stream_format == NDJSON:
+        return f"{body}\n".encode("utf-8")
+    part = f"\r\n---\r\nContent-Type: application/json; charset=utf-8\r\n\r\n{body}"
+    if not payload.get("hasNext"):
+        part += "\r\n-----\r\n"
+    return part.encode("utf-8")
+
+
+class ResultStream:
+    """Incremental delivery of a planned operation: initial result with empty lists, then items per chunk.
+
+    Iterated asynchronously under ASGI. WSGI workers iterate it synchronously, reading rows with
+    iterator() and running one event loop per chunk, since Django would buffer an async stream whole.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[GraphQLRequestData, StreamRoot], Awaitable[ExecutionResult]],
+        request_data: GraphQLRequestData,
+        document: DocumentNode,
+        operation: OperationDefinitionNode,
+        context: Any,
+        stream_root: StreamRoot,
+        result: ExecutionResult,
+        stream_format: str,
+    ) -> None:
+        self.execute = execute
+        self.request_data = request_data
+        self.document = document
+        self.operation = operation
+        self.context = context
+        self.stream_root = stream_root
+        self.result = result
+        self.stream_format = stream_format
+        self.chunk_documents: dict[str, DocumentNode] = {}
+
+    def initial_payload(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {"data": self.result.data, "hasNext": bool(self.get_querysets())}
+        if self.result.errors:
+            payload["errors"] = [error.formatted for error in self.result.errors]
+        return payload
+
+    def get_querysets(self) -> dict[str, QuerySet[Any]]:
+        # aiterator() does not prefetch; relations are batched by the loaders per chunk instead
+        return {
+            response_key: queryset.prefetch_related(None)
+            for response_key, queryset in ({} if self.result.errors else self.stream_root.querysets).items()
+        }
+
+    def get_chunk_request(self, response_key: str) -> GraphQLRequestData:
+        chunk_document = prune_operation(self.document, self.operation, response_key)
+        self.chunk_documents[response_key] = chunk_document
+        return GraphQLRequestData(
+            query=print_ast(chunk_document),
+            variables=self.request_data.variables,
+            operation_name=self.request_data.operation_name,
+        )
+
+    async def execute_chunk(
+        self, chunk_request: GraphQLRequestData, response_key: str, rows: list[Any], position: int
+    ) -> dict[str, Any]:
+        # loaders cache every row they loaded, fresh ones keep memory flat
+        self.context.dataloaders.clear()
+        chunk_root = StreamRoot(
+            chunk_size=self.stream_root.chunk_size,
+            rows={response_key: rows},
+            document=self.chunk_documents[response_key],
+            database=self.stream_root.database,
+        )
+        result = await self.execute(chunk_request, chunk_root)
+        incremental: dict[str, Any] = {
+            "items": (result.data or {}).get(response_key) or [],
+            "path": [response_key, position],
+        }
+        if result.errors:
+            incremental["errors"] = [error.formatted for error in result.errors]
+        return {"incremental": [incremental], "hasNext": True}
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield encode_payload(self.initial_payload(), self.stream_format)
+        querysets = self.get_querysets()
+        for response_key, queryset in querysets.items():
+            chunk_request = self.get_chunk_request(response_key)
+            position = 0
+            rows: list[Any] = []
+            async for row in queryset.aiterator(chunk_size=self.stream_root.chunk_size):
+                rows.append(row)
+                if len(rows) >= self.stream_root.chunk_size:
+                    payload = await self.execute_chunk(chunk_request, response_key, rows, position)
+                    yield encode_payload(payload, self.stream_format)
+                    position, rows = position + len(rows), []
+            if rows:
+                payload = await self.execute_chunk(chunk_request, response_key, rows, position)
+                yield encode_payload(payload, self.stream_format)
+        if querysets:
+            yield encode_payload({"hasNext": False}, self.stream_format)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield encode_payload(self.initial_payload(), self.stream_format)
+        querysets = self.get_querysets()
+        execute_chunk = async_to_sync(self.execute_chunk)
+        for response_key, queryset in querysets.items():
+            chunk_request = self.get_chunk_request(response_key)
+            position = 0
+            rows: list[Any] = []
+            for row in queryset.iterator(chunk_size=self.stream_root.chunk_size):
+                rows.append(row)
+                if len(rows) >= self.stream_root.chunk_size:
+                    yield encode_payload(execute_chunk(chunk_request, response_key, rows, position), self.stream_format)
+                    position, rows = position + len(rows), []
+            if rows:
+                yield encode_payload(execute_chunk(chunk_request, response_key, rows, position), self.stream_format)
+        if querysets:
+            yield encode_payload({"hasNext": False}, self.stream_format)
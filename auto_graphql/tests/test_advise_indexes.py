@@ -0,0 +1,136 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.db import models
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.management.commands.advise_indexes import (
+    Command,
+    get_index_columns,
+    insert_meta_indexes,
+    is_covered,
+)
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.query_log import (
+    FieldUsage,
+    QueryLogExtension,
+    read_query_log,
+)
+from auto_graphql.tests.utils import execute
+from book_catalogue.models import Book
+
+LOGGED = """
+query($date: Date) {
+  BookCatalogueBook(filters: {publishDate: {gte: $date}, OR: {title: {exact: "x"}}}, order: {title: ASC}) { title }
+}
+"""
+INDEX = models.Index(fields=["author", "-publish_date"], name="book_author_date_idx")
+INDEX_SOURCE = 'models.Index(fields=["author", "-publish_date"], name="book_author_date_idx")'
+
+
+class QueryLogTests(TestCase):
+    def test_filters_and_order_are_logged(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "queries.jsonl")
+            with override_settings(AUTOGRAPHQL_QUERY_LOG=path):
+                schema = AsyncAutoGraphQLView.build_schema()
+            self.assertIsNone(execute(schema, LOGGED, {"date": "2000-01-01"}).errors)
+            assert schema.extensions is not None
+            (query_log_extension,) = [
+                extension
+                for extension in schema.extensions
+                if isinstance(extension, type) and issubclass(extension, QueryLogExtension)
+            ]
+            # lines are appended by a writer thread
+            query_log_extension.query_log.flush()
+            ((usage, seconds),) = read_query_log(path)
+
+        self.assertEqual(usage, FieldUsage("book_catalogue.book", (("publish_date", "gte"),), (("title", "asc"),)))
+        # the OR branch cannot use a composite index, so it is not logged
+        self.assertGreaterEqual(seconds, 0)
+
+
+class IndexColumnsTests(SimpleTestCase):
+    def test_equality_then_order(self) -> None:
+        usage = FieldUsage(
+            "book_catalogue.Book",
+            filters=(("author", "exact"), ("publish_date", "gte")),
+            order=(("publish_date", "desc"),),
+        )
+        self.assertEqual(get_index_columns(Book, usage), ("author", "-publish_date"))
+
+    def test_order_after_other_range_is_dropped(self) -> None:
+        usage = FieldUsage("book_catalogue.Book", filters=(("publish_date", "gte"),), order=(("title", "asc"),))
+        self.assertEqual(get_index_columns(Book, usage), ("publish_date",))
+
+    def test_covered_by_leading_columns_in_either_direction(self) -> None:
+        self.assertTrue(is_covered(("-author",), [("author", "title")]))
+        self.assertFalse(is_covered(("author", "-title"), [("author", "title")]))
+
+
+class MetaIndexesTests(SimpleTestCase):
+    def insert(self, source: str) -> str:
+        return insert_meta_indexes(source.encode(), "Book", [INDEX]).decode()
+
+    def test_adds_meta(self) -> None:
+        source = "from django.db import models\n\n\nclass Book(models.Model):\n    title = models.TextField()\n"
+        self.assertEqual(
+            self.insert(source),
+            source + f"\n    class Meta:\n        indexes = [\n            {INDEX_SOURCE},\n        ]\n",
+        )
+
+    def test_adds_indexes_to_meta(self) -> None:
+        source = (
+            "from django.db import models\n\n\nclass Book(models.Model):\n"
+            "    class Meta:\n        ordering = ['id']\n\n\nclass Genre(models.Model):\n    pass\n"
+        )
+        self.assertIn(
+            f"        ordering = ['id']\n        indexes = [\n            {INDEX_SOURCE},\n        ]\n\n\nclass Genre",
+            self.insert(source),
+        )
+
+    def test_extends_indexes(self) -> None:
+        source = (
+            "from django.db import models\n\n\nclass Book(models.Model):\n    class Meta:\n        indexes = [\n"
+            "            models.Index(fields=['title'], name='book_title_idx'),\n        ]\n"
+        )
+        self.assertIn(f"name='book_title_idx'),\n            {INDEX_SOURCE},\n        ]\n", self.insert(source))
+
+    def test_fills_empty_indexes(self) -> None:
+        source = "from django.db import models\n\n\nclass Book(models.Model):\n    class Meta:\n        indexes = []\n"
+        self.assertIn(f"        indexes = [\n            {INDEX_SOURCE},\n        ]\n", self.insert(source))
+
+    def test_unsupported_source(self) -> None:
+        for source in (
+            "from django.db.models import Model\n\n\nclass Book(Model):\n    pass\n",
+            "from django.db import models\n\n\nclass Genre(models.Model):\n    pass\n",
+            "from django.db import models\n\n\nclass Book(models.Model):\n    class Meta:\n        indexes = INDEXES\n",
+        ):
+            with self.subTest(source=source), self.assertRaises(ValueError):
+                self.insert(source)
+
+
+class ModelIndexesTests(SimpleTestCase):
+    def add_model_indexes(self, edit_models: bool) -> tuple[str, mock.MagicMock]:
+        stdout = StringIO()
+        with mock.patch(
+            "auto_graphql.management.commands.advise_indexes.add_meta_indexes", return_value="models.py"
+        ) as add_meta_indexes:
+            Command(stdout=stdout).add_model_indexes({Book: [INDEX]}, edit_models)
+        return stdout.getvalue(), add_meta_indexes
+
+    def test_snippet_is_printed_by_default(self) -> None:
+        output, add_meta_indexes = self.add_model_indexes(edit_models=False)
+        self.assertIn(f"Add to Meta.indexes of book_catalogue.Book: {INDEX_SOURCE}", output)
+        add_meta_indexes.assert_not_called()
+
+    def test_edit_models(self) -> None:
+        output, add_meta_indexes = self.add_model_indexes(edit_models=True)
+        self.assertIn("Added to Meta.indexes in models.py", output)
+        add_meta_indexes.assert_called_once_with(Book, [INDEX])
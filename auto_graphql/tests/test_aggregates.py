@@ -0,0 +1,66 @@
+import datetime
+
+from django.test import TestCase
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    create_books,
+    create_genres,
+    execute,
+)
+
+AGGREGATE = """
+{
+  BookCatalogueBookAggregate(groupBy: [AUTHOR], filters: {title: {startsWith: "Test book"}}) {
+    key { author }
+    count
+    avg { publishDateYear }
+    max { publishDate }
+  }
+}
+"""
+
+
+class AggregateTests(TestCase):
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+
+    def test_grouped_aggregates(self) -> None:
+        first = create_books(2)
+        second = create_books(1, publish_date=datetime.date(2010, 6, 1))
+        first[1].publish_date = datetime.date(2004, 1, 1)
+        first[1].save()
+
+        result = execute(self.schema, AGGREGATE)
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        groups = sorted(result.data["BookCatalogueBookAggregate"], key=lambda group: group["key"]["author"])
+        self.assertEqual(
+            groups,
+            [
+                {
+                    "key": {"author": str(first[0].author_id)},
+                    "count": 2,
+                    "avg": {"publishDateYear": 2002.0},
+                    "max": {"publishDate": "2004-01-01"},
+                },
+                {
+                    "key": {"author": str(second[0].author_id)},
+                    "count": 1,
+                    "avg": {"publishDateYear": 2010.0},
+                    "max": {"publishDate": "2010-06-01"},
+                },
+            ],
+        )
+
+    def test_relation_count_field(self) -> None:
+        books = create_books(3)
+        (genre,) = create_genres(1)
+        genre.books.add(*books[:2])
+
+        result = execute(
+            self.schema, '{ BookCatalogueGenre(filters: {name: {exact: "Test genre 0"}}) { BookCatalogueBookCount } }'
+        )
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        self.assertEqual(result.data["BookCatalogueGenre"], [{"BookCatalogueBookCount": 2}])
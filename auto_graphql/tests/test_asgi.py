@@ -0,0 +1,37 @@
+import json
+import threading
+
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.db_pool import run_sync
+from auto_graphql.tests.utils import create_books
+
+ENDPOINT = "/auto-graphql-generated"
+
+
+class AsgiRequestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books(2)
+
+    async def test_query_over_asgi(self) -> None:
+        query = '{ BookCatalogueBook(filters: {title: {startsWith: "Test book"}}) { title BookCatalogueAuthor { lastName } } }'
+        response = await self.async_client.post(ENDPOINT, json.dumps({"query": query}), content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["data"]["BookCatalogueBook"],
+            [{"title": f"Test book {i}", "BookCatalogueAuthor": {"lastName": "Author"}} for i in range(2)],
+        )
+
+
+class DbThreadsTests(SimpleTestCase):
+    async def test_request_thread_by_default(self) -> None:
+        self.assertFalse((await run_sync(lambda: threading.current_thread().name)).startswith("autographql-db"))
+
+    @override_settings(AUTOGRAPHQL_DB_THREADS=2)
+    async def test_shared_pool(self) -> None:
+        self.assertTrue((await run_sync(lambda: threading.current_thread().name)).startswith("autographql-db"))
@@ -0,0 +1,44 @@
+import json
+from typing import Any
+
+from django.test import (
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.tests.utils import (
+    create_books,
+    create_genres,
+)
+
+ENDPOINT = "/auto-graphql-generated"
+BOOKS = '{ BookCatalogueBook(filters: {title: {startsWith: "Test book"}}) { title } }'
+
+
+class BatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books(1)
+        create_genres(1)
+
+    def post(self, data: Any) -> Any:
+        return self.client.post(ENDPOINT, json.dumps(data), content_type="application/json")
+
+    def test_results_keep_operation_order(self) -> None:
+        response = self.post(
+            [
+                {"query": BOOKS},
+                {"query": "query Genres { BookCatalogueGenre { name } }", "operationName": "Genres"},
+                {"query": "{ NoSuchField }"},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        books, genres, invalid = response.json()
+        self.assertEqual(books["data"], {"BookCatalogueBook": [{"title": "Test book 0"}]})
+        self.assertIn({"name": "Test genre 0"}, genres["data"]["BookCatalogueGenre"])
+        self.assertIn("NoSuchField", invalid["errors"][0]["message"])
+
+    @override_settings(AUTOGRAPHQL_BATCH_MAX_SIZE=2)
+    def test_batch_size_is_limited(self) -> None:
+        response = self.post([{"query": BOOKS}] * 3)
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,43 @@
+import io
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+
+from book_catalogue.models import (
+    Author,
+    Book,
+)
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_generated_dataset_serves_the_workload(self) -> None:
+        call_command(
+            "generate_dataset",
+            *("--books", "40", "--authors", "5", "--publishers", "2", "--genres", "4", "--genres-per-book", "2"),
+            "--clear",
+            stdout=io.StringIO(),
+        )
+        self.assertEqual((Book.objects.count(), Author.objects.count()), (40, 5))
+        self.assertTrue(all(0 <= book.genres.count() <= 2 for book in Book.objects.all()))
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "workload.json")
+            call_command(
+                "run_workload",
+                os.path.join(settings.BASE_DIR, "book_catalogue", "workload.json"),
+                *("--iterations", "2", "--warmup", "0", "--output", output),
+                stdout=io.StringIO(),
+            )
+            with open(output, encoding="utf-8") as output_file:
+                report = json.load(output_file)
+
+        self.assertTrue(report["operations"])
+        for operation in report["operations"]:
+            with self.subTest(operation=operation["name"]):
+                self.assertEqual(operation["errors"], 0)
+                self.assertGreater(operation["sql_queries"], 0)
+                self.assertGreater(operation["bytes_serialized"], 0)
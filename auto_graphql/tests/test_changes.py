@@ -0,0 +1,58 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import TestCase
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.models import Change
+from auto_graphql.response_cache import ModelVersions
+from auto_graphql.tests.utils import (
+    create_books,
+    execute,
+)
+from book_catalogue.models import Book
+
+CHANGES = "query($since: String) { BookCatalogueBookChanges(since: $since) { cursor hasMore upserted { id } deleted } }"
+
+
+class ChangeTrackingTests(TestCase):
+    def test_writes_are_logged_without_a_schema(self) -> None:
+        # the receivers are connected when the app is ready, not when a schema is built
+        (book,) = create_books(1)
+        book.title = "Changed"
+        book.save()
+        self.assertTrue(Change.objects.filter(model="book_catalogue.book", object_pk=str(book.pk)).exists())
+
+    def test_writes_bump_model_versions_without_a_schema(self) -> None:
+        versions = ModelVersions(caches["default"])
+        before = async_to_sync(versions.get_many)(["book_catalogue.book"])
+        create_books(1)
+        self.assertNotEqual(async_to_sync(versions.get_many)(["book_catalogue.book"]), before)
+
+    def test_changes_since_cursor(self) -> None:
+        books = create_books(3)
+        schema = AsyncAutoGraphQLView.build_schema()
+        result = execute(schema, CHANGES)
+        assert result.data is not None
+        cursor = result.data["BookCatalogueBookChanges"]["cursor"]
+
+        books[0].title = "Changed"
+        books[0].save()
+        deleted_pk = books[1].pk
+        books[1].delete()
+        result = execute(schema, CHANGES, {"since": cursor})
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        changes = result.data["BookCatalogueBookChanges"]
+        self.assertEqual(changes["upserted"], [{"id": str(books[0].pk)}])
+        self.assertEqual(changes["deleted"], [str(deleted_pk)])
+        self.assertFalse(changes["hasMore"])
+
+        result = execute(schema, CHANGES, {"since": changes["cursor"]})
+        assert result.data is not None
+        self.assertEqual(result.data["BookCatalogueBookChanges"]["upserted"], [])
+        self.assertFalse(Book.objects.filter(pk=deleted_pk).exists())
+
+    def test_invalid_cursor(self) -> None:
+        result = execute(AsyncAutoGraphQLView.build_schema(), CHANGES, {"since": "not-a-cursor"})
+        assert result.errors is not None
+        self.assertEqual(result.errors[0].message, "Invalid changes cursor.")
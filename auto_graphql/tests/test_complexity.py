@@ -0,0 +1,48 @@
+from django.test import (
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    create_books,
+    create_genres,
+    execute,
+)
+
+NESTED_LISTS = "{ BookCatalogueBook { title BookCatalogueGenre { name } } }"
+
+
+class QueryCostTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        books, (genre,) = create_books(2), create_genres(1)
+        genre.books.add(*books)
+
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+
+    def test_nested_lists_pass_by_default(self) -> None:
+        result = execute(self.schema, NESTED_LISTS)
+        self.assertIsNone(result.errors)
+        assert result.extensions is not None
+        self.assertEqual(result.extensions["queryCost"]["cost"], 10_100)
+        self.assertIsNone(result.extensions["queryCost"]["maxCost"])
+
+    @override_settings(AUTOGRAPHQL_MAX_QUERY_COST=10_000)
+    def test_cost_limit_rejects(self) -> None:
+        result = execute(self.schema, NESTED_LISTS)
+        self.assertIsNone(result.data)
+        assert result.errors is not None
+        self.assertEqual(result.errors[0].extensions, {"code": "QUERY_TOO_COMPLEX"})
+        result = execute(self.schema, "{ BookCatalogueBook(pagination: {limit: 5}) { BookCatalogueGenre { name } } }")
+        self.assertIsNone(result.errors)
+        assert result.extensions is not None
+        self.assertEqual(result.extensions["queryCost"]["cost"], 505)
+
+    @override_settings(AUTOGRAPHQL_MAX_QUERY_DEPTH=1, AUTOGRAPHQL_QUERY_DEPTH_TRUNCATE=True)
+    def test_depth_limit_truncates(self) -> None:
+        result = execute(self.schema, NESTED_LISTS)
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        self.assertNotIn("BookCatalogueGenre", result.data["BookCatalogueBook"][0])
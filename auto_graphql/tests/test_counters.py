@@ -0,0 +1,119 @@
+from django.db import connection
+from django.db.models import Count
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.models import RelationCount
+from auto_graphql.tests.utils import (
+    ALLOW_MUTATIONS,
+    create_books,
+    create_genres,
+    execute,
+)
+from book_catalogue.models import (
+    Book,
+    Genre,
+)
+
+LABEL = "book_catalogue.genre.books"
+
+
+class CounterCacheTests(TestCase):
+    def assertCountsMatch(self) -> None:
+        live = dict(Genre.objects.annotate(count=Count("books")).values_list("pk", "count"))
+        stored = dict(RelationCount.objects.filter(relation=LABEL).values_list("object_pk", "count"))
+        self.assertTrue(stored)
+        for object_pk, count in stored.items():
+            self.assertEqual(count, live.get(int(object_pk), 0), object_pk)
+
+    def test_m2m_writes_from_both_sides(self) -> None:
+        books, genres = create_books(4), create_genres(2)
+        books[0].genres.add(*genres)
+        genres[1].books.add(*books[1:])
+        self.assertCountsMatch()
+        books[0].genres.remove(genres[0])
+        self.assertCountsMatch()
+        genres[1].books.clear()
+        self.assertCountsMatch()
+        books[0].genres.set(genres)
+        books[1].delete()
+        self.assertCountsMatch()
+
+    def test_deleted_object_forgets_its_counter(self) -> None:
+        books, (genre,) = create_books(2), create_genres(1)
+        genre.books.add(*books)
+        self.assertEqual(RelationCount.objects.get(relation=LABEL, object_pk=str(genre.pk)).count, 2)
+        genre.delete()
+        self.assertFalse(RelationCount.objects.filter(relation=LABEL, object_pk=str(genre.pk)).exists())
+
+    def test_count_field_reads_counter(self) -> None:
+        books, (genre,) = create_books(3), create_genres(1)
+        genre.books.add(*books)
+        schema = AsyncAutoGraphQLView.build_schema()
+        result = execute(
+            schema, "{ BookCatalogueGenre(filters: {id: {exact: %d}}) { BookCatalogueBookCount } }" % genre.pk
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data, {"BookCatalogueGenre": [{"BookCatalogueBookCount": 3}]})
+
+
+@override_settings(AUTOGRAPHQL_MUTATIONS=True, AUTOGRAPHQL_MUTATION_PERMISSION=ALLOW_MUTATIONS)
+class BulkMutationCounterTests(TestCase):
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+        self.books, self.genres = create_books(3), create_genres(3)
+        self.genres[0].books.add(*self.books)
+
+    def get_count(self, genre: Genre) -> int:
+        return RelationCount.objects.get(relation=LABEL, object_pk=str(genre.pk)).count
+
+    def test_replaced_links_recount_old_and_new_keys(self) -> None:
+        result = execute(
+            self.schema,
+            "mutation($data: [BookCatalogueBookUpdateInput!]!) { BookCatalogueBookUpdate(data: $data) { id } }",
+            {"data": [{"id": str(book.pk), "genres": [str(self.genres[1].pk)]} for book in self.books[:2]]},
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual([self.get_count(genre) for genre in self.genres[:2]], [1, 2])
+
+    def test_created_links_are_counted(self) -> None:
+        result = execute(
+            self.schema,
+            "mutation($data: [BookCatalogueBookCreateInput!]!) { BookCatalogueBookCreate(data: $data) { id } }",
+            {
+                "data": [
+                    {
+                        "title": "New",
+                        "summary": "Summary",
+                        "publishDate": "2020-01-01",
+                        "authorId": str(self.books[0].author_id),
+                        "genres": [str(self.genres[2].pk)],
+                    }
+                ]
+            },
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual(self.get_count(self.genres[2]), 1)
+
+    def test_deleted_rows_recount_their_links(self) -> None:
+        result = execute(self.schema, "mutation { BookCatalogueBookDelete(ids: [%d]) }" % self.books[0].pk)
+        self.assertIsNone(result.errors)
+        self.assertEqual(self.get_count(self.genres[0]), 2)
+        result = execute(self.schema, "mutation { BookCatalogueGenreDelete(ids: [%d]) }" % self.genres[0].pk)
+        self.assertIsNone(result.errors)
+        self.assertFalse(RelationCount.objects.filter(relation=LABEL, object_pk=str(self.genres[0].pk)).exists())
+
+    def test_update_without_relations_touches_no_counter(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            result = execute(
+                self.schema,
+                'mutation { BookCatalogueBookUpdate(data: [{id: "%d", title: "Renamed"}]) { id } }' % self.books[0].pk,
+            )
+        self.assertIsNone(result.errors)
+        self.assertFalse([query for query in queries.captured_queries if "relationcount" in query["sql"]])
+        self.assertFalse([query for query in queries.captured_queries if "book_genres" in query["sql"]])
+        self.assertEqual(Book.objects.get(pk=self.books[0].pk).title, "Renamed")
@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from auto_graphql import counting
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    create_books,
+    execute,
+)
+from book_catalogue.models import Book
+
+TOTAL_COUNT = (
+    'query($mode: CountMode) { BookCatalogueBookTotalCount(filters: {title: {startsWith: "Test"}}, mode: $mode) }'
+)
+CONNECTION = """
+{
+  BookCatalogueBookConnection(first: 1, filters: {title: {startsWith: "Test"}}) {
+    totalCount
+    edges { node { title } }
+  }
+}
+"""
+
+
+class TotalCountTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.schema = AsyncAutoGraphQLView.build_schema()
+        self.books = create_books(3)
+
+    def total_count(self, query: str = TOTAL_COUNT, mode: str = "EXACT") -> tuple[int, int]:
+        with CaptureQueriesContext(connection) as queries:
+            result = execute(self.schema, query, {"mode": mode})
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        # the filter planner counts the whole table as well, only counts of the filtered rows are of interest
+        count_queries = sum("COUNT(" in query["sql"] and "WHERE" in query["sql"] for query in queries.captured_queries)
+        return result.data["BookCatalogueBookTotalCount"], count_queries
+
+    def test_exact_counts_every_time(self) -> None:
+        self.assertEqual(self.total_count(), (3, 1))
+        self.assertEqual(self.total_count(), (3, 1))
+
+    def test_fast_is_cached_until_the_model_changes(self) -> None:
+        self.assertEqual(self.total_count(mode="FAST"), (3, 1))
+        self.assertEqual(self.total_count(mode="FAST"), (3, 0))
+        self.books[0].delete()
+        self.assertEqual(self.total_count(mode="FAST"), (2, 1))
+
+    def test_fast_without_filters_reads_planner_statistics(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        # earlier tests found no statistics and would not look again for a while
+        counting._missing_statistics.clear()
+        with CaptureQueriesContext(connection) as queries:
+            result = execute(self.schema, "{ BookCatalogueBookTotalCount(mode: FAST) }")
+        assert result.data is not None
+        self.assertEqual(result.data["BookCatalogueBookTotalCount"], Book.objects.count())
+        self.assertFalse([query for query in queries.captured_queries if "COUNT(" in query["sql"]])
+
+    def test_missing_statistics_are_not_looked_up_again(self) -> None:
+        counting._missing_statistics.clear()
+        self.assertIsNone(counting.estimate_table_rows(Book, "default"))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIsNone(counting.estimate_table_rows(Book, "default"))
+        self.assertEqual(len(queries.captured_queries), 0)
+
+    def test_connection_total_count_ignores_the_page(self) -> None:
+        result = execute(self.schema, CONNECTION)
+        assert result.data is not None
+        connection_data = result.data["BookCatalogueBookConnection"]
+        self.assertEqual((connection_data["totalCount"], len(connection_data["edges"])), (3, 1))
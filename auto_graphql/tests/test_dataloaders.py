@@ -0,0 +1,56 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    create_books,
+    create_genres,
+    execute,
+)
+
+BOOKS = """
+{
+  BookCatalogueBook(filters: {title: {startsWith: "Test book"}}) {
+    title
+    BookCatalogueAuthor { lastName }
+    BookCatalogueGenre(pagination: {limit: 1}, order: {name: DESC}) { name }
+  }
+}
+"""
+
+
+class DataLoaderTests(TestCase):
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+        self.genres = create_genres(2)
+
+    def run_books(self) -> tuple[int, list[dict[str, object]]]:
+        with CaptureQueriesContext(connection) as queries:
+            result = execute(self.schema, BOOKS)
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        return len(queries), result.data["BookCatalogueBook"]
+
+    def test_query_count_does_not_grow_with_rows(self) -> None:
+        for book in create_books(2):
+            book.genres.add(*self.genres)
+        few, _ = self.run_books()
+
+        for book in create_books(8):
+            book.genres.add(*self.genres)
+        many, books = self.run_books()
+
+        self.assertEqual(len(books), 10)
+        self.assertEqual(few, many)
+
+    def test_nested_pagination_applies_per_parent(self) -> None:
+        first, second = create_books(2)
+        first.genres.add(*self.genres)
+        second.genres.add(self.genres[0])
+
+        _, books = self.run_books()
+        self.assertEqual(
+            [book["BookCatalogueGenre"] for book in books],
+            [[{"name": "Test genre 1"}], [{"name": "Test genre 0"}]],
+        )
@@ -0,0 +1,93 @@
+import json
+from typing import Any
+
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.documents import (
+    LRUCache,
+    PersistedQueryError,
+    PersistedQueryRegistry,
+    hash_query,
+)
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    create_books,
+    execute,
+)
+
+ENDPOINT = "/auto-graphql-generated"
+QUERY = "{ BookCatalogueBook { title } }"
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.cache_info(), (1, 1, 2, 2))
+
+
+class PersistedQueryRegistryTests(SimpleTestCase):
+    def test_allowlist_rejects_other_queries(self) -> None:
+        registry = PersistedQueryRegistry(10, {hash_query(QUERY): QUERY})
+        self.assertEqual(registry.resolve(hash_query(QUERY), None), QUERY)
+        for query_hash, query in ((hash_query("{ other }"), None), (hash_query("{ other }"), "{ other }")):
+            with self.assertRaises(PersistedQueryError) as raised:
+                registry.resolve(query_hash, query)
+            self.assertEqual(raised.exception.code, "PERSISTED_QUERY_NOT_ALLOWED")
+
+
+class PersistedQueryViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books(1)
+
+    def post(self, **data: Any) -> Any:
+        return self.client.post(ENDPOINT, json.dumps(data), content_type="application/json").json()
+
+    def test_miss_then_register_then_hit(self) -> None:
+        # each query gets its own hash, so registrations of other tests on the shared endpoint do not interfere
+        query = "query PersistedMiss { BookCatalogueBook { title } }"
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": hash_query(query)}}
+
+        miss = self.post(extensions=extensions)
+        self.assertEqual(miss["errors"][0]["extensions"]["code"], "PERSISTED_QUERY_NOT_FOUND")
+
+        registered = self.post(query=query, extensions=extensions)
+        self.assertIn({"title": "Test book 0"}, registered["data"]["BookCatalogueBook"])
+
+        hit = self.post(extensions=extensions)
+        self.assertEqual(hit["data"], registered["data"])
+
+    def test_hash_mismatch(self) -> None:
+        result = self.post(query=QUERY, extensions={"persistedQuery": {"version": 1, "sha256Hash": "0" * 64}})
+        self.assertEqual(result["errors"][0]["extensions"]["code"], "PERSISTED_QUERY_HASH_MISMATCH")
+
+
+@override_settings(AUTOGRAPHQL_DOCUMENT_CACHE_STATS=True)
+class DocumentCacheTests(TestCase):
+    def test_second_execution_skips_parsing(self) -> None:
+        schema = AsyncAutoGraphQLView.build_schema()
+        hits = []
+        for _ in range(2):
+            result = execute(schema, QUERY)
+            self.assertIsNone(result.errors)
+            assert result.extensions is not None
+            hits.append(result.extensions["documentCache"]["hit"])
+        self.assertEqual(hits, [False, True])
+
+    def test_invalid_document_is_not_cached(self) -> None:
+        schema = AsyncAutoGraphQLView.build_schema()
+        for _ in range(2):
+            result = execute(schema, "{ NoSuchField }")
+            self.assertIsNotNone(result.errors)
+        result = execute(schema, QUERY)
+        assert result.extensions is not None
+        self.assertEqual(result.extensions["documentCache"]["currsize"], 1)
@@ -0,0 +1,59 @@
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.setup import get_endpoints
+from auto_graphql.tests.utils import (
+    create_books,
+    execute,
+)
+
+
+class EndpointSchemaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books(1)
+
+    def test_key_only_relations(self) -> None:
+        schema = AsyncAutoGraphQLView.build_schema(recursive=False)
+        result = execute(
+            schema, '{ BookCatalogueBook(filters: {title: {exact: "Test book 0"}}) { BookCatalogueAuthor { id } } }'
+        )
+        self.assertIsNone(result.errors)
+
+        result = execute(schema, "{ BookCatalogueBook { BookCatalogueAuthor { lastName } } }")
+        assert result.errors is not None
+        self.assertIn("lastName", result.errors[0].message)
+
+    def test_app_schema_has_only_its_models(self) -> None:
+        schema = AsyncAutoGraphQLView.build_schema(AsyncAutoGraphQLView.get_app_models(["blog"]))
+        query_fields = schema._schema.query_type.fields  # type: ignore[union-attr]
+        self.assertFalse([name for name in query_fields if name.startswith("BookCatalogue")])
+        self.assertTrue([name for name in query_fields if name.startswith("Blog")])
+
+
+class EndpointSettingsTests(SimpleTestCase):
+    @override_settings(
+        AUTOGRAPHQL_ENDPOINTS={"graphql/": {"recursive": False, "build": "eager"}, "graphql/blog/": {"apps": ["blog"]}}
+    )
+    def test_endpoints(self) -> None:
+        self.assertEqual(
+            get_endpoints(),
+            {
+                "graphql/": {"app_labels": None, "recursive": False, "build_mode": "eager"},
+                "graphql/blog/": {"app_labels": ["blog"], "recursive": True, "build_mode": "lazy"},
+            },
+        )
+
+    def test_invalid_endpoints(self) -> None:
+        for endpoints in (
+            {"graphql/": {"apps": ["no_such_app"]}},
+            {"graphql/": {"depth": 1}},
+            {"graphql/": {"build": "never"}},
+        ):
+            with self.subTest(endpoints=endpoints), override_settings(AUTOGRAPHQL_ENDPOINTS=endpoints):
+                with self.assertRaises(ValueError):
+                    get_endpoints()
@@ -0,0 +1,60 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import (
+    RequestFactory,
+    TestCase,
+)
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import create_books
+from book_catalogue.models import Book
+
+FILTERS = json.dumps({"title": {"startsWith": "Test book"}})
+
+
+class ExportTests(TestCase):
+    books: list[Book]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.books = create_books(3)
+
+    def export(self, **params: str) -> tuple[int, bytes]:
+        request = RequestFactory().get("/export", params)
+        response = async_to_sync(AsyncAutoGraphQLView.as_view())(request, export_field="BookCatalogueBook")
+        if response.streaming:
+            return response.status_code, b"".join(response.streaming_content)
+        return response.status_code, response.content
+
+    def test_view_streams_filtered_ordered_rows(self) -> None:
+        status, content = self.export(filters=FILTERS, order=json.dumps({"id": "DESC"}))
+        self.assertEqual(status, 200)
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row["title"] for row in rows], ["Test book 2", "Test book 1", "Test book 0"])
+        self.assertEqual(rows[0]["author_id"], self.books[0].author_id)
+
+    def test_view_rejects_unknown_filter(self) -> None:
+        status, _ = self.export(filters=json.dumps({"noSuchField": {"exact": 1}}))
+        self.assertEqual(status, 400)
+
+    def test_command_writes_compressed_csv(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "books.csv.gz")
+            stderr = io.StringIO()
+            call_command(
+                "export_model",
+                "book_catalogue.Book",
+                *("--format", "csv", "--gzip", "--filters", FILTERS, "--output", path),
+                stderr=stderr,
+            )
+            with gzip.open(path, "rt", newline="") as export_file:
+                rows = list(csv.DictReader(export_file))
+        self.assertEqual([row["title"] for row in rows], [f"Test book {i}" for i in range(3)])
+        self.assertIn("book_catalogue.Book: 3 rows", stderr.getvalue())
@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.test import (
+    TestCase,
+    override_settings,
+)
+from strawberry.types import ExecutionResult
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    create_books,
+    execute,
+)
+from book_catalogue.models import Book
+
+FLAT = """
+{
+  BookCatalogueBook(
+    filters: {title: {startsWith: "Test book"}}, order: {id: DESC}, pagination: {offset: 1, limit: 2}
+  ) {
+    __typename
+    id
+    name: title
+    publishDate
+  }
+}
+"""
+
+
+class ScalarFastPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books(4)
+
+    def run_flat(self) -> tuple[ExecutionResult, int]:
+        schema = AsyncAutoGraphQLView.build_schema()
+        with mock.patch.object(Book, "from_db", wraps=Book.from_db) as from_db:
+            result = execute(schema, FLAT)
+        self.assertIsNone(result.errors)
+        return result, from_db.call_count
+
+    def test_same_response_without_model_instances(self) -> None:
+        with override_settings(AUTOGRAPHQL_SCALAR_FAST_PATH=False):
+            expected, resolved_instances = self.run_flat()
+        result, instances = self.run_flat()
+
+        assert result.data is not None
+        self.assertEqual(result.data, expected.data)
+        self.assertEqual([book["name"] for book in result.data["BookCatalogueBook"]], ["Test book 2", "Test book 1"])
+        self.assertEqual((resolved_instances, instances), (2, 0))
+
+    def test_relations_take_the_regular_path(self) -> None:
+        schema = AsyncAutoGraphQLView.build_schema()
+        with mock.patch.object(Book, "from_db", wraps=Book.from_db) as from_db:
+            result = execute(schema, FLAT.replace("publishDate", "publishDate BookCatalogueAuthor { lastName }"))
+        self.assertIsNone(result.errors)
+        self.assertEqual(from_db.call_count, 2)
@@ -0,0 +1,65 @@
+from django.test import (
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    create_books,
+    execute,
+)
+
+SCAN = '{ BookCatalogueBook(filters: {title: {startsWith: "Test"}}) { title } }'
+
+
+@override_settings(AUTOGRAPHQL_FILTER_SCAN_MAX_ROWS=5)
+class FilterPlannerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books(10)
+
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+
+    def test_unindexed_filter_on_large_table_is_rejected(self) -> None:
+        result = execute(self.schema, SCAN)
+        assert result.errors is not None and result.errors[0].extensions is not None
+        self.assertEqual(result.errors[0].extensions["code"], "FILTER_NOT_INDEXED")
+        self.assertIn("exact", result.errors[0].extensions["cheapFilters"]["id"])
+
+    def test_indexed_lookup_makes_the_filter_pass(self) -> None:
+        result = execute(
+            self.schema, '{ BookCatalogueBook(filters: {title: {startsWith: "Test"}, id: {gt: 0}}) { title } }'
+        )
+        self.assertIsNone(result.errors)
+
+    def test_or_branch_cannot_use_an_index(self) -> None:
+        result = execute(
+            self.schema,
+            '{ BookCatalogueBook(filters: {title: {startsWith: "Test"}, OR: {id: {exact: 1}}}) { title } }',
+        )
+        assert result.errors is not None and result.errors[0].extensions is not None
+        self.assertEqual(result.errors[0].extensions["code"], "FILTER_NOT_INDEXED")
+
+    @override_settings(AUTOGRAPHQL_FILTER_SCAN_MAX_ROWS=None)
+    def test_check_can_be_disabled(self) -> None:
+        self.assertIsNone(execute(self.schema, SCAN).errors)
+
+
+@override_settings(
+    AUTOGRAPHQL_FILTER_SCAN_MAX_ROWS=None,
+    AUTOGRAPHQL_FILTER_LOOKUPS={"book_catalogue.Book": {"summary": [], "title": ["exact", "startsWith"]}},
+)
+class FilterLookupsTests(TestCase):
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+
+    def test_allowed_lookup(self) -> None:
+        self.assertIsNone(execute(self.schema, SCAN).errors)
+
+    def test_other_lookups_and_fields_are_not_in_the_schema(self) -> None:
+        for filters in ('{title: {iContains: "Test"}}', '{summary: {exact: "Test"}}'):
+            with self.subTest(filters=filters):
+                result = execute(self.schema, f"{{ BookCatalogueBook(filters: {filters}) {{ title }} }}")
+                assert result.errors is not None
+                self.assertIn("is not defined by type", result.errors[0].message)
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.test import (
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.instrumentation import (
+    InstrumentationExtension,
+    OperationLabels,
+)
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.metrics import MetricsRegistry
+from auto_graphql.tests.utils import (
+    create_books,
+    execute,
+)
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self) -> None:
+        self.metrics = MetricsRegistry()
+        for attribute, value in (("metrics", self.metrics), ("operation_labels", OperationLabels())):
+            patcher = mock.patch.object(InstrumentationExtension, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.schema = AsyncAutoGraphQLView.build_schema()
+
+    def get_operations(self) -> set[str]:
+        return {
+            counter["labels"]["operation"]
+            for counter in self.metrics.snapshot()["counters"]
+            if counter["name"] == "graphql_operations_total"
+        }
+
+    def test_counts_sql_queries(self) -> None:
+        create_books(2)
+        execute(self.schema, "query Books { BookCatalogueBook { title } }")
+        (summary,) = [s for s in self.metrics.snapshot()["summaries"] if s["name"] == "graphql_operation_sql_queries"]
+        self.assertEqual(summary["labels"], {"operation": "Books"})
+        self.assertGreaterEqual(summary["sum"], 1)
+
+    @override_settings(AUTOGRAPHQL_METRICS_MAX_OPERATIONS=2)
+    def test_operation_names_are_capped(self) -> None:
+        for index in range(5):
+            execute(self.schema, "query Q%d { BookCatalogueGenre { name } }" % index)
+        execute(self.schema, "{ BookCatalogueGenre { name } }")
+        self.assertEqual(self.get_operations(), {"Q0", "Q1", "other", "anonymous"})
+
+    @override_settings(AUTOGRAPHQL_METRICS_OPERATIONS=["Known"])
+    def test_operation_allowlist(self) -> None:
+        execute(self.schema, "query Known { BookCatalogueGenre { name } }")
+        execute(self.schema, "query Unknown { BookCatalogueGenre { name } }")
+        self.assertEqual(self.get_operations(), {"Known", "other"})
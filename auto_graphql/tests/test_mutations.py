@@ -0,0 +1,117 @@
+from typing import Any
+
+from django.contrib.auth.models import (
+    Permission,
+    User,
+)
+from django.test import (
+    RequestFactory,
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    ALLOW_MUTATIONS,
+    create_books,
+    create_genres,
+    execute,
+)
+from book_catalogue.models import Book
+
+CREATE = "mutation($data: [BookCatalogueBookCreateInput!]!) { BookCatalogueBookCreate(data: $data) { id title } }"
+UPDATE = "mutation($data: [BookCatalogueBookUpdateInput!]!) { BookCatalogueBookUpdate(data: $data) { id title } }"
+
+
+@override_settings(AUTOGRAPHQL_MUTATIONS=True, AUTOGRAPHQL_MUTATION_PERMISSION=ALLOW_MUTATIONS)
+class BulkMutationTests(TestCase):
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+        self.books = create_books(2)
+        self.genres = create_genres(2)
+
+    def new_book(self, **values: Any) -> dict[str, Any]:
+        return {
+            "title": "New",
+            "summary": "Summary",
+            "publishDate": "2020-01-01",
+            "authorId": str(self.books[0].author_id),
+            **values,
+        }
+
+    def assertUserInputError(self, result: Any, index: int, field: str) -> None:
+        self.assertIsNone(result.data)
+        self.assertEqual(result.errors[0].extensions["code"], "BAD_USER_INPUT")
+        self.assertEqual(result.errors[0].extensions["index"], index)
+        self.assertIn(field, result.errors[0].extensions["fields"])
+
+    def test_create_update_delete(self) -> None:
+        result = execute(self.schema, CREATE, {"data": [self.new_book(genres=[str(self.genres[0].pk)])] * 3})
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        created = [int(book["id"]) for book in result.data["BookCatalogueBookCreate"]]
+        self.assertEqual(Book.objects.filter(pk__in=created, genres=self.genres[0]).count(), 3)
+
+        result = execute(self.schema, UPDATE, {"data": [{"id": str(created[0]), "genres": [], "title": "Renamed"}]})
+        self.assertIsNone(result.errors)
+        self.assertEqual(Book.objects.get(pk=created[0]).title, "Renamed")
+        self.assertFalse(Book.objects.get(pk=created[0]).genres.exists())
+
+        result = execute(self.schema, "mutation($ids: [ID!]!) { BookCatalogueBookDelete(ids: $ids) }", {"ids": created})
+        self.assertEqual(result.data, {"BookCatalogueBookDelete": 3})
+        self.assertFalse(Book.objects.filter(pk__in=created).exists())
+
+    def test_unknown_foreign_key_is_user_input_error(self) -> None:
+        result = execute(self.schema, CREATE, {"data": [self.new_book(), self.new_book(authorId="999999")]})
+        self.assertUserInputError(result, 1, "author")
+        self.assertFalse(Book.objects.filter(title="New").exists())
+
+        result = execute(self.schema, UPDATE, {"data": [{"id": str(self.books[0].pk), "publisherId": "999999"}]})
+        self.assertUserInputError(result, 0, "publisher")
+
+    def test_unknown_m2m_id_is_user_input_error(self) -> None:
+        result = execute(self.schema, CREATE, {"data": [self.new_book(genres=[str(self.genres[0].pk), "999999"])]})
+        self.assertUserInputError(result, 0, "genres")
+        result = execute(self.schema, CREATE, {"data": [self.new_book(genres=["not an id"])]})
+        self.assertUserInputError(result, 0, "genres")
+
+    def test_invalid_value_is_user_input_error(self) -> None:
+        result = execute(self.schema, CREATE, {"data": [self.new_book(title="x" * 300)]})
+        self.assertUserInputError(result, 0, "title")
+
+    @override_settings(AUTOGRAPHQL_BULK_MAX_SIZE=2)
+    def test_too_many_items(self) -> None:
+        result = execute(self.schema, CREATE, {"data": [self.new_book()] * 3})
+        assert result.errors is not None
+        self.assertEqual(result.errors[0].extensions, {"code": "BULK_TOO_LARGE"})
+
+
+@override_settings(AUTOGRAPHQL_MUTATIONS=True)
+class MutationPermissionTests(TestCase):
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+        self.books = create_books(1)
+        self.user = User.objects.create_user("editor")
+
+    def delete(self) -> Any:
+        request = RequestFactory().post("/")
+        setattr(request, "user", self.user)
+        return execute(
+            self.schema,
+            "mutation($ids: [ID!]!) { BookCatalogueBookDelete(ids: $ids) }",
+            {"ids": [self.books[0].pk]},
+            request,
+        )
+
+    def test_denied_without_model_permission(self) -> None:
+        result = self.delete()
+        self.assertIsNone(result.data)
+        self.assertEqual(result.errors[0].extensions, {"code": "FORBIDDEN"})
+        self.assertTrue(Book.objects.filter(pk=self.books[0].pk).exists())
+
+    def test_allowed_with_model_permission(self) -> None:
+        self.user.user_permissions.add(
+            Permission.objects.get(codename="delete_book", content_type__app_label="book_catalogue")
+        )
+        result = self.delete()
+        self.assertEqual(result.data, {"BookCatalogueBookDelete": 1})
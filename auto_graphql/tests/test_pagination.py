@@ -0,0 +1,75 @@
+from typing import (
+    Any,
+    Optional,
+)
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    create_books,
+    execute,
+)
+
+PAGE = """
+query($after: String, $order: BookCatalogueBookOrders = {publishDate: DESC}) {
+  BookCatalogueBookConnection(
+    first: 2, after: $after, order: $order, filters: {title: {startsWith: "Test book"}}
+  ) {
+    edges { cursor node { title } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books(5)
+
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+
+    def page(self, after: Optional[str], order: Optional[dict[str, str]] = None) -> dict[str, Any]:
+        result = execute(self.schema, PAGE, {"after": after, **({"order": order} if order else {})})
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        connection: dict[str, Any] = result.data["BookCatalogueBookConnection"]
+        return connection
+
+    def test_cursor_round_trip_visits_every_row_once(self) -> None:
+        titles: list[str] = []
+        has_next = []
+        after = None
+        for _ in range(3):
+            connection = self.page(after)
+            titles += [edge["node"]["title"] for edge in connection["edges"]]
+            has_next.append(connection["pageInfo"]["hasNextPage"])
+            after = connection["pageInfo"]["endCursor"]
+            self.assertEqual(after, connection["edges"][-1]["cursor"])
+
+        # equal publish dates are ordered by pk
+        self.assertEqual(titles, [f"Test book {i}" for i in range(5)])
+        self.assertEqual(has_next, [True, True, False])
+
+    def test_same_direction_seeks_with_a_row_value(self) -> None:
+        for order, expected in (
+            ({"publishDate": "ASC"}, [f"Test book {i}" for i in range(5)]),
+            ({"publishDate": "DESC", "id": "DESC"}, [f"Test book {i}" for i in reversed(range(5))]),
+        ):
+            with self.subTest(order=order):
+                first_page = self.page(None, order)
+                with CaptureQueriesContext(connection) as queries:
+                    second_page = self.page(first_page["pageInfo"]["endCursor"], order)
+                titles = [edge["node"]["title"] for edge in first_page["edges"] + second_page["edges"]]
+                self.assertEqual(titles, expected[:4])
+                operator = "<" if "DESC" in order.values() else ">"
+                self.assertTrue([query for query in queries.captured_queries if f") {operator} (" in query["sql"]])
+
+    def test_invalid_cursor(self) -> None:
+        result = execute(self.schema, PAGE, {"after": "not a cursor"})
+        assert result.errors is not None
+        self.assertIn("Invalid cursor", result.errors[0].message)
@@ -0,0 +1,66 @@
+import json
+
+from django.core.cache import cache
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.response_cache import ResponseSizes
+from auto_graphql.tests.utils import (
+    create_books,
+    create_genres,
+    execute,
+)
+
+BOOKS = '{ BookCatalogueBook(filters: {title: {startsWith: "Test book"}}) { title } }'
+
+
+@override_settings(AUTOGRAPHQL_RESPONSE_CACHE="default")
+class ResponseCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.schema = AsyncAutoGraphQLView.build_schema()
+        (self.book,) = create_books(1)
+
+    def run_books(self) -> tuple[bool, list[str]]:
+        result = execute(self.schema, BOOKS)
+        self.assertIsNone(result.errors)
+        assert result.data is not None and result.extensions is not None
+        return result.extensions["responseCache"]["hit"], [book["title"] for book in result.data["BookCatalogueBook"]]
+
+    def test_repeated_query_is_served_from_cache(self) -> None:
+        self.assertEqual(self.run_books(), (False, ["Test book 0"]))
+        self.assertEqual(self.run_books(), (True, ["Test book 0"]))
+
+    def test_write_to_selected_model_invalidates(self) -> None:
+        self.run_books()
+        self.book.title = "Test book changed"
+        self.book.save()
+        self.assertEqual(self.run_books(), (False, ["Test book changed"]))
+
+    def test_total_size_evicts_oldest_responses(self) -> None:
+        books_size = len(json.dumps({"BookCatalogueBook": [{"title": "Test book 0"}]}))
+        with override_settings(AUTOGRAPHQL_RESPONSE_CACHE_MAX_SIZE=books_size):
+            self.run_books()
+            self.assertEqual(self.run_books(), (True, ["Test book 0"]))
+            self.assertIsNone(execute(self.schema, "{ BookCatalogueGenre { id } }").errors)
+            self.assertEqual(self.run_books(), (False, ["Test book 0"]))
+
+    def test_write_to_other_model_keeps_entry(self) -> None:
+        self.run_books()
+        create_genres(1)
+        self.assertEqual(self.run_books(), (True, ["Test book 0"]))
+
+
+class ResponseSizesTests(SimpleTestCase):
+    def test_oldest_keys_are_evicted_first(self) -> None:
+        sizes = ResponseSizes()
+        self.assertEqual(sizes.add("a", 4, 10), [])
+        self.assertEqual(sizes.add("b", 4, 10), [])
+        # storing a key again makes it the newest
+        self.assertEqual(sizes.add("a", 4, 10), [])
+        self.assertEqual(sizes.add("c", 4, 10), ["b"])
+        self.assertEqual((list(sizes.sizes), sizes.total), (["a", "c"], 8))
@@ -0,0 +1,93 @@
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpRequest
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.routing import (
+    configure_read_connections,
+    get_client_key,
+)
+from auto_graphql.tests.utils import (
+    ALLOW_MUTATIONS,
+    create_books,
+    execute,
+)
+from book_catalogue.models import Book
+
+BOOKS = "{ BookCatalogueBook { title } }"
+UPDATE = "mutation($data: [BookCatalogueBookUpdateInput!]!) { BookCatalogueBookUpdate(data: $data) { id } }"
+
+
+def client_request(client: Optional[str] = None) -> HttpRequest:
+    return RequestFactory().post("/", HTTP_X_CLIENT=client) if client else RequestFactory().post("/")
+
+
+@override_settings(AUTOGRAPHQL_READ_PIN_HEADER="X-Client")
+class ClientKeyTests(SimpleTestCase):
+    def test_header(self) -> None:
+        self.assertEqual(get_client_key(client_request("a")), "header:a")
+
+    def test_address_alone_does_not_identify_a_client(self) -> None:
+        self.assertEqual(client_request().META["REMOTE_ADDR"], "127.0.0.1")
+        self.assertIsNone(get_client_key(client_request()))
+
+
+@override_settings(
+    DATABASE_ROUTERS=["auto_graphql.routing.ReadReplicaRouter"],
+    AUTOGRAPHQL_READ_DATABASES=["replica"],
+    AUTOGRAPHQL_READ_PIN_HEADER="X-Client",
+    AUTOGRAPHQL_MUTATIONS=True,
+    AUTOGRAPHQL_MUTATION_PERMISSION=ALLOW_MUTATIONS,
+)
+class ReadReplicaTests(TestCase):
+    """The default and replica aliases are two SQLite files that do not replicate, so reads show where they ran."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        cache.clear()
+        connection_settings = connections.settings["replica"]
+        self.addCleanup(connection_settings.update, dict(connection_settings))
+        self.schema = AsyncAutoGraphQLView.build_schema()
+        (self.book,) = create_books(1)
+
+    def titles(self, client: Optional[str] = None) -> list[str]:
+        result = execute(self.schema, BOOKS, request=client_request(client))
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        return [book["title"] for book in result.data["BookCatalogueBook"]]
+
+    def test_writes_go_to_primary_and_reads_to_replica(self) -> None:
+        self.assertTrue(Book.objects.using("default").filter(pk=self.book.pk).exists())
+        self.assertEqual(self.titles("a"), [])
+
+    def test_writer_is_pinned_to_primary(self) -> None:
+        data = [{"id": str(self.book.pk), "title": "Edited"}]
+        result = execute(self.schema, UPDATE, {"data": data}, request=client_request("a"))
+        self.assertIsNone(result.errors)
+
+        self.assertIn("Edited", self.titles("a"))
+        self.assertEqual(self.titles("b"), [])
+
+    def test_anonymous_writer_is_not_pinned(self) -> None:
+        data = [{"id": str(self.book.pk), "title": "Edited"}]
+        self.assertIsNone(execute(self.schema, UPDATE, {"data": data}, request=client_request()).errors)
+
+        self.assertEqual(self.titles(), [])
+
+    def test_replica_connections_persist(self) -> None:
+        self.assertEqual(connections.settings["replica"]["CONN_MAX_AGE"], 60)
+        self.assertTrue(connections.settings["replica"]["CONN_HEALTH_CHECKS"])
+
+    def test_configured_connection_age_is_kept(self) -> None:
+        connections.settings["replica"]["CONN_MAX_AGE"] = 5
+        configure_read_connections(["replica"])
+        self.assertEqual(connections.settings["replica"]["CONN_MAX_AGE"], 5)
@@ -0,0 +1,52 @@
+from typing import Any
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    override_settings,
+)
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+
+
+async def inner_view(request: Any, *args: Any, **kwargs: Any) -> HttpResponse:
+    return HttpResponse("built")
+
+
+class SchemaBuildTests(SimpleTestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(AsyncAutoGraphQLView, "build_view", return_value=inner_view)
+        self.build_view = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_eager_by_default(self) -> None:
+        AsyncAutoGraphQLView.as_view()
+        self.build_view.assert_called_once()
+
+    @override_settings(AUTOGRAPHQL_SCHEMA_BUILD="lazy")
+    def test_lazy_builds_on_first_request_once(self) -> None:
+        view = AsyncAutoGraphQLView.as_view()
+        self.build_view.assert_not_called()
+        for _ in range(2):
+            response = async_to_sync(view)(RequestFactory().get("/"))
+            self.assertEqual(response.content, b"built")
+        self.build_view.assert_called_once()
+
+    def test_build_mode_overrides_setting(self) -> None:
+        AsyncAutoGraphQLView.as_view(["blog"], build_mode="lazy")
+        self.build_view.assert_not_called()
+
+    @override_settings(AUTOGRAPHQL_SCHEMA_BUILD="preload")
+    def test_preload_builds_then_prepares_fork(self) -> None:
+        with mock.patch("auto_graphql.mapper.prepare_fork") as prepare_fork:
+            AsyncAutoGraphQLView.as_view()
+        self.build_view.assert_called_once()
+        prepare_fork.assert_called_once()
+
+    @override_settings(AUTOGRAPHQL_SCHEMA_BUILD="sometimes")
+    def test_unknown_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            AsyncAutoGraphQLView.as_view()
@@ -0,0 +1,58 @@
+from django.test import (
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.mapper import AsyncAutoGraphQLView
+from auto_graphql.tests.utils import (
+    create_books,
+    execute,
+)
+from book_catalogue.models import Book
+
+SEARCH = "query($search: String!) { BookCatalogueBook(filters: {search: $search}) { title } }"
+
+
+class SearchTests(TestCase):
+    books: list[Book]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.books = create_books(3)
+        for book, summary in zip(
+            cls.books,
+            [
+                "A fox jumps over the long list of words that says nothing in particular about anything",
+                "Fox jumps, foxes jumped",
+                "Nothing to see",
+            ],
+        ):
+            book.summary = summary
+            book.save()
+
+    def setUp(self) -> None:
+        self.schema = AsyncAutoGraphQLView.build_schema()
+
+    def search(self, text: str) -> list[str]:
+        result = execute(self.schema, SEARCH, {"search": text})
+        self.assertIsNone(result.errors)
+        assert result.data is not None
+        return [book["title"] for book in result.data["BookCatalogueBook"]]
+
+    def test_every_word_matches_stemmed_and_ranked(self) -> None:
+        # bm25 ranks the short summary that repeats both words above the earlier row
+        self.assertEqual(self.search("foxes jump"), ["Test book 1", "Test book 0"])
+        self.assertEqual(self.search("fox see"), [])
+
+    def test_queryset_update_reaches_the_index(self) -> None:
+        Book.objects.filter(pk=self.books[2].pk).update(summary="A fox at last")
+        self.assertIn("Test book 2", self.search("fox"))
+        Book.objects.filter(pk=self.books[2].pk).delete()
+        self.assertNotIn("Test book 2", self.search("fox"))
+
+    def test_operators_are_searched_as_words(self) -> None:
+        self.assertEqual(self.search('fox OR "nothing" NEAR(see) *'), [])
+
+    @override_settings(AUTOGRAPHQL_FILTER_SCAN_MAX_ROWS=1)
+    def test_search_counts_as_indexed_filter(self) -> None:
+        self.assertEqual(len(self.search("fox")), 2)
@@ -0,0 +1,66 @@
+import os
+import tempfile
+
+from django.db import (
+    OperationalError,
+    connections,
+)
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import (
+    SimpleTestCase,
+    override_settings,
+)
+
+from auto_graphql.sqlite_profile import (
+    configure_sqlite_connection,
+    current_query_only,
+    get_sqlite_pragmas,
+)
+
+
+class SqlitePragmasTests(SimpleTestCase):
+    @override_settings(AUTOGRAPHQL_SQLITE_PRAGMAS={"synchronous": "FULL", "mmap_size": None})
+    def test_overrides(self) -> None:
+        pragmas = get_sqlite_pragmas()
+        self.assertEqual(pragmas["synchronous"], "FULL")
+        self.assertNotIn("mmap_size", pragmas)
+        self.assertEqual(pragmas["journal_mode"], "WAL")
+
+    @override_settings(AUTOGRAPHQL_SQLITE_PRAGMAS={"journal_mode": "WAL; DROP TABLE x"})
+    def test_rejects_injected_values(self) -> None:
+        with self.assertRaises(ValueError):
+            get_sqlite_pragmas()
+
+
+class SqliteConnectionTests(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.connection = DatabaseWrapper(
+            {**connections["default"].settings_dict, "NAME": os.path.join(directory.name, "profile.sqlite3")},
+            alias="sqlite_profile",
+        )
+        self.addCleanup(self.connection.close)
+        self.connection.ensure_connection()
+        configure_sqlite_connection(self.connection)
+
+    def test_pragmas_and_connection_reuse(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone(), ("wal",))
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone(), (5000,))
+        # CONN_MAX_AGE = 0 would close it after the request
+        self.assertIsNotNone(self.connection.close_at)
+
+    def test_query_only_blocks_writes(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE row (id INTEGER)")
+            token = current_query_only.set(True)
+            try:
+                cursor.execute("SELECT COUNT(*) FROM row")
+                with self.assertRaises(OperationalError):
+                    cursor.execute("INSERT INTO row VALUES (1)")
+            finally:
+                current_query_only.reset(token)
+            cursor.execute("INSERT INTO row VALUES (1)")
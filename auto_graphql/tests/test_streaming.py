@@ -0,0 +1,58 @@
+import json
+from typing import Any
+from unittest import mock
+
+from django.test import (
+    TestCase,
+    override_settings,
+)
+
+from auto_graphql.complexity import QueryCostEstimator
+from auto_graphql.tests.utils import create_books
+
+ENDPOINT = "/auto-graphql-generated"
+BOOKS = '{ BookCatalogueBook(filters: {title: {startsWith: "Test book"}}) { title } }'
+
+
+@override_settings(AUTOGRAPHQL_STREAMING=True)
+class StreamingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_books(5)
+
+    def stream(self) -> list[dict[str, Any]]:
+        response = self.client.post(
+            ENDPOINT, json.dumps({"query": BOOKS}), content_type="application/json", HTTP_ACCEPT="application/x-ndjson"
+        )
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]  # type: ignore
+
+    @override_settings(AUTOGRAPHQL_STREAM_CHUNK_SIZE=2)
+    def test_list_is_streamed_in_chunks(self) -> None:
+        parts = self.stream()
+
+        self.assertEqual(parts[0], {"data": {"BookCatalogueBook": []}, "hasNext": True})
+        self.assertEqual(parts[-1], {"hasNext": False})
+        items = [part["incremental"][0] for part in parts[1:-1]]
+        self.assertEqual([len(item["items"]) for item in items], [2, 2, 1])
+        self.assertEqual([item["path"] for item in items], [["BookCatalogueBook", i] for i in (0, 2, 4)])
+        self.assertEqual(
+            [book["title"] for item in items for book in item["items"]], [f"Test book {i}" for i in range(5)]
+        )
+
+    @override_settings(AUTOGRAPHQL_STREAM_CHUNK_SIZE=2)
+    def test_operation_is_checked_once_per_stream(self) -> None:
+        with mock.patch.object(
+            QueryCostEstimator, "estimate_operation", autospec=True, side_effect=QueryCostEstimator.estimate_operation
+        ) as estimate_operation:
+            parts = self.stream()
+        self.assertEqual(len(parts), 5)
+        estimate_operation.assert_called_once()
+
+    @override_settings(AUTOGRAPHQL_STREAMING=False)
+    def test_streaming_is_opt_in(self) -> None:
+        response = self.client.post(
+            ENDPOINT, json.dumps({"query": BOOKS}), content_type="application/json", HTTP_ACCEPT="application/x-ndjson"
+        )
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(len(response.json()["data"]["BookCatalogueBook"]), 5)
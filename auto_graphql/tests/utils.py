@@ -0,0 +1,60 @@
+import datetime
+from typing import (
+    Any,
+    Optional,
+)
+
+import strawberry
+from asgiref.sync import async_to_sync
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+)
+from django.test import RequestFactory
+from strawberry.types import ExecutionResult
+
+from auto_graphql.context import AutoGraphQLContext
+from book_catalogue.models import (
+    Author,
+    Book,
+    Genre,
+)
+
+# AUTOGRAPHQL_MUTATION_PERMISSION for tests whose requests have no user
+ALLOW_MUTATIONS = "auto_graphql.tests.utils.allow_mutations"
+
+
+def allow_mutations(request: HttpRequest, model: Any, action: str) -> bool:
+    return True
+
+
+def execute(
+    schema: strawberry.Schema,
+    query: str,
+    variables: Optional[dict[str, Any]] = None,
+    request: Optional[HttpRequest] = None,
+) -> ExecutionResult:
+    """Run an operation the way the view does, resolvers on the calling thread and its test transaction."""
+
+    context = AutoGraphQLContext(request=request or RequestFactory().post("/"), response=HttpResponse())
+    return async_to_sync(schema.execute)(query, variable_values=variables, context_value=context)
+
+
+def create_books(count: int, **values: Any) -> list[Book]:
+    author = Author.objects.create(first_name="Test", last_name="Author", date_of_birth=datetime.date(1950, 1, 1))
+    return [
+        Book.objects.create(
+            **{
+                "title": f"Test book {i}",
+                "summary": f"Summary {i}",
+                "author": author,
+                "publish_date": datetime.date(2000, 1, 1),
+                **values,
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def create_genres(count: int) -> list[Genre]:
+    return [Genre.objects.create(name=f"Test genre {i}") for i in range(count)]
@@ -0,0 +1,310 @@
+import asyncio
+import json
+import threading
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    cast,
+)
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from graphql import GraphQLError
+from graphql import OperationType as GraphQLOperationType
+from graphql import parse
+from graphql.utilities import get_operation_ast
+from strawberry import Schema
+from strawberry.django.views import AsyncGraphQLView
+from strawberry.exceptions import MissingQueryError
+from strawberry.http import GraphQLRequestData
+from strawberry.http.async_base_view import AsyncHTTPRequestAdapter
+from strawberry.http.exceptions import HTTPException
+from strawberry.schema.exceptions import InvalidOperationTypeError
+from strawberry.types import ExecutionResult
+from strawberry.types.graphql import OperationType
+
+from .conf import get_setting
+from .context import AutoGraphQLContext
+from .documents import (
+    PersistedQueryError,
+    PersistedQueryRegistry,
+)
+from .export import (
+    ExportEncoder,
+    ExportError,
+    aiter_export,
+    get_export_columns,
+    iter_export,
+    plan_export,
+)
+from .streaming import (
+    MULTIPART,
+    NDJSON,
+    ResultStream,
+    StreamRoot,
+)
+
+
+class LazyView:
+    """Build the wrapped view on first request or in a background thread."""
+
+    def __init__(self, build_view: Callable[[], Callable[..., Any]]) -> None:
+        self._build_view = build_view
+        self._view: Optional[Callable[..., Any]] = None
+        self._lock = threading.Lock()
+
+    def get_view(self) -> Callable[..., Any]:
+        if self._view is None:
+            with self._lock:
+                if self._view is None:
+                    self._view = self._build_view()
+        return self._view
+
+    def start_background_build(self) -> None:
+        threading.Thread(target=self.get_view, name="autographql-schema-build", daemon=True).start()
+
+    def as_view(self) -> Callable[..., Any]:
+        async def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+            inner_view = self._view
+            if inner_view is None:
+                inner_view = await sync_to_async(self.get_view, thread_sensitive=False)()
+            return cast(HttpResponse, await inner_view(request, *args, **kwargs))
+
+        # csrf_exempt() of Django 4.2 would hide that the view is async
+        setattr(view, "csrf_exempt", True)
+        return view
+
+
+class AutoGraphQLView(AsyncGraphQLView[Any, Any]):
+    persisted_queries: Optional[PersistedQueryRegistry] = None
+
+    async def get_context(self, request: HttpRequest, response: HttpResponse) -> AutoGraphQLContext:
+        return AutoGraphQLContext(request=request, response=response)
+
+    async def get_request_payload(self, request: AsyncHTTPRequestAdapter) -> dict[str, Any]:
+        content_type = request.content_type or ""
+
+        if "application/json" in content_type:
+            data: Any = self.parse_json(await request.get_body())
+        elif content_type.startswith("multipart/form-data"):
+            data = await self.parse_multipart(request)
+        elif request.method == "GET":
+            data = self.parse_query_params(request.query_params)
+        else:
+            raise HTTPException(400, "Unsupported content type")
+
+        if not isinstance(data, dict):
+            raise HTTPException(400, "GraphQL request body must be a JSON object")
+        return data
+
+    def resolve_request_data(self, data: dict[str, Any]) -> GraphQLRequestData:
+        """Build request data, replacing persisted query hashes with query text."""
+
+        request_data = GraphQLRequestData(
+            query=data.get("query"),
+            variables=data.get("variables"),
+            operation_name=data.get("operationName"),
+        )
+        if self.persisted_queries is None:
+            return request_data
+
+        extensions = data.get("extensions") or {}
+        if isinstance(extensions, str):
+            extensions = self.parse_json(extensions)
+        persisted_query = extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+
+        if isinstance(persisted_query, dict):
+            request_data.query = self.persisted_queries.resolve(persisted_query.get("sha256Hash"), request_data.query)
+        elif request_data.query is not None:
+            self.persisted_queries.check_allowed(request_data.query)
+        return request_data
+
+    async def execute_request_data(
+        self,
+        request_data: GraphQLRequestData,
+        method: str,
+        context: Any,
+        root_value: Any,
+    ) -> ExecutionResult:
+        allowed_operation_types = OperationType.from_http(method)  # type: ignore
+
+        if not self.allow_queries_via_get and method == "GET":
+            allowed_operation_types = allowed_operation_types - {OperationType.QUERY}
+
+        return await self.schema.execute(
+            request_data.query,
+            root_value=root_value,
+            variable_values=request_data.variables,
+            context_value=context,
+            operation_name=request_data.operation_name,
+            allowed_operation_types=allowed_operation_types,
+        )
+
+    async def get_request_data(self, request_adapter: AsyncHTTPRequestAdapter) -> GraphQLRequestData:
+        try:
+            data = await self.get_request_payload(request_adapter)
+        except json.decoder.JSONDecodeError as e:
+            raise HTTPException(400, "Unable to parse request body as JSON") from e
+        except KeyError as e:
+            raise HTTPException(400, "File(s) missing in form data") from e
+        return self.resolve_request_data(data)
+
+    async def execute_operation(self, request: HttpRequest, context: Any, root_value: Any) -> ExecutionResult:
+        request_adapter = self.request_adapter_class(request)
+
+        try:
+            request_data = await self.get_request_data(request_adapter)
+        except PersistedQueryError as e:
+            return ExecutionResult(data=None, errors=[GraphQLError(str(e), extensions={"code": e.code})])
+
+        return await self.execute_request_data(request_data, request_adapter.method, context, root_value)
+
+    async def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:  # type: ignore[override]
+        try:
+            if "export_field" in kwargs:
+                return await self.export_response(request, kwargs["export_field"])
+            if self.is_batch_request(request):
+                return await self.execute_batch(request)
+            stream_format = self.get_stream_format(request)
+            response = await self.stream_response(request, stream_format) if stream_format is not None else None
+        except HTTPException as e:
+            return HttpResponse(content=e.reason, status=e.status_code)
+        if response is not None:
+            return response
+        return await super().dispatch(request, *args, **kwargs)
+
+    @staticmethod
+    def is_batch_request(request: HttpRequest) -> bool:
+        return (
+            request.method == "POST"
+            and "application/json" in (request.content_type or "")
+            and request.body.lstrip()[:1] == b"["
+        )
+
+    async def execute_batch(self, request: HttpRequest) -> HttpResponse:
+        """Run a JSON array of operations concurrently with one context, so DataLoaders are shared."""
+
+        max_size = get_setting("AUTOGRAPHQL_BATCH_MAX_SIZE", 10, int)
+        if max_size <= 0:
+            raise HTTPException(400, "Batched operations are disabled")
+        try:
+            operations: Any = self.parse_json(request.body)
+        except json.decoder.JSONDecodeError as e:
+            raise HTTPException(400, "Unable to parse request body as JSON") from e
+        if not 0 < len(operations) <= max_size:
+            raise HTTPException(400, f"Batch must contain between 1 and {max_size} operations")
+        if not all(isinstance(operation, dict) for operation in operations):
+            raise HTTPException(400, "Every batched operation must be a JSON object")
+
+        sub_response = await self.get_sub_response(request)
+        context = await self.get_context(request, response=sub_response)
+        root_value = await self.get_root_value(request)
+        results = await asyncio.gather(
+            *(self.execute_batch_operation(operation, context, root_value) for operation in operations)
+        )
+
+        response_data = []
+        for result in results:
+            result_data = await self.process_result(request=request, result=result)
+            if result.errors:
+                self._handle_errors(result.errors, result_data)
+            response_data.append(result_data)
+        return self.create_response(cast(Any, response_data), sub_response)
+
+    async def execute_batch_operation(self, data: dict[str, Any], context: Any, root_value: Any) -> ExecutionResult:
+        try:
+            request_data = self.resolve_request_data(data)
+            return await self.execute_request_data(request_data, "POST", context, root_value)
+        except PersistedQueryError as e:
+            error = GraphQLError(str(e), extensions={"code": e.code})
+        except (InvalidOperationTypeError, MissingQueryError, json.decoder.JSONDecodeError) as e:
+            # a single bad operation must not fail the whole batch
+            error = GraphQLError(e.as_http_error_reason("POST") if isinstance(e, InvalidOperationTypeError) else str(e))
+        return ExecutionResult(data=None, errors=[error])
+
+    @staticmethod
+    def get_stream_format(request: HttpRequest) -> Optional[str]:
+        if not get_setting("AUTOGRAPHQL_STREAMING", False, bool):
+            return None
+        accept = request.headers.get("Accept", "")
+        if NDJSON in accept:
+            return NDJSON
+        if "multipart/mixed" in accept:
+            return MULTIPART
+        return None
+
+    async def stream_response(self, request: HttpRequest, stream_format: str) -> Optional[StreamingHttpResponse]:
+        """Stream top-level lists in chunks; None falls back to a regular response."""
+
+        request_adapter = self.request_adapter_class(request)
+        try:
+            request_data = await self.get_request_data(request_adapter)
+            document = parse(request_data.query) if request_data.query is not None else None
+        except (PersistedQueryError, GraphQLError):
+            return None
+        operation = get_operation_ast(document, request_data.operation_name) if document is not None else None
+        if document is None or operation is None or operation.operation != GraphQLOperationType.QUERY:
+            return None
+
+        context = await self.get_context(request, response=await self.get_sub_response(request))
+        stream_root = StreamRoot(chunk_size=get_setting("AUTOGRAPHQL_STREAM_CHUNK_SIZE", 500, int))
+        result = await self.execute_request_data(request_data, request_adapter.method, context, stream_root)
+
+        stream = ResultStream(
+            lambda chunk_request, chunk_root: self.execute_request_data(
+                chunk_request, request_adapter.method, context, chunk_root
+            ),
+            request_data,
+            document,
+            operation,
+            context,
+            stream_root,
+            result,
+            stream_format,
+        )
+        return StreamingHttpResponse(
+            stream.__aiter__() if isinstance(request, ASGIRequest) else iter(stream),
+            content_type=stream_format,
+        )
+
+    async def export_response(self, request: HttpRequest, field_name: str) -> StreamingHttpResponse:
+        """Every row of a top-level list as CSV or NDJSON: ?format=csv|ndjson&gzip=1&filters={...}&order={...}."""
+
+        if request.method != "GET":
+            raise HTTPException(405, "Exports are read with GET")
+        chunk_size = get_setting("AUTOGRAPHQL_EXPORT_CHUNK_SIZE", 2000, int)
+        try:
+            arguments = {
+                argument: json.loads(request.GET[argument])
+                for argument in ("filters", "order")
+                if argument in request.GET
+            }
+            context = await self.get_context(request, response=await self.get_sub_response(request))
+            queryset = await plan_export(
+                cast(Schema, self.schema), field_name, context=context, chunk_size=chunk_size, **arguments
+            )
+            encoder = ExportEncoder(
+                get_export_columns(queryset.model),
+                request.GET.get("format", "ndjson"),
+                compress=request.GET.get("gzip") in ("1", "true"),
+            )
+        except json.decoder.JSONDecodeError as e:
+            raise HTTPException(400, "Unable to parse filters or order as JSON") from e
+        except ExportError as e:
+            raise HTTPException(400, str(e)) from e
+
+        return StreamingHttpResponse(
+            (
+                aiter_export(queryset, encoder, chunk_size)
+                if isinstance(request, ASGIRequest)
+                else iter_export(queryset, encoder, chunk_size)
+            ),
+            content_type=encoder.content_type,
+            headers={"Content-Disposition": f'attachment; filename="{encoder.get_filename(queryset.model)}"'},
+        )
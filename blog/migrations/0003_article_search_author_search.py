@@ -0,0 +1,22 @@
+# Generated by Django 4.2.6 on 2026-10-18 07:17
+
+from django.db import migrations
+
+import auto_graphql.search
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0002_fill_examples_dataset"),
+    ]
+
+    operations = [
+        auto_graphql.search.CreateSearchIndex(
+            model_name="Article",
+            fields=["content"],
+        ),
+        auto_graphql.search.CreateSearchIndex(
+            model_name="Author",
+            fields=["bio"],
+        ),
+    ]
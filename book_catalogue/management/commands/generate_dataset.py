@@ -0,0 +1,140 @@
+import datetime
+import random
+import time
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    TypeVar,
+)
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import (
+    models,
+    transaction,
+)
+
+from book_catalogue.models import (
+    Author,
+    Book,
+    Genre,
+    Publisher,
+)
+
+ModelT = TypeVar("ModelT", bound=models.Model)
+
+BookGenre = Book.genres.through
+
+
+def random_date(rng: random.Random, start_year: int, end_year: int) -> datetime.date:
+    start = datetime.date(start_year, 1, 1)
+    return start + datetime.timedelta(days=rng.randrange((datetime.date(end_year, 12, 31) - start).days))
+
+
+def chunked(total: int, size: int) -> Iterator[range]:
+    for start in range(0, total, size):
+        yield range(start, min(start + size, total))
+
+
+class Command(BaseCommand):
+    help = "Fill book_catalogue with a generated dataset of the requested size using bulk inserts."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--books", type=int, default=1_000_000)
+        parser.add_argument("--authors", type=int, default=100_000)
+        parser.add_argument("--publishers", type=int, default=1_000)
+        parser.add_argument("--genres", type=int, default=200)
+        parser.add_argument("--genres-per-book", type=int, default=5, help="Upper bound of genres linked to a book.")
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--clear", action="store_true", help="Delete existing book_catalogue rows first.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for name in ("books", "authors", "publishers", "genres", "batch_size"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive.")
+        if not 0 <= options["genres_per_book"] <= options["genres"]:
+            raise CommandError("--genres-per-book must be between 0 and --genres.")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        started = time.perf_counter()
+
+        if options["clear"]:
+            self.clear()
+
+        author_ids = self.create_rows(
+            Author,
+            options["authors"],
+            lambda i: Author(
+                first_name=f"First{i}",
+                last_name=f"Last{i}",
+                date_of_birth=random_date(self.rng, 1900, 2000),
+                date_of_death=random_date(self.rng, 2001, 2023) if i % 4 == 0 else None,
+            ),
+        )
+        publisher_ids = self.create_rows(
+            Publisher,
+            options["publishers"],
+            lambda i: Publisher(name=f"Publisher #{i}", address=f"{i} Main Street"),
+        )
+        genre_ids = self.create_rows(Genre, options["genres"], lambda i: Genre(name=f"Genre #{i}"))
+        self.create_books(options["books"], author_ids, publisher_ids, genre_ids, options["genres_per_book"])
+
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - started:.1f}s."))
+
+    def clear(self) -> None:
+        # children first, so every delete is a plain DELETE without cascade collection
+        for model in (BookGenre, Book, Author, Publisher, Genre):
+            model._default_manager.all()._raw_delete(model._default_manager.db)  # type: ignore
+        self.stdout.write("Cleared existing rows.")
+
+    def create_rows(self, model: type[ModelT], count: int, build: Callable[[int], ModelT]) -> list[Any]:
+        ids: list[Any] = []
+        for indexes in chunked(count, self.batch_size):
+            with transaction.atomic():
+                ids.extend(obj.pk for obj in model._default_manager.bulk_create([build(i) for i in indexes]))
+        if any(pk is None for pk in ids):
+            # backend without RETURNING support for bulk inserts
+            ids = list(model._default_manager.order_by("-pk").values_list("pk", flat=True)[:count])
+        self.stdout.write(f"{model.__name__}: {count} rows.")
+        return ids
+
+    def create_books(
+        self,
+        count: int,
+        author_ids: list[Any],
+        publisher_ids: list[Any],
+        genre_ids: list[Any],
+        genres_per_book: int,
+    ) -> None:
+        rng = self.rng
+        links = 0
+        for indexes in chunked(count, self.batch_size):
+            books = [
+                Book(
+                    title=f"Book #{i}",
+                    summary=f"Summary for Book #{i}",
+                    author_id=rng.choice(author_ids),
+                    publisher_id=rng.choice(publisher_ids) if i % 10 else None,
+                    publish_date=random_date(rng, 1950, 2023),
+                )
+                for i in indexes
+            ]
+            with transaction.atomic():
+                Book.objects.bulk_create(books)
+                if any(book.pk is None for book in books):
+                    raise CommandError("Database backend does not return primary keys from bulk inserts.")
+                book_genres = [
+                    BookGenre(book_id=book.pk, genre_id=genre_id)
+                    for book in books
+                    for genre_id in rng.sample(genre_ids, k=rng.randint(min(1, genres_per_book), genres_per_book))
+                ]
+                BookGenre.objects.bulk_create(book_genres)
+            links += len(book_genres)
+            self.stdout.write(f"Book: {indexes.stop}/{count} rows, {links} genre links.", ending="\r")
+        self.stdout.write("")
@@ -6,7 +6,8 @@ import sys
 
 def main() -> None:
     """Run administrative tasks."""
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project_root.settings")
+    default_settings = "project_root.settings_test" if sys.argv[1:2] == ["test"] else "project_root.settings"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", default_settings)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -70,6 +70,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "project_root.wsgi.application"
+ASGI_APPLICATION = "project_root.asgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -135,3 +136,22 @@ LOGGING = {
         },
     },
 }
+
+# "preload" with `gunicorn --preload` builds the GraphQL schema once and shares it between workers
+AUTOGRAPHQL_SCHEMA_BUILD = env.str("AUTOGRAPHQL_SCHEMA_BUILD", default="eager")
+
+# smaller schemas next to the global endpoint: key-only relations, or the models of some apps
+# AUTOGRAPHQL_ENDPOINTS = {
+#     "graphql/": {"recursive": False},
+#     "graphql_r/": {},
+#     "graphql/blog/": {"apps": ["blog"]},
+# }
+
+# filters no index can serve are rejected on tables above this many rows
+AUTOGRAPHQL_FILTER_SCAN_MAX_ROWS = 100_000
+
+# full-text search argument in the Filters of these models, see `manage.py make_search_migrations`
+AUTOGRAPHQL_SEARCH = ["book_catalogue.Book", "blog.Article", "blog.Author"]
+
+# <endpoint>/export/<list field>?format=csv|ndjson streams every row of a model, see `manage.py export_model`
+AUTOGRAPHQL_EXPORT = True
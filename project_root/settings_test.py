@@ -0,0 +1,20 @@
+"""Settings of `manage.py test`: the project settings plus what the tests need on top of them."""
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES
+
+# stand-in read replica: a second SQLite file nothing replicates to, so a read shows which database served it;
+# its tables are created without migrations, whose data steps would write to the primary
+DATABASES = {
+    **DATABASES,
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "replica.sqlite3",
+        "TEST": {"NAME": BASE_DIR / "test_replica.sqlite3", "MIGRATE": False},
+    },
+}
+
+# <Model>Changes(since:) delta queries, opt-in for projects; the signals are connected when the app is ready
+AUTOGRAPHQL_CHANGE_TRACKING = ["book_catalogue.Book", "book_catalogue.Genre"]
+
+# <Related>Count fields of these relations read counts kept on write, opt-in for projects as well
+AUTOGRAPHQL_COUNTER_CACHE = ["book_catalogue.Genre.books", "blog.Tag.articles"]